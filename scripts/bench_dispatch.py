@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Per-op cost of tcalc.core.engine.Calculator and calc_native.Calculator.apply
+against the typed native methods.
+
+Run from the repo root with the native module built:
+
+    PYTHONPATH=src python scripts/bench_dispatch.py
+"""
+
+from __future__ import annotations
+
+import logging
+import timeit
+from functools import partial
+
+import calc_native
+
+from tcalc.core.engine import Calculator
+
+OpId = calc_native.OpId
+DEG = calc_native.AngleUnit.DEG
+BIG = calc_native.BigReal("1e400")
+
+ZC = complex(1.0, 2.0)
+BZ = calc_native.BigComplex(1.0, 2.0)
+
+# (label, op, operands, angle unit, typed native method and the operands it receives)
+CASES = [
+    ("add", OpId.Add, (2.0, 3.0), None, "add", (2.0, 3.0)),
+    ("add cx", OpId.Add, (ZC, ZC), None, "add", (ZC, ZC)),
+    ("add bigcx", OpId.Add, (BZ, BZ), None, "add", (BZ, BZ)),
+    ("add big", OpId.Add, (BIG, 3.0), None, "add", (BIG, calc_native.BigReal(3))),
+    ("sin", OpId.Sin, (30.0,), DEG, "sin", (30.0, DEG)),
+    ("sin cx", OpId.Sin, (ZC,), DEG, "sin", (ZC, DEG)),
+    ("sqrt", OpId.Sqrt, (2.0,), None, "sqrt", (2.0,)),
+    ("negate", OpId.Negate, (5.0,), None, "sub", (0, 5.0)),
+    ("pow", OpId.Pow, (2.0, 10.0), None, "pow", (2.0, 10.0)),
+    ("sqr", OpId.Sqr, (3.0,), None, "pow", (3.0, 2)),
+]
+
+
+def _time(stmt, number: int, repeat: int) -> float:
+    """Best time per call in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def main(number: int = 100_000, repeat: int = 5) -> None:
+    logging.disable(logging.CRITICAL)
+    calc = Calculator()
+    native = calc_native.Calculator()
+
+    # typed: the per-type native overloads; apply: calc_native.Calculator.apply;
+    # engine: tcalc.core.engine.Calculator.apply, as evaluate_rpn calls it.
+    print(f"{'op':<11}{'typed ns':>10}{'apply ns':>10}{'engine ns':>11}{'overhead ns':>13}")
+    for label, op_id, args, unit, method, typed_args in CASES:
+        typed = getattr(native, method)
+        kwargs = {} if unit is None else {"unit": unit}
+
+        base = _time(partial(typed, *typed_args), number, repeat)
+        direct = _time(partial(native.apply, op_id, *args, **kwargs), number, repeat)
+        total = _time(partial(calc.apply, op_id, *args, **kwargs), number, repeat)
+        print(f"{label:<11}{base:>10.0f}{direct:>10.0f}{total:>11.0f}{total - base:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
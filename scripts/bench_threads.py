@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Scaling of native Calculator calls across Python threads.
+
+Each thread computes BigReal gamma values on its own Calculator. The kernels run
+without the GIL, so on a machine with N cores N threads should finish the same
+per-thread work in about the time one thread takes. A heartbeat thread shows the
+other half: while gamma runs, pure-Python threads keep getting scheduled.
+
+Run from the repo root with the native module built:
+
+    PYTHONPATH=src python scripts/bench_threads.py [max_threads]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import calc_native
+
+PRECISION = 100
+CALLS_PER_THREAD = 200
+ARGUMENT = calc_native.BigReal("150.25")
+
+
+def _worker(barrier: threading.Barrier) -> None:
+    calc = calc_native.Calculator(PRECISION)
+    barrier.wait()
+    for _ in range(CALLS_PER_THREAD):
+        calc.gamma(ARGUMENT)
+
+
+def run_threads(count: int) -> float:
+    """Wall time for `count` threads doing CALLS_PER_THREAD gamma calls each."""
+    barrier = threading.Barrier(count + 1)
+    threads = [threading.Thread(target=_worker, args=(barrier,)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def heartbeat_gap(seconds: float = 0.5) -> tuple[float, float]:
+    """Longest gap between 1 ms heartbeats, idle and while gamma runs alongside."""
+
+    def longest_gap(busy: bool) -> float:
+        stop = threading.Event()
+        calc = calc_native.Calculator(500)
+
+        def spin() -> None:
+            while busy and not stop.is_set():
+                calc.gamma(ARGUMENT)
+
+        worker = threading.Thread(target=spin)
+        worker.start()
+        gap = 0.0
+        last = time.perf_counter()
+        deadline = last + seconds
+        while last < deadline:
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gap = max(gap, now - last)
+            last = now
+        stop.set()
+        worker.join()
+        return gap
+
+    return longest_gap(False), longest_gap(True)
+
+
+def main(max_threads: int) -> None:
+    print(f"{os.cpu_count()} CPUs, gamma at {PRECISION} digits, {CALLS_PER_THREAD} calls/thread")
+    print(f"{'threads':>7}{'wall s':>10}{'calls/s':>10}{'speedup':>9}")
+    base = None
+    count = 1
+    while count <= max_threads:
+        wall = run_threads(count)
+        base = base or wall
+        rate = count * CALLS_PER_THREAD / wall
+        print(f"{count:>7}{wall:>10.3f}{rate:>10.0f}{count * base / wall:>9.2f}")
+        count *= 2
+
+    idle, busy = heartbeat_gap()
+    print(f"longest 1 ms heartbeat gap: {idle * 1e3:.1f} ms idle, {busy * 1e3:.1f} ms beside gamma")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1)
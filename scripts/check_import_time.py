@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Keep `import tcalc.core` headless and under a fixed time budget.
+
+Imports tcalc.core in fresh interpreters with `-X importtime` and fails when the
+best of several runs exceeds the budget, when the import pulls in PySide6 or
+tcalc.app_state, or when it builds the op table that ops.py defers to first use.
+Bytecode goes to a temporary pycache prefix, so the source tree stays clean and
+the timed runs do not include compiling.
+
+Run from the repo root with the native module built:
+
+    PYTHONPATH=src python scripts/check_import_time.py [budget_ms] [runs]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BUDGET_MS = 60.0
+RUNS = 5
+MODULE = "tcalc.core"
+
+# Printed by the child after the timed import, as the last line of stdout.
+PROBE = f"""
+import json, sys
+import {MODULE}
+ops = sys.modules.get("tcalc.core.ops")
+print(json.dumps({{
+    "qt": sorted(m for m in sys.modules if m.split(".")[0] == "PySide6"),
+    "app_state": "tcalc.app_state" in sys.modules,
+    "op_table_built": ops is not None and "Operation" in vars(ops),
+}}))
+"""
+
+
+def _import_once(pycache: str) -> tuple[dict[str, object], dict[str, tuple[int, int]]]:
+    """One fresh import: the probe's report and module -> (self us, cumulative us)."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-X", f"pycache_prefix={pycache}", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return json.loads(result.stdout.splitlines()[-1]), times
+
+
+def main(budget_ms: float = BUDGET_MS, runs: int = RUNS) -> int:
+    with tempfile.TemporaryDirectory() as pycache:
+        _import_once(pycache)  # writes the bytecode cache
+        samples = [_import_once(pycache) for _ in range(max(1, runs))]
+
+    report, times = min(samples, key=lambda sample: sample[1][MODULE][1])
+    best_ms = times[MODULE][1] / 1000
+    print(f"import {MODULE}: {best_ms:.1f} ms (best of {len(samples)}, budget {budget_ms:.0f} ms)")
+
+    failures = []
+    if report["qt"]:
+        failures.append(f"imports Qt: {', '.join(report['qt'])}")
+    if report["app_state"]:
+        failures.append("imports tcalc.app_state")
+    if report["op_table_built"]:
+        failures.append("builds the op table at import")
+    if best_ms > budget_ms:
+        failures.append(f"{best_ms:.1f} ms is over the {budget_ms:.0f} ms budget")
+
+    if failures:
+        print("slowest modules (self ms):")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:10]
+        for name, (self_us, _) in slowest:
+            print(f"  {self_us / 1000:7.1f}  {name}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else RUNS
+    sys.exit(main(budget, count))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Evaluate expressions from many threads at once and compare with a serial run.
+
+Meant for free-threaded interpreters (python3.13t): there, importing a module
+that is not marked GIL-free turns the GIL back on, which this script reports as
+a failure. calc_native is not marked yet, so set PYTHON_GIL=0 to keep the GIL
+off while checking it. On a regular build it still checks the results, with
+the GIL serializing the Python parts.
+
+Run from the repo root with the native module built:
+
+    PYTHON_GIL=0 PYTHONPATH=src python3.13t scripts/stress_threads.py [threads] [rounds]
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import sysconfig
+import threading
+
+import calc_native
+
+from tcalc.core import (
+    Calculator,
+    EvaluationContext,
+    compile_expression,
+    configure_compile_cache,
+    evaluate_program,
+    evaluate_tokens,
+    tokenize_string,
+)
+from tcalc.core.errors import Error
+
+EXPRESSIONS = [
+    "1 + 2 x 3",
+    "(1 + 2) x 3 ÷ 7",
+    "2 ^ 0.5 - √2",
+    "2 ^ 2000 ÷ 2 ^ 1999",
+    "10 ^ 200 x 10 ^ 200",
+    "1e400 + 1",
+    "200!",
+    "Γ(10.5)",
+    "ln(2 ^ 2000)",
+    "log(1e300)",
+    "√(-4)",
+    "(-8) ⌄ 3",
+    "ln(-1)",
+    "2i x 3i",
+    "(1 + 2i) ^ 3",
+    "5 nCm 2",
+    "7 div 2",
+    "7 mod 3",
+    "50%",
+    "3² + 2³ - 4⁻¹",
+    "1 ÷ 0",
+    "5 +",
+    "2.5 nCm 1",
+    "sin(30) + cos(60)",
+    "tan(45) x 2 ^ 300",
+    "sin(2i)",
+]
+
+# Threads evaluate the same corpus under different contexts at the same time.
+DEG = EvaluationContext(calc_native.AngleUnit.DEG)
+RAD = EvaluationContext(calc_native.AngleUnit.RAD, precision=100)
+
+
+def _outcome(evaluate, expression: str) -> tuple[str, str]:
+    try:
+        value = evaluate(expression)
+    except Error as exc:
+        return "error", str(exc)
+    return type(value).__name__, str(value)
+
+
+def main(threads: int = 16, rounds: int = 200) -> int:
+    logging.disable(logging.CRITICAL)
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"free-threaded build: {free_threaded}, GIL enabled after import: {gil_enabled}")
+    if free_threaded and gil_enabled:
+        print("FAIL: importing calc_native or tcalc.core re-enabled the GIL")
+        return 1
+
+    # One Calculator and a cache small enough to evict are shared by every thread.
+    calculator = Calculator()
+    configure_compile_cache(max_entries=8)
+
+    def via_tokens(expression: str) -> object:
+        return evaluate_tokens(tokenize_string(expression), calculator, DEG)
+
+    def via_tokens_rad(expression: str) -> object:
+        return evaluate_tokens(tokenize_string(expression), context=RAD)
+
+    def via_program(expression: str) -> object:
+        return evaluate_program(compile_expression(expression), DEG)
+
+    def via_program_rad(expression: str) -> object:
+        return evaluate_program(compile_expression(expression), RAD)
+
+    paths = (via_tokens, via_tokens_rad, via_program, via_program_rad)
+    expected = {
+        (path.__name__, expression): _outcome(path, expression)
+        for path in paths
+        for expression in EXPRESSIONS
+    }
+
+    failures: list[str] = []
+    failures_lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(seed: int) -> None:
+        order = [(path, expression) for path in paths for expression in EXPRESSIONS]
+        random.Random(seed).shuffle(order)
+        barrier.wait()
+        for _ in range(rounds):
+            for path, expression in order:
+                got = _outcome(path, expression)
+                want = expected[path.__name__, expression]
+                if got != want:
+                    with failures_lock:
+                        failures.append(f"{path.__name__}({expression!r}): {got} != {want}")
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    calls = threads * rounds * len(expected)
+    if failures:
+        print(f"FAIL: {len(failures)} of {calls} evaluations differ from the serial run")
+        for line in failures[:20]:
+            print("  " + line)
+        return 1
+    print(f"OK: {calls} evaluations on {threads} threads match the serial run")
+    return 0
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    sys.exit(main(*args))
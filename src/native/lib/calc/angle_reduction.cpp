@@ -0,0 +1,139 @@
+#include "calc/internal/angle_reduction.hpp"
+#include "calc/internal/helpers.hpp"
+#include "calc/pub/exact_parts.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <ios>
+#include <limits>
+#include <map>
+#include <mutex>
+#include <utility>
+
+#include <boost/multiprecision/cpp_dec_float.hpp>
+
+namespace {
+
+using boost::multiprecision::cpp_int;
+using AngleUnit = Calculator::AngleUnit;
+
+// Extra digits of 2/pi beyond what the remainder needs, for arguments that land
+// close to a multiple of pi/2.
+constexpr unsigned kGuardDigits = 60;
+
+// arctan(1/m) * scale, by its Taylor series in fixed point.
+cpp_int arctan_inverse(unsigned m, const cpp_int &scale) {
+    const unsigned m2 = m * m;
+    cpp_int power = scale / m;
+    cpp_int sum = power;
+    for (unsigned k = 1; power != 0; ++k) {
+        power /= m2;
+        const cpp_int term = power / (2 * k + 1);
+        sum += (k % 2 != 0) ? cpp_int(-term) : term;
+    }
+    return sum;
+}
+
+// floor(2/pi * 10^digits), with pi from Machin's formula. Each series term
+// truncates by under one unit, far below the guard digits.
+cpp_int compute_two_over_pi(unsigned digits) {
+    constexpr unsigned guard = 20;
+    const cpp_int scale = boost::multiprecision::pow(cpp_int(10), digits + guard);
+    const cpp_int pi = 16 * arctan_inverse(5, scale) - 4 * arctan_inverse(239, scale);
+    return 2 * scale * boost::multiprecision::pow(cpp_int(10), digits) / pi;
+}
+
+// floor(2/pi * 10^n) for the smallest cached n >= digits, with n. Sizes are
+// powers of two from 256 digits, computed on first use and shared by every
+// thread; map entries never move, so the reference outlives the lock.
+std::pair<const cpp_int &, unsigned> two_over_pi(unsigned digits) {
+    static std::mutex mutex;
+    static std::map<unsigned, cpp_int> cache;
+
+    unsigned n = 256;
+    while (n < digits) {
+        n *= 2;
+    }
+    const std::lock_guard lock(mutex);
+    auto it = cache.find(n);
+    if (it == cache.end()) {
+        it = cache.emplace(n, compute_two_over_pi(n)).first;
+    }
+    return {it->second, n};
+}
+
+calc_detail::QuarterTurns reduce(const ExactParts &x, AngleUnit unit, unsigned digits) {
+    calc_detail::require(x.kind == ExactParts::Kind::Finite);
+    // numerator / turn is x in whole turns; turn grows by radix^-exponent below.
+    cpp_int numerator = x.mantissa;
+    cpp_int turn;
+    if (unit == AngleUnit::RAD) {
+        // x * 2/pi quarter turns, with 2/pi to enough digits that the truncated
+        // product is off by less than 10^-(digits + guard) of a quarter turn.
+        const double order =
+            static_cast<double>(boost::multiprecision::msb(x.mantissa) + 1) * std::log10(2.0) +
+            static_cast<double>(x.exponent) * std::log10(x.radix);
+        calc_detail::require(order <= calc_detail::kMaxRadianOrder);
+        const auto needed = static_cast<unsigned>(std::max(order, 0.0)) + digits + kGuardDigits;
+        const auto [scaled, n] = two_over_pi(needed);
+        numerator *= scaled;
+        turn = 4 * boost::multiprecision::pow(cpp_int(10), n);
+    } else {
+        turn = unit == AngleUnit::GRAD ? 400 : 360;
+    }
+
+    cpp_int z;
+    if (x.exponent >= 0) {
+        // The power of the radix only matters modulo one turn.
+        const cpp_int power =
+            boost::multiprecision::powm(cpp_int(x.radix), cpp_int(x.exponent), turn);
+        z = (numerator % turn) * power % turn;
+    } else {
+        turn *= boost::multiprecision::pow(cpp_int(x.radix), static_cast<unsigned>(-x.exponent));
+        z = numerator % turn;
+    }
+
+    calc_detail::QuarterTurns result;
+    result.scale = turn / 4;
+    result.quadrant = static_cast<unsigned>(z / result.scale);
+    result.remainder = z % result.scale;
+    if (2 * result.remainder > result.scale) {
+        result.quadrant += 1;
+        result.remainder -= result.scale;
+    }
+    result.quadrant %= 4;
+    if (x.negative) {
+        result.quadrant = (4 - result.quadrant) % 4;
+        result.remainder = -result.remainder;
+    }
+    return result;
+}
+
+} // namespace
+
+namespace calc_detail {
+
+QuarterTurns reduce_angle(const BigReal &x, AngleUnit unit, unsigned digits) {
+    if (x == 0) {
+        return {0, 0, 1};
+    }
+    return reduce(exact_parts(x), unit, digits);
+}
+
+QuarterTurns reduce_angle(const boost::multiprecision::cpp_bin_float_50 &x, AngleUnit unit,
+                          unsigned digits) {
+    using BF = boost::multiprecision::cpp_bin_float_50;
+    if (x == 0) {
+        return {0, 0, 1};
+    }
+    calc_detail::require(boost::multiprecision::isfinite(x));
+    // Read back at the decimal digits BF holds, as doubles are read at their
+    // shortest round trip. A real part that came from an exact decimal such as
+    // 1e300 then reduces as that decimal, not as its binary rounding, which is
+    // off by far more than a turn.
+    const BigReal decimal(x.str(std::numeric_limits<BF>::digits10, std::ios_base::scientific));
+    return reduce(exact_parts(decimal), unit, digits);
+}
+
+} // namespace calc_detail
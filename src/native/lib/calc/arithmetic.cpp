@@ -75,8 +75,9 @@ BigReal Calculator::intdiv(const BigReal &a, const BigReal &b) const {
 }
 
 BigReal Calculator::pow(const BigReal &a, const BigReal &b) const {
-    using boost::multiprecision::pow;
-    return pow(a, b);
+    return calc_detail::in_tier(
+        precision(), [](const auto &x, const auto &y) { return boost::multiprecision::pow(x, y); },
+        a, b);
 }
 
 BigReal Calculator::mod(const BigReal &a, const BigReal &b) const {
@@ -85,6 +86,24 @@ BigReal Calculator::mod(const BigReal &a, const BigReal &b) const {
     return fmod(a, b);
 }
 
+// -----------------
+// ExtDouble
+// -----------------
+
+ExtDouble Calculator::div(const ExtDouble &a, const ExtDouble &b) const {
+    calc_detail::require(!b.is_zero());
+    return a / b;
+}
+
+ExtDouble Calculator::pow(const ExtDouble &a, double b) const {
+    if (a.is_zero()) {
+        calc_detail::require(b >= 0.0);
+        return ExtDouble(b == 0.0 ? 1.0 : 0.0);
+    }
+    calc_detail::require(!a.is_negative() || std::floor(b) == b);
+    return a.pow(b);
+}
+
 // -----------------
 // Complex
 // -----------------
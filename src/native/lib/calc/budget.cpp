@@ -0,0 +1,31 @@
+#include "calc/pub/budget.hpp"
+#include "calc/pub/errors.hpp"
+
+Budget::Budget(const Limits &limits) : max_ops_(limits.max_ops), cancel_(limits.cancel) {
+    if (limits.timeout.count() > 0) {
+        // A deadline past the clock's range is no deadline.
+        const auto now = Clock::now();
+        if (limits.timeout < Clock::time_point::max() - now) {
+            deadline_ = now + limits.timeout;
+        }
+    }
+}
+
+void Budget::charge(std::uint64_t ops) const {
+    used_ += ops;
+    if (used_ > max_ops_) {
+        throw CalculatorError(kTimeoutMessage.data());
+    }
+    if (used_ < next_check_) {
+        return;
+    }
+
+    if (cancel_ && cancel_->cancelled()) {
+        throw CalculatorError(kCancelledMessage.data());
+    }
+    if (deadline_ != Clock::time_point::max() && Clock::now() >= deadline_) {
+        throw CalculatorError(kTimeoutMessage.data());
+    }
+    // Only after the checks pass, so the next charge after a throw checks again.
+    next_check_ = used_ + kCheckStride;
+}
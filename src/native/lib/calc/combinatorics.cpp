@@ -2,18 +2,334 @@
 #include "calc/internal/helpers.hpp"
 
 #include <algorithm>
+#include <array>
+#include <atomic>
+#include <bit>
 #include <cmath>
+#include <cstdint>
+#include <ios>
+#include <limits>
+#include <memory>
+#include <numbers>
+#include <type_traits>
+#include <vector>
 
-#include <boost/math/special_functions/gamma.hpp>
+#include <boost/math/tools/precision.hpp>
 #include <boost/multiprecision/cpp_dec_float.hpp>
 
+namespace {
+
+//
+// n! for every n whose factorial is a finite double, correctly rounded. Built at
+// compile time in double-double arithmetic: the 106-bit running product is exact
+// for the first few dozen n and stays far closer than half an ulp after that.
+//
+struct DoubleDouble {
+    double hi;
+    double lo;
+};
+
+// hi + lo == a * k exactly, for an integer k < 2^26 (Dekker's product with only a
+// split; constexpr, so no fma). a is scaled down first so the split cannot overflow.
+constexpr DoubleDouble two_product(double a, double k) {
+    constexpr double kSplit = 134217729.0; // 2^27 + 1
+    const double scale = a > 0x1p900 ? 0x1p-28 : 1.0;
+    const double scaled = a * scale;
+    const double c = kSplit * scaled;
+    const double a_hi = (c - (c - scaled)) / scale;
+    const double a_lo = a - a_hi;
+    const double p = a * k;
+    return {p, (a_hi * k - p) + a_lo * k};
+}
+
+constexpr std::array<double, 171> make_double_factorials() {
+    std::array<double, 171> table{};
+    DoubleDouble acc{1.0, 0.0};
+    table[0] = 1.0;
+    for (std::size_t n = 1; n < table.size(); ++n) {
+        const double k = static_cast<double>(n);
+        const DoubleDouble p = two_product(acc.hi, k);
+        const double lo = p.lo + acc.lo * k;
+        const double hi = p.hi + lo;
+        acc = {hi, lo - (hi - p.hi)};
+        table[n] = acc.hi;
+    }
+    return table;
+}
+
+constexpr auto kDoubleFactorials = make_double_factorials();
+
+// Up to here fact(BigReal) rounds the exact factorial (about 0.3 ms at the
+// limit); past it checked_tgamma is faster and still good to BigReal precision.
+constexpr unsigned kExactFactorialForBigReal = 5000;
+
+// Product of factors[lo, hi), split so both halves have similar size.
+BigInt product(const Calculator &calc, const std::vector<std::uint64_t> &factors, std::size_t lo,
+               std::size_t hi) {
+    if (hi - lo <= 16) {
+        calc.checkpoint(hi - lo);
+        BigInt res = 1;
+        for (std::size_t i = lo; i < hi; ++i) {
+            res *= factors[i];
+        }
+        return res;
+    }
+    const std::size_t mid = lo + (hi - lo) / 2;
+    return product(calc, factors, lo, mid) * product(calc, factors, mid, hi);
+}
+
+// Odd primes up to n, charging one op per sieve step.
+std::vector<std::uint32_t> odd_primes(const Calculator &calc, std::uint32_t n) {
+    std::vector<bool> composite(n + 1, false);
+    std::vector<std::uint32_t> primes;
+    for (std::uint32_t i = 3; i <= n; i += 2) {
+        calc.checkpoint();
+        if (composite[i]) {
+            continue;
+        }
+        primes.push_back(i);
+        const std::uint64_t first = std::uint64_t{i} * i;
+        if (first <= n) {
+            calc.checkpoint((n - first) / (2 * i) + 1);
+        }
+        for (std::uint64_t j = first; j <= n; j += 2 * i) {
+            composite[j] = true;
+        }
+    }
+    return primes;
+}
+
+// Odd part of the swinging factorial n! / (n/2)!^2, from its prime factorization:
+// an odd prime p divides it to the power sum of floor(n / p^i) mod 2.
+BigInt odd_swing(const Calculator &calc, std::uint32_t n,
+                 const std::vector<std::uint32_t> &primes) {
+    std::vector<std::uint64_t> factors;
+    for (const std::uint32_t p : primes) {
+        if (p > n) {
+            break;
+        }
+        std::uint64_t power = 1;
+        for (std::uint32_t q = n / p; q > 0; q /= p) {
+            if ((q & 1U) != 0) {
+                power *= p;
+            }
+        }
+        if (power > 1) {
+            factors.push_back(power);
+        }
+    }
+    return product(calc, factors, 0, factors.size());
+}
+
+// Odd part of n!: oddfact(n) = oddfact(n/2)^2 * odd_swing(n).
+BigInt odd_factorial(const Calculator &calc, std::uint32_t n,
+                     const std::vector<std::uint32_t> &primes) {
+    if (n < 2) {
+        return 1;
+    }
+    BigInt half = odd_factorial(calc, n / 2, primes);
+    return half * half * odd_swing(calc, n, primes);
+}
+
+// std::tgamma is finite below this; Stirling's series takes over from here.
+constexpr double kStirlingFrom = 171.0;
+
+//
+// Gamma(x) = (x/e)^x * sqrt(2 pi / x) * exp(S(x)) for x >= kStirlingFrom, with S
+// the first four terms of Stirling's series (the next one is below 1e-23 there).
+// For integer x the power is exact squaring, so factorials keep about 19 digits.
+//
+ExtDouble stirling_gamma(double x) {
+    static const ExtDouble e(0x1.5bf0a8b145769p+1, 0x1.4d57ee2b1013ap-53, 0);
+    static const ExtDouble two_pi(0x1.921fb54442d18p+2, 0x1.1a62633145c07p-52, 0);
+
+    const ExtDouble ex(x);
+    const double inv = 1.0 / x;
+    const double inv2 = inv * inv;
+    const double s = inv * (1.0 / 12 - inv2 * (1.0 / 360 - inv2 * (1.0 / 1260 - inv2 / 1680)));
+    const ExtDouble series(1.0, std::expm1(s), 0);
+    return (ex / e).pow(x) * (two_pi / ex).sqrt() * series;
+}
+
+//
+// tgamma and lgamma in the precision tiers. Same method as boost's for types
+// without a Lanczos approximation: recur up to where Stirling's series holds,
+// then sum the series. Done here so the budget is charged per recurrence step,
+// per series term and per row of the Bernoulli table, and a deadline or cancel
+// stops the kernel part way.
+//
+
+// Budget ops for one multiply or divide in R: one per 8-digit limb.
+template <typename R> constexpr std::uint64_t kLimbOps = std::numeric_limits<R>::digits10 / 8 + 1;
+
+// B_2, B_4, ..., B_2n from the tangent numbers T_1..T_n (Brent and Harvey's
+// algorithm; every step adds positive terms, so it is stable in R), using
+// B_2k = (-1)^(k-1) 2k T_k / (4^k (4^k - 1)).
+template <typename R> std::vector<R> bernoulli_numbers(const Calculator &calc, std::size_t n) {
+    std::vector<R> t(n);
+    t[0] = 1;
+    for (std::size_t k = 1; k < n; ++k) {
+        t[k] = t[k - 1] * k;
+    }
+    for (std::size_t k = 1; k < n; ++k) {
+        calc.checkpoint(2 * (n - k) * kLimbOps<R>);
+        for (std::size_t j = k; j < n; ++j) {
+            t[j] = (j - k) * t[j - 1] + (j - k + 2) * t[j];
+        }
+    }
+
+    R four_k = 1;
+    for (std::size_t k = 0; k < n; ++k) {
+        four_k *= 4;
+        const R b = t[k] * (2 * (k + 1)) / (four_k * (four_k - 1));
+        t[k] = k % 2 == 0 ? b : R(-b);
+    }
+    return t;
+}
+
+//
+// At least `count` of B_2, B_4, ... in R, shared by every thread. The table only
+// grows: a kernel that needs more entries builds one twice as long on its own
+// budget and publishes it unless a longer one landed first. A build the budget
+// stops is dropped.
+//
+template <typename R>
+std::shared_ptr<const std::vector<R>> bernoulli_table(const Calculator &calc, std::size_t count) {
+    static std::atomic<std::shared_ptr<const std::vector<R>>> shared;
+    std::shared_ptr<const std::vector<R>> table = shared.load();
+    if (table && table->size() >= count) {
+        return table;
+    }
+    const std::size_t rows = std::max(count, table ? 2 * table->size() : 0);
+    auto built = std::make_shared<const std::vector<R>>(bernoulli_numbers<R>(calc, rows));
+    while (!(table && table->size() >= rows)) {
+        if (shared.compare_exchange_weak(table, built)) {
+            return built;
+        }
+    }
+    return table;
+}
+
+// Smallest argument where Stirling's series reaches full precision in R.
+template <typename R> double stirling_from() {
+    const double digits10 = std::numeric_limits<R>::digits10;
+    const double limit = std::ceil(std::exp2((boost::math::tools::digits<R>() - 1) / 20.0));
+    return std::min(digits10 * 1.7, limit);
+}
+
+// Terms of Stirling's series R needs at z, estimated in double from
+// |B_2n| ~ 2 (2n)! / (2 pi)^2n, so the Bernoulli table is built once at its size.
+template <typename R> std::size_t stirling_terms(double z) {
+    const double target = -std::numeric_limits<R>::digits10 * std::log(10.0);
+    const double log_first = std::log(12.0 * z);
+    const double log_two_pi_z = std::log(2.0 * std::numbers::pi * z);
+    double previous = 0.0;
+    for (std::size_t n = 2;; ++n) {
+        const auto two_n = static_cast<double>(2 * n);
+        // log of |term n| / term 1
+        const double ratio = log_first + std::log(2.0) + std::lgamma(two_n + 1.0) -
+                             two_n * log_two_pi_z + std::log(z) - std::log(two_n * (two_n - 1.0));
+        if (ratio < target || ratio > previous) {
+            return n + 2; // the series stops on the first term past the target
+        }
+        previous = ratio;
+    }
+}
+
+// ln(Gamma(z) / ((z/e)^z sqrt(2 pi / z))) by Stirling's series, z >= stirling_from<R>().
+template <typename R> R stirling_sum(const Calculator &calc, const R &z) {
+    using boost::multiprecision::abs;
+    auto b2n = bernoulli_table<R>(calc, stirling_terms<R>(z.template convert_to<double>()));
+    const R inv_z2 = 1 / (z * z);
+    R power = 1 / z; // z^(1 - 2n)
+    R sum = (*b2n)[0] / 2 * power;
+    const R target = abs(sum) * std::numeric_limits<R>::epsilon();
+    R last = abs(sum) * 2;
+    for (std::size_t n = 2;; ++n) {
+        calc.checkpoint(4 * kLimbOps<R>);
+        if (n > b2n->size()) {
+            b2n = bernoulli_table<R>(calc, n);
+        }
+        power *= inv_z2;
+        const R term = (*b2n)[n - 1] * power / (2 * n * (2 * n - 1));
+        // The series is asymptotic: stop once terms are negligible or start to grow.
+        const R size = abs(term);
+        if ((n >= 3 && size < target) || size > last) {
+            return sum;
+        }
+        sum += term;
+        last = size;
+    }
+}
+
+// sin(pi z), with the integer part of z taken off exactly first.
+template <typename R> R sin_pi(const R &z) {
+    using boost::multiprecision::floor;
+    using boost::multiprecision::fmod;
+    using boost::multiprecision::sin;
+    const R whole = floor(z);
+    R frac = z - whole;
+    if (frac > R(0.5)) {
+        frac = 1 - frac; // sin(pi f) = sin(pi (1 - f))
+    }
+    const R s = sin(pi_constant<R>() * frac);
+    return fmod(whole, R(2)) == 0 ? s : R(-s);
+}
+
+template <typename R> R checked_tgamma(const Calculator &calc, const R &z) {
+    using boost::multiprecision::exp;
+    using boost::multiprecision::log;
+    using boost::multiprecision::pow;
+    using boost::multiprecision::sqrt;
+
+    if (z < 0) {
+        // Reflection: Gamma(z) Gamma(1 - z) = pi / sin(pi z).
+        const R g = checked_tgamma(calc, R(1 - z));
+        const R result = pi_constant<R>() / (sin_pi(z) * g);
+        calc_detail::require(result != 0);
+        return result;
+    }
+
+    // Gamma(z) = Gamma(z + k) / (z (z+1) ... (z+k-1)).
+    R zz = z;
+    R divisor = 1;
+    for (const double from = stirling_from<R>(); zz < from; zz += 1) {
+        calc.checkpoint(kLimbOps<R>);
+        divisor *= zz;
+    }
+    calc_detail::require(zz * (log(zz) - 1) <= boost::math::tools::log_max_value<R>());
+
+    const R scaled = exp(stirling_sum(calc, zz)) * sqrt(2 * pi_constant<R>() / zz);
+    calc.checkpoint(16 * kLimbOps<R>);
+    const R half_power = pow(zz, R(zz / 2)); // (z/e)^z in two halves, so neither overflows
+    const R result = scaled * (half_power * exp(R(-zz))) * half_power / divisor;
+    calc_detail::require(boost::multiprecision::isfinite(result));
+    return result;
+}
+
+// ln(Gamma(z)) for z > 0.
+template <typename R> R checked_lgamma(const Calculator &calc, const R &z) {
+    using boost::multiprecision::log;
+    if (z < stirling_from<R>()) {
+        return log(checked_tgamma(calc, z));
+    }
+    const R sum = stirling_sum(calc, z);
+    calc.checkpoint(8 * kLimbOps<R>);
+    return z * (log(z) - 1) + sum + log(2 * pi_constant<R>() / z) / 2;
+}
+
+} // namespace
+
 double Calculator::fact(double a) const {
     const double rounded = std::round(a);
     if (!calc_detail::int_like(a) || rounded < 0.0) {
         calc_detail::math_error();
     }
 
-    return std::tgamma(rounded + 1.0);
+    if (rounded >= static_cast<double>(kDoubleFactorials.size())) {
+        return std::numeric_limits<double>::infinity();
+    }
+    return kDoubleFactorials[static_cast<std::size_t>(rounded)];
 }
 
 double Calculator::gamma(double a) const {
@@ -29,36 +345,143 @@ BigReal Calculator::fact(const BigReal &a) const {
     using boost::multiprecision::floor;
     calc_detail::require(floor(a) == a);
 
-    using boost::math::tgamma;
-    return tgamma(a + 1);
+    if (a <= kExactFactorialForBigReal) {
+        return to_big_real(factorial(a.convert_to<std::uint64_t>()));
+    }
+    return calc_detail::in_tier(
+        precision(),
+        [this](const auto &x) { return checked_tgamma(*this, std::decay_t<decltype(x)>(x + 1)); },
+        a);
 }
 
 BigReal Calculator::gamma(const BigReal &a) const {
-    if (a <= 0) {
-        using boost::multiprecision::floor;
-        if (floor(a) == a) {
-            calc_detail::math_error();
-        }
+    using boost::multiprecision::floor;
+    if (floor(a) == a) {
+        calc_detail::require(a > 0);
+        return fact(BigReal(a - 1));
+    }
+
+    return calc_detail::in_tier(
+        precision(), [this](const auto &x) { return checked_tgamma(*this, x); }, a);
+}
+
+ExtDouble Calculator::fact(const ExtDouble &a) const {
+    const double x = a.to_double();
+    const double r = fact(x);
+    if (!std::isinf(r)) {
+        return ExtDouble(r);
+    }
+    return stirling_gamma(std::round(x) + 1.0);
+}
+
+ExtDouble Calculator::gamma(const ExtDouble &a) const {
+    const double x = a.to_double();
+    if (x < kStirlingFrom) {
+        return ExtDouble(gamma(x));
     }
+    calc_detail::require(std::isfinite(x));
+    return stirling_gamma(x);
+}
 
-    using boost::math::tgamma;
-    return tgamma(a);
+//
+// Exact factorial by prime swing (Luschny): n! = oddfact(n) * 2^(n - popcount(n)).
+// Only the odd part is multiplied out, mostly in a few large balanced products.
+// 100000! (456574 digits) takes about 40 ms.
+//
+BigInt Calculator::factorial(std::uint64_t n) const {
+    calc_detail::require(n <= kMaxExactFactorial);
+    if (n < 23) {
+        return BigInt(kDoubleFactorials[n]); // exact in double up to 22!
+    }
+    const auto m = static_cast<std::uint32_t>(n);
+    BigInt res = odd_factorial(*this, m, odd_primes(*this, m));
+    res <<= n - static_cast<std::uint64_t>(std::popcount(n));
+    return res;
+}
+
+BigReal to_big_real(const BigInt &value) {
+    // Keep the leading 256 bits, well past BigReal's 50 digits, and scale back.
+    constexpr unsigned kKeepBits = 256;
+    if (value == 0) {
+        return BigReal(0);
+    }
+    const unsigned bits = boost::multiprecision::msb(abs(value)) + 1;
+    if (bits <= kKeepBits) {
+        return BigReal(value);
+    }
+    const unsigned shift = bits - kKeepBits;
+    return BigReal(BigInt(value >> shift)) * pow(BigReal(2), shift);
 }
 
 //
-// Permute
+// Permute/Choose
 //
+// Small results are computed exactly: the falling product n(n-1)...(n-r+1) by
+// binary splitting in cpp_int (so the big multiplications have balanced sizes),
+// divided by r! for choose, then rounded once to BigReal. When the product would
+// be longer than kExactDigits, the result is exp of a log-gamma difference taken
+// in LogReal precision instead, which costs the same for every n and r.
+//
+namespace {
+
+// Log-gamma working type. ln(n!) < 4.1e20 for any long long n, so at most 21 of
+// its digits go to the integer part and the rest bound the result's relative
+// error well below BigReal's 50 digits.
+using LogReal =
+    boost::multiprecision::number<boost::multiprecision::cpp_dec_float<80, std::int64_t>>;
+
+// Around this many digits the exact product gets as slow as the log-gamma path
+// (about 0.5 ms; see tests/bench/bench_combinatorics.cpp).
+constexpr double kExactDigits = 4000.0;
+// Factors multiplied directly at the leaves of the splitting.
+constexpr long long kLeafTerms = 16;
+
+// lo * (lo+1) * ... * hi, for lo <= hi.
+BigInt range_product(const Calculator &calc, long long lo, long long hi) {
+    if (hi - lo < kLeafTerms) {
+        calc.checkpoint(static_cast<std::uint64_t>(hi - lo + 1));
+        BigInt res = lo;
+        for (long long i = lo + 1; i <= hi; ++i) {
+            res *= i;
+        }
+        return res;
+    }
+    const long long mid = lo + (hi - lo) / 2;
+    return range_product(calc, lo, mid) * range_product(calc, mid + 1, hi);
+}
+
+// Upper bound on the digits of the n-r+1 .. n product: n^r.
+bool exact_fits(long long n, long long r) {
+    return static_cast<double>(r) * std::log10(static_cast<double>(n) + 1.0) <= kExactDigits;
+}
+
+// ln(n!) - ln((n-r)!) [- ln(r!) when choosing], as a BigReal result.
+BigReal from_log_gamma(const Calculator &calc, long long n, long long r, bool choose) {
+    LogReal log_result = checked_lgamma(calc, LogReal(LogReal(n) + 1)) -
+                         checked_lgamma(calc, LogReal(LogReal(n - r) + 1));
+    if (choose) {
+        log_result -= checked_lgamma(calc, LogReal(LogReal(r) + 1));
+    }
+    // cpp_dec_float has no conversion between precisions; round through text.
+    const LogReal result = exp(log_result);
+    return BigReal(
+        result.str(std::numeric_limits<BigReal>::max_digits10, std::ios_base::scientific));
+}
+
+} // namespace
+
 BigReal Calculator::permute(long long a, long long b) const {
     if (!calc_detail::nonneg_or_zero(a, b)) {
         return BigReal(0);
     }
+    if (b == 0) {
+        return BigReal(1);
+    }
 
-    BigReal res = 1;
-
-    for (long long i = 0; i < b; ++i) {
-        res *= BigReal(a - i);
+    if (exact_fits(a, b)) {
+        return to_big_real(range_product(*this, a - b + 1, a));
     }
-    return res;
+    return from_log_gamma(*this, a, b, false);
 }
 
 BigReal Calculator::choose(long long a, long long b) const {
@@ -66,13 +489,13 @@ BigReal Calculator::choose(long long a, long long b) const {
         return BigReal(0);
     }
 
-    long long r = std::min(b, a - b);
-    BigReal res = 1;
-
-    for (long long i = 1; i <= r; ++i) {
-        res *= BigReal(a - r + i);
-        res /= BigReal(i);
+    const long long r = std::min(b, a - b);
+    if (r == 0) {
+        return BigReal(1);
     }
 
-    return res;
+    if (exact_fits(a, r)) {
+        return to_big_real(range_product(*this, a - r + 1, a) / range_product(*this, 1, r));
+    }
+    return from_log_gamma(*this, a, r, true);
 }
@@ -0,0 +1,376 @@
+#include "calc/pub/exact_parts.hpp"
+#include "calc/pub/calculator.hpp"
+#include "calc/pub/errors.hpp"
+
+#include <algorithm>
+#include <array>
+#include <bit>
+#include <charconv>
+#include <cmath>
+#include <iterator>
+#include <limits>
+
+namespace {
+
+using BF = boost::multiprecision::cpp_bin_float_50;
+using DecBackend = BigReal::backend_type;
+
+constexpr std::uint8_t kFormatVersion = 1;
+constexpr std::uint8_t kNegativeFlag = 1;
+constexpr std::uint8_t kBinaryFlag = 2;
+constexpr std::uint8_t kInfiniteFlag = 4;
+constexpr std::uint8_t kNaNFlag = 8;
+
+// Beyond this many powers of 2 or 5 between two values, compare() rounds instead.
+constexpr std::int64_t kMaxExactShift = 1'000'000;
+
+// to_bin_float() scales radix-10 values by an exact power of ten up to here,
+// which covers every decimal_parts() of a double.
+constexpr std::int64_t kMaxExactPowerOfTen = 400;
+
+// 10^exponent as a BigReal, exactly: the decimal backend takes it as mantissa 1.
+BigReal power_of_ten(std::int64_t exponent) {
+    return BigReal(DecBackend(1.0, exponent));
+}
+
+// The decimal backend's limbs hold eight digits each.
+constexpr std::int64_t kLimbDigits = 8;
+constexpr std::int64_t kLimbs = DecBackend::cpp_dec_float_total_digits10 / kLimbDigits;
+
+// An integer mantissa as a BigReal, limb by limb, so one that fits the stored
+// digits converts exactly; longer ones round through to_big_real(BigInt).
+BigReal decimal_mantissa(const BigInt &mantissa) {
+    static const BigInt limb_size(100'000'000);
+    std::array<unsigned long long, kLimbs> limbs{};
+    BigInt rest = mantissa;
+    std::size_t count = 0;
+    for (; rest != 0; ++count) {
+        if (count == limbs.size()) {
+            return to_big_real(mantissa);
+        }
+        limbs[count] = static_cast<unsigned long long>(rest % limb_size);
+        rest /= limb_size;
+    }
+    static const BigReal limb_scale = power_of_ten(kLimbDigits);
+    BigReal value;
+    while (count > 0) {
+        value = value * limb_scale + BigReal(limbs[--count]);
+    }
+    return value;
+}
+
+ExactParts special(bool nan, bool negative) {
+    ExactParts parts;
+    parts.kind = nan ? ExactParts::Kind::NaN : ExactParts::Kind::Infinite;
+    parts.negative = negative;
+    return parts;
+}
+
+// Move trailing zero digits of a radix-10 mantissa into the exponent.
+void strip_decimal_zeros(ExactParts &parts) {
+    if (parts.mantissa == 0) {
+        parts.exponent = 0;
+        return;
+    }
+    static const BigInt kChunk(100'000'000);
+    while (parts.mantissa % kChunk == 0) {
+        parts.mantissa /= kChunk;
+        parts.exponent += 8;
+    }
+    while (parts.mantissa % 10 == 0) {
+        parts.mantissa /= 10;
+        parts.exponent += 1;
+    }
+}
+
+void strip_binary_zeros(ExactParts &parts) {
+    if (parts.mantissa == 0) {
+        parts.exponent = 0;
+        return;
+    }
+    const unsigned zeros = boost::multiprecision::lsb(parts.mantissa);
+    parts.mantissa >>= zeros;
+    parts.exponent += zeros;
+}
+
+bool is_zero(const ExactParts &parts) {
+    return parts.kind == ExactParts::Kind::Finite && parts.mantissa == 0;
+}
+
+// Approximate log2 |value|, good to about one unit; finite nonzero values only.
+double log2_magnitude(const ExactParts &parts) {
+    return static_cast<double>(boost::multiprecision::msb(parts.mantissa)) +
+           static_cast<double>(parts.exponent) * std::log2(static_cast<double>(parts.radix));
+}
+
+// |a| <=> |b| for finite nonzero values. Both are written as m * 2^p * 5^q; the
+// common powers cancel and the rest multiply into the mantissas.
+std::strong_ordering compare_magnitude(const ExactParts &a, const ExactParts &b) {
+    const double gap = log2_magnitude(a) - log2_magnitude(b);
+    if (gap > 2.0) {
+        return std::strong_ordering::greater;
+    }
+    if (gap < -2.0) {
+        return std::strong_ordering::less;
+    }
+
+    const auto fives = [](const ExactParts &p) { return p.radix == 10 ? p.exponent : 0; };
+    const std::int64_t twos = a.exponent - b.exponent;
+    const std::int64_t five_gap = fives(a) - fives(b);
+    if (std::abs(twos) > kMaxExactShift || std::abs(five_gap) > kMaxExactShift) {
+        const BigReal x = boost::multiprecision::abs(to_big_real(a));
+        const BigReal y = boost::multiprecision::abs(to_big_real(b));
+        return x.compare(y) <=> 0;
+    }
+
+    BigInt left = a.mantissa;
+    BigInt right = b.mantissa;
+    (twos >= 0 ? left : right) <<= static_cast<unsigned>(std::abs(twos));
+    (five_gap >= 0 ? left : right) *=
+        boost::multiprecision::pow(BigInt(5), static_cast<unsigned>(std::abs(five_gap)));
+    return left.compare(right) <=> 0;
+}
+
+template <typename T> void put(std::string &out, T value) {
+    for (unsigned i = 0; i < sizeof(T); ++i) {
+        out.push_back(static_cast<char>((static_cast<std::uint64_t>(value) >> (8 * i)) & 0xff));
+    }
+}
+
+template <typename T> T take(std::string_view &in) {
+    if (in.size() < sizeof(T)) {
+        throw CalculatorError("Invalid data");
+    }
+    std::uint64_t value = 0;
+    for (unsigned i = 0; i < sizeof(T); ++i) {
+        value |= static_cast<std::uint64_t>(static_cast<unsigned char>(in[i])) << (8 * i);
+    }
+    in.remove_prefix(sizeof(T));
+    return static_cast<T>(value);
+}
+
+} // namespace
+
+ExactParts exact_parts(const BigReal &x) {
+    if (!boost::multiprecision::isfinite(x)) {
+        return special(boost::multiprecision::isnan(x), x < 0);
+    }
+    ExactParts parts;
+    parts.negative = x < 0;
+    if (x == 0) {
+        return parts;
+    }
+    // Read the stored limbs of eight digits from the top. Scaling by 10^(8k) only
+    // moves limbs, so every step is exact.
+    static const BigReal limb_scale = power_of_ten(kLimbDigits);
+    const std::int64_t order = x.backend().order();
+    const std::int64_t top = order - ((order % kLimbDigits) + kLimbDigits) % kLimbDigits;
+    BigReal rest = boost::multiprecision::abs(x) * power_of_ten(-top);
+    parts.exponent = top;
+    for (std::int64_t k = 0; k < kLimbs && rest != 0; ++k) {
+        const BigReal limb = boost::multiprecision::trunc(rest);
+        parts.mantissa = parts.mantissa * 100'000'000 + limb.convert_to<unsigned long long>();
+        rest = (rest - limb) * limb_scale;
+        parts.exponent = top - kLimbDigits * k;
+    }
+    strip_decimal_zeros(parts);
+    return parts;
+}
+
+ExactParts exact_parts(const BF &x) {
+    if (!boost::multiprecision::isfinite(x)) {
+        return special(boost::multiprecision::isnan(x), x < 0);
+    }
+    ExactParts parts;
+    parts.radix = 2;
+    parts.negative = x < 0;
+    if (x == 0) {
+        return parts;
+    }
+    constexpr int bits = std::numeric_limits<BF>::digits;
+    int exponent = 0;
+    const BF significand = boost::multiprecision::frexp(boost::multiprecision::abs(x), &exponent);
+    parts.mantissa = BigInt(boost::multiprecision::ldexp(significand, bits));
+    parts.exponent = exponent - bits;
+    strip_binary_zeros(parts);
+    return parts;
+}
+
+ExactParts exact_parts(double x) {
+    if (!std::isfinite(x)) {
+        return special(std::isnan(x), std::signbit(x));
+    }
+    ExactParts parts;
+    parts.radix = 2;
+    parts.negative = std::signbit(x) && x != 0.0;
+    if (x == 0.0) {
+        return parts;
+    }
+    constexpr int bits = std::numeric_limits<double>::digits;
+    int exponent = 0;
+    const double significand = std::frexp(std::abs(x), &exponent);
+    parts.mantissa = BigInt(static_cast<std::uint64_t>(std::ldexp(significand, bits)));
+    parts.exponent = exponent - bits;
+    strip_binary_zeros(parts);
+    return parts;
+}
+
+ExactParts exact_parts(const BigInt &x) {
+    ExactParts parts;
+    parts.negative = x < 0;
+    parts.mantissa = boost::multiprecision::abs(x);
+    strip_decimal_zeros(parts);
+    return parts;
+}
+
+ExactParts decimal_parts(double x) {
+    if (!std::isfinite(x) || x == 0.0) {
+        return exact_parts(x);
+    }
+    // Shortest round trip in scientific form, "-d.ddde+XX": at most 17 digits.
+    std::array<char, 32> buf{};
+    const auto res =
+        std::to_chars(buf.data(), buf.data() + buf.size(), x, std::chars_format::scientific);
+    const char *p = buf.data();
+    ExactParts parts;
+    parts.negative = *p == '-';
+    p += parts.negative ? 1 : 0;
+
+    std::uint64_t digits = 0;
+    int count = 0;
+    for (; p != res.ptr && *p != 'e'; ++p) {
+        if (*p != '.') {
+            digits = digits * 10 + static_cast<std::uint64_t>(*p - '0');
+            ++count;
+        }
+    }
+    int exp10 = 0;
+    p += p != res.ptr && p[1] == '+' ? 2 : 1;
+    std::from_chars(p, res.ptr, exp10);
+
+    parts.mantissa = digits;
+    parts.exponent = exp10 - (count - 1);
+    strip_decimal_zeros(parts);
+    return parts;
+}
+
+BigReal to_big_real(const ExactParts &parts) {
+    BigReal value;
+    switch (parts.kind) {
+    case ExactParts::Kind::NaN:
+        return std::numeric_limits<BigReal>::quiet_NaN();
+    case ExactParts::Kind::Infinite:
+        value = std::numeric_limits<BigReal>::infinity();
+        break;
+    case ExactParts::Kind::Finite:
+    default:
+        if (parts.radix == 10) {
+            value = decimal_mantissa(parts.mantissa);
+            value *= power_of_ten(parts.exponent);
+        } else {
+            value = to_big_real(parts.mantissa);
+            value *= boost::multiprecision::pow(BigReal(parts.radix), parts.exponent);
+        }
+        break;
+    }
+    return parts.negative ? BigReal(-value) : value;
+}
+
+BF to_bin_float(const ExactParts &parts) {
+    BF value;
+    switch (parts.kind) {
+    case ExactParts::Kind::NaN:
+        return std::numeric_limits<BF>::quiet_NaN();
+    case ExactParts::Kind::Infinite:
+        value = std::numeric_limits<BF>::infinity();
+        break;
+    case ExactParts::Kind::Finite:
+    default:
+        value = BF(parts.mantissa);
+        if (parts.radix == 2) {
+            value = boost::multiprecision::ldexp(value, static_cast<int>(std::clamp<std::int64_t>(
+                                                            parts.exponent, INT32_MIN, INT32_MAX)));
+        } else if (std::abs(parts.exponent) <= kMaxExactPowerOfTen) {
+            // An exact power of ten leaves a single rounding, as parsing the digits would.
+            const BigInt scale = boost::multiprecision::pow(
+                BigInt(10), static_cast<unsigned>(std::abs(parts.exponent)));
+            value = parts.exponent >= 0 ? BF(parts.mantissa * scale) : value / BF(scale);
+        } else {
+            value *= boost::multiprecision::pow(BF(parts.radix), parts.exponent);
+        }
+        break;
+    }
+    return parts.negative ? BF(-value) : value;
+}
+
+std::partial_ordering compare(const ExactParts &a, const ExactParts &b) {
+    using Kind = ExactParts::Kind;
+    if (a.kind == Kind::NaN || b.kind == Kind::NaN) {
+        return std::partial_ordering::unordered;
+    }
+    // Sign first: -1, 0 or 1, with infinities past every finite value.
+    const auto rank = [](const ExactParts &p) {
+        const int sign = is_zero(p) ? 0 : (p.negative ? -1 : 1);
+        return p.kind == Kind::Infinite ? 2 * sign : sign;
+    };
+    const int ra = rank(a);
+    const int rb = rank(b);
+    if (ra != rb || ra == 0 || std::abs(ra) == 2) {
+        return ra <=> rb;
+    }
+    const std::strong_ordering magnitude = compare_magnitude(a, b);
+    return a.negative ? 0 <=> magnitude : magnitude <=> 0;
+}
+
+std::string to_bytes(std::span<const ExactParts> values) {
+    std::string out(1, static_cast<char>(kFormatVersion));
+    std::vector<unsigned char> mantissa;
+    for (const ExactParts &parts : values) {
+        std::uint8_t flags = parts.negative ? kNegativeFlag : 0;
+        flags |= parts.radix == 2 ? kBinaryFlag : 0;
+        flags |= parts.kind == ExactParts::Kind::Infinite ? kInfiniteFlag : 0;
+        flags |= parts.kind == ExactParts::Kind::NaN ? kNaNFlag : 0;
+        put(out, flags);
+        put(out, parts.exponent);
+
+        mantissa.clear();
+        if (parts.mantissa != 0) {
+            boost::multiprecision::export_bits(parts.mantissa, std::back_inserter(mantissa), 8,
+                                               false);
+        }
+        put(out, static_cast<std::uint32_t>(mantissa.size()));
+        out.append(mantissa.begin(), mantissa.end());
+    }
+    return out;
+}
+
+std::vector<ExactParts> parts_from_bytes(std::string_view bytes) {
+    if (take<std::uint8_t>(bytes) != kFormatVersion) {
+        throw CalculatorError("Invalid data");
+    }
+    std::vector<ExactParts> values;
+    while (!bytes.empty()) {
+        ExactParts parts;
+        const auto flags = take<std::uint8_t>(bytes);
+        parts.negative = (flags & kNegativeFlag) != 0;
+        parts.radix = (flags & kBinaryFlag) != 0 ? 2 : 10;
+        if ((flags & kNaNFlag) != 0) {
+            parts.kind = ExactParts::Kind::NaN;
+        } else if ((flags & kInfiniteFlag) != 0) {
+            parts.kind = ExactParts::Kind::Infinite;
+        }
+        parts.exponent = take<std::int64_t>(bytes);
+
+        const auto length = take<std::uint32_t>(bytes);
+        if (bytes.size() < length) {
+            throw CalculatorError("Invalid data");
+        }
+        if (length > 0) {
+            const auto *data = reinterpret_cast<const unsigned char *>(bytes.data());
+            boost::multiprecision::import_bits(parts.mantissa, data, data + length, 8, false);
+        }
+        bytes.remove_prefix(length);
+        values.push_back(std::move(parts));
+    }
+    return values;
+}
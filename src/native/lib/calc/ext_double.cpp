@@ -0,0 +1,276 @@
+#include "calc/pub/ext_double.hpp"
+#include "calc/internal/helpers.hpp"
+
+#include <array>
+#include <charconv>
+#include <cmath>
+#include <cstdlib>
+#include <ostream>
+
+#include <boost/multiprecision/cpp_dec_float.hpp>
+
+namespace {
+
+// Unevaluated sum hi + lo with |lo| <= ulp(hi) / 2 (Dekker / Knuth double-double).
+struct DD {
+    double hi;
+    double lo;
+};
+
+constexpr DD kLn2{0x1.62e42fefa39efp-1, 0x1.abc9e3b39803fp-56};
+constexpr DD kLn10{0x1.26bb1bbb55516p+1, -0x1.f48ad494ea3e9p-53};
+constexpr DD kLog2E{0x1.71547652b82fep+0, 0x1.777d0ffda0d24p-56};
+
+DD two_sum(double a, double b) {
+    const double s = a + b;
+    const double bb = s - a;
+    return {s, (a - (s - bb)) + (b - bb)};
+}
+
+// two_sum for |a| >= |b|.
+DD quick_two_sum(double a, double b) {
+    const double s = a + b;
+    return {s, b - (s - a)};
+}
+
+DD two_prod(double a, double b) {
+    const double p = a * b;
+    return {p, std::fma(a, b, -p)};
+}
+
+DD add(DD a, DD b) {
+    DD s = two_sum(a.hi, b.hi);
+    const DD t = two_sum(a.lo, b.lo);
+    s = quick_two_sum(s.hi, s.lo + t.hi);
+    return quick_two_sum(s.hi, s.lo + t.lo);
+}
+
+DD mul(DD a, DD b) {
+    const DD p = two_prod(a.hi, b.hi);
+    return quick_two_sum(p.hi, p.lo + (a.hi * b.lo + a.lo * b.hi));
+}
+
+DD mul(DD a, double b) {
+    const DD p = two_prod(a.hi, b);
+    return quick_two_sum(p.hi, p.lo + a.lo * b);
+}
+
+DD div(DD a, DD b) {
+    const double q1 = a.hi / b.hi;
+    DD r = add(a, mul(b, -q1));
+    const double q2 = r.hi / b.hi;
+    r = add(r, mul(b, -q2));
+    const double q3 = r.hi / b.hi;
+    return add(quick_two_sum(q1, q2), DD{q3, 0.0});
+}
+
+// ln(hi + lo) for a significand in [0.5, 1); good to about an ulp of the result.
+DD ln_significand(double hi, double lo) {
+    return two_sum(std::log(hi), lo / hi);
+}
+
+// ln|x| = exponent * ln 2 + ln(significand).
+DD ln_dd(double hi, double lo, std::int64_t exponent) {
+    return add(mul(kLn2, static_cast<double>(exponent)), ln_significand(hi, lo));
+}
+
+} // namespace
+
+ExtDouble::ExtDouble(double x) : ExtDouble(x, 0.0, 0) {
+}
+
+// The two halves of x are exact doubles, so their sum is exact as a double-double.
+ExtDouble::ExtDouble(long long x)
+    : ExtDouble(std::ldexp(static_cast<double>(x >> 32), 32), static_cast<double>(x & 0xffffffffLL),
+                0) {
+}
+
+ExtDouble::ExtDouble(double hi, double lo, std::int64_t exponent) {
+    calc_detail::require(std::isfinite(hi) && std::isfinite(lo));
+    const DD sum = two_sum(hi, lo);
+    if (sum.hi == 0.0) {
+        return;
+    }
+
+    int shift = 0;
+    const double significand = std::frexp(sum.hi, &shift);
+    const std::int64_t e = exponent + shift;
+    if (e > kMaxExponent) {
+        calc_detail::math_error();
+    }
+    if (e < -kMaxExponent) {
+        return;
+    }
+    hi_ = significand;
+    lo_ = std::ldexp(sum.lo, -shift);
+    exponent_ = e;
+}
+
+ExtDouble ExtDouble::from_decimal(double x) {
+    calc_detail::require(std::isfinite(x));
+    if (std::abs(x) < 0x1p53 && std::floor(x) == x) {
+        return ExtDouble(x); // integers print as themselves
+    }
+
+    // Shortest round trip in scientific form, "-d.ddde+XX": at most 17 digits,
+    // which fit a long long, times a power of ten.
+    std::array<char, 32> buf{};
+    const auto res =
+        std::to_chars(buf.data(), buf.data() + buf.size(), x, std::chars_format::scientific);
+    const char *p = buf.data();
+    const bool negative = *p == '-';
+    p += negative ? 1 : 0;
+
+    long long digits = 0;
+    int count = 0;
+    for (; p != res.ptr && *p != 'e'; ++p) {
+        if (*p != '.') {
+            digits = digits * 10 + (*p - '0');
+            ++count;
+        }
+    }
+    int exp10 = 0;
+    p += p != res.ptr && p[1] == '+' ? 2 : 1;
+    std::from_chars(p, res.ptr, exp10);
+    exp10 -= count - 1;
+
+    const ExtDouble value(negative ? -digits : digits);
+    if (exp10 == 0) {
+        return value;
+    }
+    const ExtDouble scale = ExtDouble(10LL).pow(static_cast<long long>(std::abs(exp10)));
+    return exp10 > 0 ? value * scale : value / scale;
+}
+
+bool ExtDouble::fits_double() const noexcept {
+    return is_zero() || (exponent_ >= -1021 && exponent_ <= 1024);
+}
+
+double ExtDouble::to_double() const noexcept {
+    // hi is already the double nearest hi + lo; past +-1100 ldexp saturates anyway.
+    const std::int64_t e = exponent_ < -1100 ? -1100 : (exponent_ > 1100 ? 1100 : exponent_);
+    return std::ldexp(hi_, static_cast<int>(e));
+}
+
+BigReal ExtDouble::to_big() const {
+    if (is_zero()) {
+        return BigReal(0);
+    }
+    // Both halves convert exactly; the power of two is a few BigReal squarings.
+    const BigReal significand = BigReal(hi_) + BigReal(lo_);
+    return significand * boost::multiprecision::pow(BigReal(2), exponent_);
+}
+
+ExtDouble ExtDouble::sqrt() const {
+    if (is_zero()) {
+        return {};
+    }
+    // An even exponent halves exactly; the significand takes the odd factor of 2.
+    DD m{hi_, lo_};
+    std::int64_t e = exponent_;
+    if (e % 2 != 0) {
+        m = {m.hi * 2.0, m.lo * 2.0};
+        e -= 1;
+    }
+    // One Newton step from the double root doubles the correct bits.
+    const double s = std::sqrt(m.hi);
+    const DD square = two_prod(s, s);
+    const DD r = add(m, DD{-square.hi, -square.lo});
+    return ExtDouble(s, r.hi / (2.0 * s), e / 2);
+}
+
+ExtDouble ExtDouble::ln() const {
+    const DD l = ln_dd(hi_, lo_, exponent_);
+    return ExtDouble(l.hi, l.lo, 0);
+}
+
+ExtDouble ExtDouble::log10() const {
+    const DD l = div(ln_dd(hi_, lo_, exponent_), kLn10);
+    return ExtDouble(l.hi, l.lo, 0);
+}
+
+ExtDouble ExtDouble::pow(long long n) const {
+    if (n == 0) {
+        return ExtDouble(1.0);
+    }
+    // Negative powers square the reciprocal, so a result that underflows flushes
+    // to zero instead of overflowing on the way.
+    ExtDouble base = n < 0 ? ExtDouble(1.0) / *this : *this;
+    unsigned long long k = n < 0 ? 0ULL - static_cast<unsigned long long>(n) : n;
+    ExtDouble result(1.0);
+    while (true) {
+        if ((k & 1ULL) != 0) {
+            result = result * base;
+        }
+        k >>= 1;
+        if (k == 0) {
+            return result;
+        }
+        base = base * base;
+    }
+}
+
+ExtDouble ExtDouble::pow(double y) const {
+    if (std::abs(y) < 0x1p63 && std::floor(y) == y) {
+        return pow(static_cast<long long>(y));
+    }
+    calc_detail::require(!std::isnan(y));
+
+    if (!(std::abs(y) < 0x1p63)) {
+        // Every such y is an even integer: the result is 1, 0 or out of range.
+        const ExtDouble magnitude = is_negative() ? -*this : *this;
+        if (magnitude == ExtDouble(1.0)) {
+            return magnitude;
+        }
+        calc_detail::require((magnitude - ExtDouble(1.0)).is_negative() == (y > 0.0));
+        return {};
+    }
+
+    // y = n + f with 0 < f < 1: x^n by squaring, x^f as 2^(f log2 x) with the
+    // logarithm carried in double-double so large exponents keep their precision.
+    const double n = std::floor(y);
+    const double f = y - n;
+    const DD log2x =
+        add(DD{static_cast<double>(exponent_), 0.0}, mul(ln_significand(hi_, lo_), kLog2E));
+    const DD t = mul(log2x, f);
+    const double k = std::floor(t.hi);
+    const DD frac = two_sum(t.hi - k, t.lo);
+    const double g = std::exp2(frac.hi);
+    const ExtDouble fractional(g, g * frac.lo * kLn2.hi, static_cast<std::int64_t>(k));
+    return pow(static_cast<long long>(n)) * fractional;
+}
+
+ExtDouble operator+(const ExtDouble &a, const ExtDouble &b) {
+    if (a.is_zero()) {
+        return b;
+    }
+    if (b.is_zero()) {
+        return a;
+    }
+    const bool a_larger = a.exponent_ >= b.exponent_;
+    const ExtDouble &large = a_larger ? a : b;
+    const ExtDouble &small = a_larger ? b : a;
+    const std::int64_t shift = large.exponent_ - small.exponent_;
+    if (shift > 110) {
+        return large; // below the last bit of the significand
+    }
+    const int s = static_cast<int>(shift);
+    const DD sum =
+        add(DD{large.hi_, large.lo_}, DD{std::ldexp(small.hi_, -s), std::ldexp(small.lo_, -s)});
+    return ExtDouble(sum.hi, sum.lo, large.exponent_);
+}
+
+ExtDouble operator*(const ExtDouble &a, const ExtDouble &b) {
+    const DD p = mul(DD{a.hi_, a.lo_}, DD{b.hi_, b.lo_});
+    return ExtDouble(p.hi, p.lo, a.exponent_ + b.exponent_);
+}
+
+ExtDouble operator/(const ExtDouble &a, const ExtDouble &b) {
+    calc_detail::require(!b.is_zero());
+    const DD q = div(DD{a.hi_, a.lo_}, DD{b.hi_, b.lo_});
+    return ExtDouble(q.hi, q.lo, a.exponent_ - b.exponent_);
+}
+
+std::ostream &operator<<(std::ostream &out, const ExtDouble &x) {
+    return out << x.to_big();
+}
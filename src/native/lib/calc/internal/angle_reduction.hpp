@@ -0,0 +1,53 @@
+#pragma once
+
+#include <limits>
+#include <string>
+
+#include <boost/multiprecision/cpp_bin_float.hpp>
+#include <boost/multiprecision/cpp_int.hpp>
+
+#include "calc/pub/calculator.hpp"
+
+namespace calc_detail {
+
+// An angle as whole quarter turns plus a remainder:
+// x = (quadrant + remainder / scale) * pi/2, with |remainder| <= scale / 2.
+struct QuarterTurns {
+    unsigned quadrant = 0; // 0..3
+    boost::multiprecision::cpp_int remainder;
+    boost::multiprecision::cpp_int scale;
+};
+
+// Radian arguments above 10^kMaxRadianOrder throw instead of reducing.
+inline constexpr double kMaxRadianOrder = 10000;
+
+// Reduce x, read in `unit`, to the nearest quarter turn without rounding the
+// argument first. Degrees and gradians reduce modulo 360/400 in integer arithmetic,
+// so the remainder is exact. Radians are multiplied by 2/pi carried to as many
+// digits as |x| has integer digits plus `digits` and guard digits (Payne-Hanek),
+// so the remainder is good to `digits` significant digits however large x is.
+// A binary float is reduced as its decimal reading at the digits it holds, so a
+// BigComplex real part reduces like the BigReal it was converted from.
+QuarterTurns reduce_angle(const BigReal &x, Calculator::AngleUnit unit, unsigned digits);
+QuarterTurns reduce_angle(const boost::multiprecision::cpp_bin_float_50 &x,
+                          Calculator::AngleUnit unit, unsigned digits);
+
+// remainder / scale rounded to R. Only the leading digits of the quotient are
+// converted, which is much cheaper than converting both integers.
+template <typename R> R quarter_fraction(const QuarterTurns &turns) {
+    using boost::multiprecision::cpp_int;
+    using boost::multiprecision::msb;
+    if (turns.remainder == 0) {
+        return R(0);
+    }
+    const cpp_int magnitude = boost::multiprecision::abs(turns.remainder);
+    // Decimal digits by which the remainder is smaller than the scale, roughly.
+    const auto gap = static_cast<unsigned>(static_cast<double>(msb(turns.scale) - msb(magnitude)) *
+                                           0.30102999566398120);
+    const unsigned shift = gap + std::numeric_limits<R>::max_digits10 + 2;
+    const cpp_int quotient =
+        turns.remainder * boost::multiprecision::pow(cpp_int(10), shift) / turns.scale;
+    return R(quotient) * R("1e-" + std::to_string(shift));
+}
+
+} // namespace calc_detail
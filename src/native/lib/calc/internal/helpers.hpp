@@ -40,6 +40,16 @@ inline void require_nonzero(const BigComplex &x) {
     require(!(eval_is_zero(re) && eval_is_zero(im)));
 }
 
+// Run a BigReal kernel in a precision tier: the arguments move into the tier,
+// `fn` computes there, and the result is rounded back to BigReal.
+template <typename Fn, typename... Args>
+BigReal in_tier(Precision precision, Fn &&fn, const Args &...args) {
+    return with_tier(precision, [&]<typename R>() {
+        const R result = fn(tier_cast<R>(args)...);
+        return tier_cast<BigReal>(result);
+    });
+}
+
 inline bool nonneg_or_zero(long long n, long long k) {
     if (n < 0 || k < 0) {
         math_error();
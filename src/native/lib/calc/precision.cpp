@@ -0,0 +1,27 @@
+#include "calc/pub/precision.hpp"
+
+#include <atomic>
+
+namespace {
+
+std::atomic<Precision> g_default_precision{Precision::Digits50};
+
+} // namespace
+
+std::optional<Precision> precision_from_digits(unsigned digits) noexcept {
+    for (const Precision p :
+         {Precision::Digits20, Precision::Digits50, Precision::Digits100, Precision::Digits500}) {
+        if (digits10(p) == digits) {
+            return p;
+        }
+    }
+    return std::nullopt;
+}
+
+Precision default_precision() noexcept {
+    return g_default_precision.load(std::memory_order_relaxed);
+}
+
+void set_default_precision(Precision precision) noexcept {
+    g_default_precision.store(precision, std::memory_order_relaxed);
+}
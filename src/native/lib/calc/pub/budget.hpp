@@ -0,0 +1,66 @@
+#pragma once
+
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <string_view>
+
+// Shared cancel flag. Copies refer to the same flag, so one thread can cancel
+// work another thread is doing.
+class CancelToken {
+  public:
+    CancelToken() : flag_(std::make_shared<std::atomic<bool>>(false)) {}
+
+    void cancel() const noexcept { flag_->store(true, std::memory_order_relaxed); }
+    bool cancelled() const noexcept { return flag_->load(std::memory_order_relaxed); }
+
+  private:
+    std::shared_ptr<std::atomic<bool>> flag_;
+};
+
+// How far one evaluation may go: wall-clock time, operations and a cancel flag.
+// A default Limits is unlimited.
+struct Limits {
+    static constexpr std::uint64_t kUnlimited = UINT64_MAX;
+
+    std::chrono::nanoseconds timeout{0}; // 0: no deadline
+    std::uint64_t max_ops = kUnlimited;
+    std::optional<CancelToken> cancel;
+
+    bool unlimited() const noexcept {
+        return timeout.count() <= 0 && max_ops == kUnlimited && !cancel;
+    }
+};
+
+//
+// Meter for one evaluation under some Limits; the clock starts at construction.
+// Kernels charge it as they work (see Calculator::checkpoint). Past the deadline
+// or the operation budget it throws CalculatorError(kTimeoutMessage); once the
+// token is cancelled it throws CalculatorError(kCancelledMessage). The clock and
+// the flag are only read every kCheckStride operations.
+//
+// Not thread-safe: each evaluation gets its own Budget.
+//
+class Budget {
+  public:
+    using Clock = std::chrono::steady_clock;
+
+    static constexpr std::string_view kTimeoutMessage = "Timeout";
+    static constexpr std::string_view kCancelledMessage = "Cancelled";
+    static constexpr std::uint64_t kCheckStride = 256;
+
+    Budget() = default;
+    explicit Budget(const Limits &limits);
+
+    void charge(std::uint64_t ops) const;
+    std::uint64_t used() const noexcept { return used_; }
+
+  private:
+    Clock::time_point deadline_ = Clock::time_point::max();
+    std::uint64_t max_ops_ = Limits::kUnlimited;
+    std::optional<CancelToken> cancel_;
+    mutable std::uint64_t used_ = 0;
+    mutable std::uint64_t next_check_ = 0;
+};
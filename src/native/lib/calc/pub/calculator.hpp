@@ -1,7 +1,13 @@
 #pragma once
 
+#include <atomic>
 #include <complex>
+#include <cstdint>
+#include <optional>
+#include "calc/pub/budget.hpp"
 #include "calc/pub/errors.hpp"
+#include "calc/pub/ext_double.hpp"
+#include "calc/pub/precision.hpp"
 #include "types.hpp"
 
 class Calculator {
@@ -11,6 +17,35 @@ class Calculator {
     enum class AngleUnit { DEG, RAD, GRAD };
 
     Calculator() = default;
+    // Kernels charge their work to `budget` and stop when it runs out.
+    explicit Calculator(const Budget *budget) : budget_(budget) {}
+    Calculator(const Budget *budget, Precision precision)
+        : budget_(budget), precision_(precision) {}
+    Calculator(const Calculator &other) noexcept
+        : budget_(other.budget_), precision_(other.precision_.load(std::memory_order_relaxed)) {}
+    Calculator &operator=(const Calculator &other) noexcept {
+        budget_ = other.budget_;
+        precision_.store(other.precision_.load(std::memory_order_relaxed),
+                         std::memory_order_relaxed);
+        return *this;
+    }
+
+    // Working precision of the BigReal kernels; default_precision() unless set.
+    // Atomic, so one thread may change it while others compute with this Calculator;
+    // each kernel call reads it once.
+    Precision precision() const noexcept {
+        return precision_.load(std::memory_order_relaxed).value_or(default_precision());
+    }
+    void set_precision(std::optional<Precision> precision) noexcept {
+        precision_.store(precision, std::memory_order_relaxed);
+    }
+
+    // Charge `ops` units of work; throws Timeout/Cancelled past the budget's limits.
+    void checkpoint(std::uint64_t ops = 1) const {
+        if (budget_ != nullptr) {
+            budget_->charge(ops);
+        }
+    }
 
     // Real ops
     double add(double a, double b) const { return a + b; }
@@ -38,6 +73,16 @@ class Calculator {
     BigReal ln(const BigReal &a) const;
     BigReal root(const BigReal &a, const BigReal &b) const;
 
+    // ExtDouble ops (real-only, double precision with a 64-bit exponent)
+    ExtDouble add(const ExtDouble &a, const ExtDouble &b) const { return a + b; }
+    ExtDouble sub(const ExtDouble &a, const ExtDouble &b) const { return a - b; }
+    ExtDouble mul(const ExtDouble &a, const ExtDouble &b) const { return a * b; }
+    ExtDouble div(const ExtDouble &a, const ExtDouble &b) const;
+    ExtDouble pow(const ExtDouble &a, double b) const;
+    ExtDouble sqrt(const ExtDouble &a) const;
+    ExtDouble log(const ExtDouble &a) const;
+    ExtDouble ln(const ExtDouble &a) const;
+
     // Complex ops
     Complex add(Complex a, Complex b) const { return a + b; }
     Complex sub(Complex a, Complex b) const { return a - b; }
@@ -119,7 +164,22 @@ class Calculator {
 
     BigReal fact(const BigReal &a) const;
     BigReal gamma(const BigReal &a) const;
+
+    ExtDouble fact(const ExtDouble &a) const;
+    ExtDouble gamma(const ExtDouble &a) const;
+    // Exact n!, for n up to kMaxExactFactorial.
+    BigInt factorial(std::uint64_t n) const;
+    static constexpr std::uint64_t kMaxExactFactorial = 1'000'000;
     // Permute/Choose
     BigReal permute(long long a, long long b) const;
     BigReal choose(long long a, long long b) const;
+
+  private:
+    const Budget *budget_ = nullptr;
+    std::atomic<std::optional<Precision>> precision_;
 };
+
+static_assert(std::atomic<std::optional<Precision>>::is_always_lock_free);
+
+// Nearest BigReal to an exact integer, without printing all of its digits.
+BigReal to_big_real(const BigInt &value);
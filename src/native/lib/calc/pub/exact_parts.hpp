@@ -0,0 +1,55 @@
+#pragma once
+
+#include <compare>
+#include <cstdint>
+#include <span>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include <boost/multiprecision/cpp_bin_float.hpp>
+
+#include "types.hpp"
+
+//
+// Exact integer form of a number: value = (-1)^negative * mantissa * radix^exponent.
+// BigReal splits in radix 10, doubles and the binary parts of BigComplex in
+// radix 2. Trailing zero digits are moved into the exponent, so the mantissa
+// is as short as the value allows.
+//
+// These back the Python number protocol: exact comparisons and hashes across
+// int, float, BigReal and BigComplex, and the binary pickle format, all without
+// formatting a number as text.
+//
+struct ExactParts {
+    enum class Kind : std::uint8_t { Finite, Infinite, NaN };
+
+    Kind kind = Kind::Finite;
+    bool negative = false;
+    BigInt mantissa;
+    std::int64_t exponent = 0;
+    unsigned radix = 10;
+};
+
+ExactParts exact_parts(const BigReal &x);
+ExactParts exact_parts(const boost::multiprecision::cpp_bin_float_50 &x);
+ExactParts exact_parts(double x);
+ExactParts exact_parts(const BigInt &x);
+// The shortest decimal that reads back as x (the digits of Python's repr), so
+// 0.1 gives 1 * 10^-1 rather than the binary value of the double.
+ExactParts decimal_parts(double x);
+
+// Exact when the mantissa fits the target's digits, rounded otherwise.
+BigReal to_big_real(const ExactParts &parts);
+boost::multiprecision::cpp_bin_float_50 to_bin_float(const ExactParts &parts);
+
+// Exact ordering of two values of any radix; NaN is unordered. Values with
+// exponents too far apart to compare exactly in reasonable memory (past
+// 10^1000000) fall back to comparing their BigReal roundings.
+std::partial_ordering compare(const ExactParts &a, const ExactParts &b);
+
+// Portable byte form of a sequence of values: a format version byte, then per
+// value a flags byte, the exponent (8 bytes), the mantissa length (4 bytes) and
+// the mantissa, all little endian. Malformed input throws CalculatorError.
+std::string to_bytes(std::span<const ExactParts> values);
+std::vector<ExactParts> parts_from_bytes(std::string_view bytes);
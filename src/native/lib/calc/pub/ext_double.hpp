@@ -0,0 +1,70 @@
+#pragma once
+
+#include <cstdint>
+#include <iosfwd>
+
+#include "types.hpp"
+
+//
+// Real number with a double-double significand and a 64-bit binary exponent:
+// value = (hi + lo) * 2^exponent, with 0.5 <= |hi| < 1 unless the value is zero.
+//
+// It sits between double and BigReal. Results that only overflow double's
+// exponent (2^2000, 200!, 10^200 x 10^200) keep double-like precision at close to
+// double speed instead of being recomputed in 50-digit BigReal. The second double
+// of the significand absorbs the rounding of repeated squaring and of decimal
+// inputs, so results show the same 16 digits BigReal would.
+//
+// Exponents beyond kMaxExponent throw CalculatorError("Math error"); below
+// -kMaxExponent the value flushes to zero.
+//
+class ExtDouble {
+  public:
+    static constexpr std::int64_t kMaxExponent = std::int64_t{1} << 61;
+
+    ExtDouble() = default;
+    // Exact. inf and NaN throw.
+    explicit ExtDouble(double x);
+    explicit ExtDouble(long long x);
+    // (hi + lo) * 2^exponent, normalized.
+    ExtDouble(double hi, double lo, std::int64_t exponent);
+
+    // The decimal value x prints as (its shortest round trip), so 0.1 is exactly
+    // one tenth up to the significand's precision. to_big() reads doubles the same way.
+    static ExtDouble from_decimal(double x);
+
+    double hi() const noexcept { return hi_; }
+    double lo() const noexcept { return lo_; }
+    std::int64_t exponent() const noexcept { return exponent_; }
+    bool is_zero() const noexcept { return hi_ == 0.0; }
+    bool is_negative() const noexcept { return hi_ < 0.0; }
+
+    // Zero or inside double's normal range, where to_double() only drops lo.
+    bool fits_double() const noexcept;
+    // Nearest double; +-inf or 0 outside double's range.
+    double to_double() const noexcept;
+    BigReal to_big() const;
+
+    // Kernels without domain checks; the Calculator overloads add those.
+    ExtDouble sqrt() const;           // *this >= 0
+    ExtDouble ln() const;             // *this > 0
+    ExtDouble log10() const;          // *this > 0
+    ExtDouble pow(double y) const;    // *this > 0, or y an integer
+    ExtDouble pow(long long n) const; // *this != 0 when n < 0
+
+    ExtDouble operator-() const { return ExtDouble(-hi_, -lo_, exponent_); }
+    friend ExtDouble operator+(const ExtDouble &a, const ExtDouble &b);
+    friend ExtDouble operator-(const ExtDouble &a, const ExtDouble &b) { return a + -b; }
+    friend ExtDouble operator*(const ExtDouble &a, const ExtDouble &b);
+    friend ExtDouble operator/(const ExtDouble &a, const ExtDouble &b); // b != 0
+    // Normalized, so equal values have equal parts.
+    friend bool operator==(const ExtDouble &a, const ExtDouble &b) = default;
+
+  private:
+    double hi_ = 0.0;
+    double lo_ = 0.0;
+    std::int64_t exponent_ = 0;
+};
+
+// Prints like BigReal: the stream's precision in significant digits.
+std::ostream &operator<<(std::ostream &out, const ExtDouble &x);
@@ -0,0 +1,82 @@
+#pragma once
+
+#include <cstdint>
+#include <optional>
+#include <type_traits>
+#include <utility>
+
+#include <boost/math/constants/constants.hpp>
+#include <boost/multiprecision/cpp_dec_float.hpp>
+
+#include "types.hpp"
+
+//
+// Working precision of the BigReal kernels. Values are still stored as BigReal
+// (50 digits); a tier sets how many digits sqrt, ln, pow, trig and gamma compute
+// with before their result is rounded back. Digits20 is the cheap tier for
+// display-only results, Digits100/500 carry guard digits through long kernels.
+//
+enum class Precision : std::uint8_t { Digits20, Digits50, Digits100, Digits500 };
+
+template <unsigned Digits>
+using TierReal =
+    boost::multiprecision::number<boost::multiprecision::cpp_dec_float<Digits, std::int64_t>>;
+
+static_assert(std::is_same_v<TierReal<50>, BigReal>);
+
+constexpr unsigned digits10(Precision precision) noexcept {
+    switch (precision) {
+    case Precision::Digits20:
+        return 20;
+    case Precision::Digits100:
+        return 100;
+    case Precision::Digits500:
+        return 500;
+    case Precision::Digits50:
+    default:
+        return 50;
+    }
+}
+
+// Tier with exactly `digits` digits, if there is one.
+std::optional<Precision> precision_from_digits(unsigned digits) noexcept;
+
+// Tier used by Calculators that were not given one. Process-wide; the app's
+// precision setting writes it.
+Precision default_precision() noexcept;
+void set_default_precision(Precision precision) noexcept;
+
+// Call fn.template operator()<R>() with R the TierReal of `precision`.
+template <typename Fn> decltype(auto) with_tier(Precision precision, Fn &&fn) {
+    switch (precision) {
+    case Precision::Digits20:
+        return std::forward<Fn>(fn).template operator()<TierReal<20>>();
+    case Precision::Digits100:
+        return std::forward<Fn>(fn).template operator()<TierReal<100>>();
+    case Precision::Digits500:
+        return std::forward<Fn>(fn).template operator()<TierReal<500>>();
+    case Precision::Digits50:
+    default:
+        return std::forward<Fn>(fn).template operator()<TierReal<50>>();
+    }
+}
+
+// Change tiers by copying limbs; narrowing truncates to the target's digits.
+template <typename To, unsigned Digits> To tier_cast(const TierReal<Digits> &value) {
+    if constexpr (std::is_same_v<To, TierReal<Digits>>) {
+        return value;
+    } else {
+        return To(typename To::backend_type(value.backend()));
+    }
+}
+
+// Constants per tier, computed on first use and kept for the process.
+template <typename R> const R &pi_constant() {
+    static const R value = boost::math::constants::pi<R>();
+    return value;
+}
+
+template <typename R> const R &e_constant() {
+    static const R value = boost::math::constants::e<R>();
+    return value;
+}
@@ -50,20 +50,20 @@ double Calculator::ln(double a) const {
 
 BigReal Calculator::sqrt(const BigReal &a) const {
     calc_detail::require(a >= 0);
-    using boost::multiprecision::sqrt;
-    return sqrt(a);
+    return calc_detail::in_tier(
+        precision(), [](const auto &x) { return boost::multiprecision::sqrt(x); }, a);
 }
 
 BigReal Calculator::log(const BigReal &a) const {
     calc_detail::require(a > 0);
-    using boost::multiprecision::log10;
-    return log10(a);
+    return calc_detail::in_tier(
+        precision(), [](const auto &x) { return boost::multiprecision::log10(x); }, a);
 }
 
 BigReal Calculator::ln(const BigReal &a) const {
     calc_detail::require(a > 0);
-    using boost::multiprecision::log;
-    return log(a);
+    return calc_detail::in_tier(
+        precision(), [](const auto &x) { return boost::multiprecision::log(x); }, a);
 }
 
 BigReal Calculator::root(const BigReal &x, const BigReal &y) const {
@@ -83,6 +83,25 @@ BigReal Calculator::root(const BigReal &x, const BigReal &y) const {
     return this->pow(x, BigReal(1) / y);
 }
 
+// -----------------
+// ExtDouble
+// -----------------
+
+ExtDouble Calculator::sqrt(const ExtDouble &a) const {
+    calc_detail::require(!a.is_negative());
+    return a.sqrt();
+}
+
+ExtDouble Calculator::log(const ExtDouble &a) const {
+    calc_detail::require(!a.is_negative() && !a.is_zero());
+    return a.log10();
+}
+
+ExtDouble Calculator::ln(const ExtDouble &a) const {
+    calc_detail::require(!a.is_negative() && !a.is_zero());
+    return a.ln();
+}
+
 // -----------------
 // Complex
 // -----------------
@@ -1,7 +1,11 @@
 #include "calc/pub/calculator.hpp"
+#include "calc/internal/angle_reduction.hpp"
+#include "calc/internal/helpers.hpp"
 
 #include <cmath>
 #include <complex>
+#include <limits>
+#include <type_traits>
 
 #include <boost/math/constants/constants.hpp>
 #include <boost/multiprecision/cpp_bin_float.hpp>
@@ -36,82 +40,141 @@ constexpr double from_radians_factor(Calculator::AngleUnit unit) noexcept {
     }
 }
 
-template <typename T> inline T to_radians(T x, Calculator::AngleUnit unit) noexcept {
-    return x * radians_factor(unit);
-}
-
-template <typename T> inline T from_radians(T x, Calculator::AngleUnit unit) noexcept {
-    return x * from_radians_factor(unit);
-}
-
-inline BigReal radians_factor_big(Calculator::AngleUnit unit) noexcept {
-    const BigReal pi = boost::math::constants::pi<BigReal>();
+// Degrees and gradians reduce exactly (fmod is exact) before the inexact
+// conversion, so huge arguments keep their true value modulo one turn.
+inline double reduce_turn(double x, Calculator::AngleUnit unit) noexcept {
     switch (unit) {
     case Calculator::AngleUnit::DEG:
-        return pi / BigReal(180);
+        return std::fmod(x, 360.0);
     case Calculator::AngleUnit::GRAD:
-        return pi / BigReal(200);
+        return std::fmod(x, 400.0);
     case Calculator::AngleUnit::RAD:
     default:
-        return BigReal(1);
+        return x;
     }
 }
 
-inline BigReal from_radians_factor_big(Calculator::AngleUnit unit) noexcept {
-    const BigReal pi = boost::math::constants::pi<BigReal>();
-    switch (unit) {
-    case Calculator::AngleUnit::DEG:
-        return BigReal(180) / pi;
-    case Calculator::AngleUnit::GRAD:
-        return BigReal(200) / pi;
-    case Calculator::AngleUnit::RAD:
-    default:
-        return BigReal(1);
-    }
+inline double to_radians(double x, Calculator::AngleUnit unit) noexcept {
+    return reduce_turn(x, unit) * radians_factor(unit);
 }
 
-inline BigReal to_radians(BigReal x, Calculator::AngleUnit unit) noexcept {
-    return x * radians_factor_big(unit);
+inline Calculator::Complex to_radians(Calculator::Complex x, Calculator::AngleUnit unit) noexcept {
+    return Calculator::Complex(reduce_turn(x.real(), unit), x.imag()) * radians_factor(unit);
 }
 
-inline BigReal from_radians(BigReal x, Calculator::AngleUnit unit) noexcept {
-    return x * from_radians_factor_big(unit);
+template <typename T> inline T from_radians(T x, Calculator::AngleUnit unit) noexcept {
+    return x * from_radians_factor(unit);
 }
 
-inline BigComplex radians_factor_bigcx(Calculator::AngleUnit unit) noexcept {
-    using BF = boost::multiprecision::cpp_bin_float_50;
-    const BF pi = boost::math::constants::pi<BF>();
+// pi/2 and the radians in one unit at the precision of R, computed once per type.
+template <typename R> const R &half_pi() {
+    static const R value = pi_constant<R>() / 2;
+    return value;
+}
+
+template <typename R> const R &radians_per(Calculator::AngleUnit unit) {
+    static const R degree = pi_constant<R>() / 180;
+    static const R gradian = pi_constant<R>() / 200;
+    static const R radian(1);
     switch (unit) {
     case Calculator::AngleUnit::DEG:
-        return BigComplex(pi / BF(180), BF(0));
+        return degree;
     case Calculator::AngleUnit::GRAD:
-        return BigComplex(pi / BF(200), BF(0));
+        return gradian;
     case Calculator::AngleUnit::RAD:
     default:
-        return BigComplex(BF(1), BF(0));
+        return radian;
     }
 }
 
-inline BigComplex from_radians_factor_bigcx(Calculator::AngleUnit unit) noexcept {
-    using BF = boost::multiprecision::cpp_bin_float_50;
-    const BF pi = boost::math::constants::pi<BF>();
+// Arguments within an eighth of a turn go straight to radians; the rest are
+// reduced to the nearest quarter turn first.
+template <typename T> bool needs_reduction(const T &x, Calculator::AngleUnit unit) {
     switch (unit) {
     case Calculator::AngleUnit::DEG:
-        return BigComplex(BF(180) / pi, BF(0));
+        return abs(x) > 45;
     case Calculator::AngleUnit::GRAD:
-        return BigComplex(BF(200) / pi, BF(0));
+        return abs(x) > 50;
     case Calculator::AngleUnit::RAD:
     default:
-        return BigComplex(BF(1), BF(0));
+        return abs(x) > T("0.78");
     }
 }
 
-inline BigComplex to_radians(BigComplex x, Calculator::AngleUnit unit) noexcept {
-    return x * radians_factor_bigcx(unit);
+// sin, cos and tan of quadrant * pi/2 + r.
+struct SinQuadrant {
+    template <typename T> T operator()(unsigned quadrant, const T &r) const {
+        switch (quadrant) {
+        case 0:
+            return sin(r);
+        case 1:
+            return cos(r);
+        case 2:
+            return T(-sin(r));
+        default:
+            return T(-cos(r));
+        }
+    }
+};
+
+struct CosQuadrant {
+    template <typename T> T operator()(unsigned quadrant, const T &r) const {
+        switch (quadrant) {
+        case 0:
+            return cos(r);
+        case 1:
+            return T(-sin(r));
+        case 2:
+            return T(-cos(r));
+        default:
+            return sin(r);
+        }
+    }
+};
+
+struct TanQuadrant {
+    template <typename T> T operator()(unsigned quadrant, const T &r) const {
+        if (quadrant % 2 == 0) {
+            return tan(r);
+        }
+        // tan(r + pi/2) = -cot(r); undefined on the odd multiples of pi/2 themselves.
+        const T s = sin(r);
+        calc_detail::require(s != 0);
+        return T(-cos(r) / s);
+    }
+};
+
+// Evaluate fn(quadrant, radians) at the calculator's working precision.
+template <typename Fn>
+BigReal trig_big(Precision precision, const BigReal &a, Calculator::AngleUnit unit, Fn fn) {
+    if (!needs_reduction(a, unit)) {
+        return calc_detail::in_tier(
+            precision,
+            [&](const auto &x) {
+                using R = std::decay_t<decltype(x)>;
+                return fn(0, R(x * radians_per<R>(unit)));
+            },
+            a);
+    }
+    const calc_detail::QuarterTurns turns = calc_detail::reduce_angle(a, unit, digits10(precision));
+    return with_tier(precision, [&]<typename R>() {
+        const R r = calc_detail::quarter_fraction<R>(turns) * half_pi<R>();
+        return tier_cast<BigReal>(fn(turns.quadrant, r));
+    });
 }
 
-inline BigComplex from_radians(BigComplex x, Calculator::AngleUnit unit) noexcept {
-    return x * from_radians_factor_bigcx(unit);
+// Only the real part is periodic; the imaginary part is just converted.
+template <typename Fn> BigComplex trig_big(const BigComplex &a, Calculator::AngleUnit unit, Fn fn) {
+    using BF = boost::multiprecision::cpp_bin_float_50;
+    const BF re = a.real();
+    const BF im = a.imag() * radians_per<BF>(unit);
+    if (!needs_reduction(re, unit)) {
+        return fn(0, BigComplex(BF(re * radians_per<BF>(unit)), im));
+    }
+    const calc_detail::QuarterTurns turns =
+        calc_detail::reduce_angle(re, unit, std::numeric_limits<BF>::digits10);
+    const BF r = calc_detail::quarter_fraction<BF>(turns) * half_pi<BF>();
+    return fn(turns.quadrant, BigComplex(r, im));
 }
 
 } // namespace
@@ -147,23 +210,23 @@ Calculator::Complex Calculator::tan(Complex a, AngleUnit unit) const {
 }
 
 BigReal Calculator::sin(const BigReal &a, AngleUnit unit) const {
-    return boost::multiprecision::sin(to_radians(a, unit));
+    return trig_big(precision(), a, unit, SinQuadrant{});
 }
 BigReal Calculator::cos(const BigReal &a, AngleUnit unit) const {
-    return boost::multiprecision::cos(to_radians(a, unit));
+    return trig_big(precision(), a, unit, CosQuadrant{});
 }
 BigReal Calculator::tan(const BigReal &a, AngleUnit unit) const {
-    return boost::multiprecision::tan(to_radians(a, unit));
+    return trig_big(precision(), a, unit, TanQuadrant{});
 }
 
 BigComplex Calculator::sin(const BigComplex &a, AngleUnit unit) const {
-    return boost::multiprecision::sin(to_radians(a, unit));
+    return trig_big(a, unit, SinQuadrant{});
 }
 BigComplex Calculator::cos(const BigComplex &a, AngleUnit unit) const {
-    return boost::multiprecision::cos(to_radians(a, unit));
+    return trig_big(a, unit, CosQuadrant{});
 }
 BigComplex Calculator::tan(const BigComplex &a, AngleUnit unit) const {
-    return boost::multiprecision::tan(to_radians(a, unit));
+    return trig_big(a, unit, TanQuadrant{});
 }
 
 double Calculator::sinh(double a) const {
@@ -0,0 +1,493 @@
+#include "eval/pub/array.hpp"
+#include "calc/internal/helpers.hpp"
+#include "eval/pub/plan.hpp"
+
+#include <array>
+#include <cmath>
+#include <exception>
+#include <limits>
+#include <numbers>
+#include <stdexcept>
+#include <string>
+#include <utility>
+
+namespace tcalc::eval {
+
+namespace {
+
+using ops::OpId;
+
+using RealKernel = double (*)(const Calculator &, double, double, AngleUnit);
+using ComplexKernel = Complex (*)(const Calculator &, Complex, Complex, AngleUnit);
+
+constexpr double kNaN = std::numeric_limits<double>::quiet_NaN();
+constexpr std::size_t kOpCount = static_cast<std::size_t>(OpId::Count);
+
+long long to_count(double d) {
+    if (std::isfinite(d) && std::abs(d) < 9.2e18 && std::floor(d) == d) {
+        return static_cast<long long>(d);
+    }
+    calc_detail::math_error();
+}
+
+// Double kernels, one per op. Derived ops expand the way eval::apply does.
+template <OpId Id> double real_op(const Calculator &c, double a, double b, AngleUnit unit) {
+    if constexpr (Id == OpId::Add) {
+        return c.add(a, b);
+    } else if constexpr (Id == OpId::Sub) {
+        return c.sub(a, b);
+    } else if constexpr (Id == OpId::Mul) {
+        return c.mul(a, b);
+    } else if constexpr (Id == OpId::Div) {
+        return c.div(a, b);
+    } else if constexpr (Id == OpId::Pow) {
+        return c.pow(a, b);
+    } else if constexpr (Id == OpId::Root) {
+        return c.root(a, b);
+    } else if constexpr (Id == OpId::Mod) {
+        return c.mod(a, b);
+    } else if constexpr (Id == OpId::IntDiv) {
+        return static_cast<double>(c.intdiv(a, b));
+    } else if constexpr (Id == OpId::Choose) {
+        return c.choose(to_count(a), to_count(b)).template convert_to<double>();
+    } else if constexpr (Id == OpId::Permute) {
+        return c.permute(to_count(a), to_count(b)).template convert_to<double>();
+    } else if constexpr (Id == OpId::Negate) {
+        return c.sub(0.0, a);
+    } else if constexpr (Id == OpId::Percent) {
+        return c.div(a, 100.0);
+    } else if constexpr (Id == OpId::Sqr) {
+        return c.pow(a, 2LL);
+    } else if constexpr (Id == OpId::Cube) {
+        return c.pow(a, 3LL);
+    } else if constexpr (Id == OpId::Recip) {
+        return c.pow(a, -1LL);
+    } else if constexpr (Id == OpId::Pow10) {
+        return c.pow(10.0, a);
+    } else if constexpr (Id == OpId::Exp) {
+        return c.pow(std::numbers::e, a);
+    } else if constexpr (Id == OpId::Sqrt) {
+        return c.sqrt(a);
+    } else if constexpr (Id == OpId::Cbrt) {
+        return c.cbrt(a);
+    } else if constexpr (Id == OpId::Sin) {
+        return c.sin(a, unit);
+    } else if constexpr (Id == OpId::Cos) {
+        return c.cos(a, unit);
+    } else if constexpr (Id == OpId::Tan) {
+        return c.tan(a, unit);
+    } else if constexpr (Id == OpId::Sinh) {
+        return c.sinh(a);
+    } else if constexpr (Id == OpId::Cosh) {
+        return c.cosh(a);
+    } else if constexpr (Id == OpId::Tanh) {
+        return c.tanh(a);
+    } else if constexpr (Id == OpId::Asin) {
+        return c.asin(a, unit);
+    } else if constexpr (Id == OpId::Acos) {
+        return c.acos(a, unit);
+    } else if constexpr (Id == OpId::Atan) {
+        return c.atan(a, unit);
+    } else if constexpr (Id == OpId::Asinh) {
+        return c.asinh(a);
+    } else if constexpr (Id == OpId::Acosh) {
+        return c.acosh(a);
+    } else if constexpr (Id == OpId::Atanh) {
+        return c.atanh(a);
+    } else if constexpr (Id == OpId::Log) {
+        return c.log(a);
+    } else if constexpr (Id == OpId::Ln) {
+        return c.ln(a);
+    } else if constexpr (Id == OpId::Fact) {
+        return c.fact(a);
+    } else if constexpr (Id == OpId::Gamma) {
+        return c.gamma(a);
+    } else {
+        // Polar always leaves the real line; run_node handles it.
+        calc_detail::math_error();
+    }
+}
+
+// Pow with an integer literal exponent, as the scalar evaluator picks it.
+double pow_int(const Calculator &c, double a, double b, AngleUnit) {
+    return c.pow(a, static_cast<long long>(b));
+}
+
+template <OpId Id> Complex complex_op(const Calculator &c, Complex a, Complex b, AngleUnit unit) {
+    if constexpr (Id == OpId::Add) {
+        return c.add(a, b);
+    } else if constexpr (Id == OpId::Sub) {
+        return c.sub(a, b);
+    } else if constexpr (Id == OpId::Mul) {
+        return c.mul(a, b);
+    } else if constexpr (Id == OpId::Div) {
+        return c.div(a, b);
+    } else if constexpr (Id == OpId::Pow) {
+        return c.pow(a, b);
+    } else if constexpr (Id == OpId::Root) {
+        return c.root(a, b);
+    } else if constexpr (Id == OpId::Negate) {
+        return c.sub(Complex(0.0), a);
+    } else if constexpr (Id == OpId::Percent) {
+        return c.div(a, Complex(100.0));
+    } else if constexpr (Id == OpId::Sqr) {
+        return c.pow(a, Complex(2.0));
+    } else if constexpr (Id == OpId::Cube) {
+        return c.pow(a, Complex(3.0));
+    } else if constexpr (Id == OpId::Recip) {
+        return c.pow(a, Complex(-1.0));
+    } else if constexpr (Id == OpId::Pow10) {
+        return c.pow(Complex(10.0), a);
+    } else if constexpr (Id == OpId::Exp) {
+        return c.pow(Complex(std::numbers::e), a);
+    } else if constexpr (Id == OpId::Sqrt) {
+        return c.sqrt(a);
+    } else if constexpr (Id == OpId::Sin) {
+        return c.sin(a, unit);
+    } else if constexpr (Id == OpId::Cos) {
+        return c.cos(a, unit);
+    } else if constexpr (Id == OpId::Tan) {
+        return c.tan(a, unit);
+    } else if constexpr (Id == OpId::Sinh) {
+        return c.sinh(a);
+    } else if constexpr (Id == OpId::Cosh) {
+        return c.cosh(a);
+    } else if constexpr (Id == OpId::Tanh) {
+        return c.tanh(a);
+    } else if constexpr (Id == OpId::Asin) {
+        return c.asin(a, unit);
+    } else if constexpr (Id == OpId::Acos) {
+        return c.acos(a, unit);
+    } else if constexpr (Id == OpId::Atan) {
+        return c.atan(a, unit);
+    } else if constexpr (Id == OpId::Asinh) {
+        return c.asinh(a);
+    } else if constexpr (Id == OpId::Acosh) {
+        return c.acosh(a);
+    } else if constexpr (Id == OpId::Atanh) {
+        return c.atanh(a);
+    } else if constexpr (Id == OpId::Polar) {
+        return c.polar(a, unit);
+    } else if constexpr (Id == OpId::Log) {
+        return c.log(a);
+    } else if constexpr (Id == OpId::Ln) {
+        return c.ln(a);
+    } else {
+        calc_detail::math_error();
+    }
+}
+
+template <std::size_t... I> constexpr auto real_kernels(std::index_sequence<I...>) {
+    return std::array<RealKernel, sizeof...(I)>{&real_op<static_cast<OpId>(I)>...};
+}
+
+template <std::size_t... I> constexpr auto complex_kernels(std::index_sequence<I...>) {
+    return std::array<ComplexKernel, sizeof...(I)>{&complex_op<static_cast<OpId>(I)>...};
+}
+
+constexpr auto kRealKernels = real_kernels(std::make_index_sequence<kOpCount>());
+constexpr auto kComplexKernels = complex_kernels(std::make_index_sequence<kOpCount>());
+
+//
+// One plan node evaluated over every element. Constant nodes are a single
+// broadcast value. Varying nodes start as a real column and switch to complex
+// storage on the first element that leaves the real line; `kinds` then records
+// which elements are complex-typed, so later ops see the operand kinds scalar
+// evaluation would. The data pointers may view the caller's input instead of
+// the owned storage.
+//
+struct Column {
+    bool broadcast = true;
+    bool integer = false; // broadcast int: Pow takes the integer-exponent kernel
+    bool scalar_complex = false;
+    Complex scalar{};
+
+    const double *re = nullptr;
+    const Complex *cx = nullptr;
+    const std::uint8_t *kinds = nullptr; // null with cx set: every element is complex
+
+    std::vector<double> re_store;
+    std::vector<Complex> cx_store;
+    std::vector<std::uint8_t> kind_store;
+
+    // No element is complex, so values can be read as doubles with real_data().
+    bool real_only() const { return broadcast ? !scalar_complex : cx == nullptr; }
+    // Broadcast columns repeat one value: read them with a stride of 0.
+    const double *real_data() const {
+        // std::complex<double> is layout-compatible with double[2].
+        return broadcast ? reinterpret_cast<const double *>(&scalar) : re;
+    }
+    std::size_t stride() const { return broadcast ? 0 : 1; }
+
+    bool is_complex(std::size_t i) const {
+        if (broadcast) {
+            return scalar_complex;
+        }
+        return cx != nullptr && (kinds == nullptr || kinds[i] != 0);
+    }
+    double real(std::size_t i) const {
+        return broadcast ? scalar.real() : (cx != nullptr ? cx[i].real() : re[i]);
+    }
+    Complex complex(std::size_t i) const {
+        return broadcast ? scalar : (cx != nullptr ? cx[i] : Complex(re[i], 0.0));
+    }
+
+    void set_real(std::size_t i, double v) {
+        if (cx != nullptr) {
+            cx_store[i] = v;
+            kind_store[i] = 0;
+        } else {
+            re_store[i] = v;
+        }
+    }
+    void set_complex(std::size_t i, Complex v) {
+        if (cx == nullptr) {
+            cx_store.assign(re_store.begin(), re_store.end());
+            kind_store.assign(re_store.size(), 0);
+            re_store = {};
+            re = nullptr;
+            cx = cx_store.data();
+            kinds = kind_store.data();
+        }
+        cx_store[i] = v;
+        kind_store[i] = 1;
+    }
+};
+
+Column broadcast(const Number &v) {
+    Column col;
+    if (std::holds_alternative<Complex>(v) || std::holds_alternative<BigComplex>(v)) {
+        col.scalar_complex = true;
+        col.scalar = to_complex(v);
+    } else {
+        col.integer = std::holds_alternative<long long>(v);
+        col.scalar = to_real(v);
+    }
+    return col;
+}
+
+Column view(std::span<const double> values) {
+    Column col;
+    col.broadcast = false;
+    col.re = values.data();
+    return col;
+}
+
+Column view(std::span<const Complex> values) {
+    Column col;
+    col.broadcast = false;
+    col.cx = values.data();
+    return col;
+}
+
+// Budget errors end the whole evaluation rather than one element.
+bool stops_array(const std::exception &error) {
+    const ErrorKind kind = error_kind(error);
+    return kind == ErrorKind::Timeout || kind == ErrorKind::Cancelled;
+}
+
+void run_node(const Calculator &calc, OpId id, const Column &a, const Column *b, Column &out,
+              std::vector<std::uint8_t> &errors, AngleUnit unit) {
+    const std::size_t index = static_cast<std::size_t>(id);
+    RealKernel real = kRealKernels[index];
+    if (id == OpId::Pow && b != nullptr && b->broadcast && b->integer) {
+        real = &pow_int;
+    }
+    const ComplexKernel complex = has_complex_overload(id) ? kComplexKernels[index] : nullptr;
+
+    const std::size_t n = errors.size();
+    calc.checkpoint(n);
+    out.broadcast = false;
+    out.re_store.assign(n, kNaN);
+    out.re = out.re_store.data();
+
+    // Tight loop while every operand is real and stays real. The first element
+    // that needs the complex plane or throws drops into the general loop below.
+    std::size_t i = 0;
+    if (id != OpId::Polar && a.real_only() && (b == nullptr || b->real_only())) {
+        static constexpr double kZero = 0.0;
+        const double *xs = a.real_data();
+        const double *ys = b != nullptr ? b->real_data() : &kZero;
+        const std::size_t xstride = a.stride();
+        const std::size_t ystride = b != nullptr ? b->stride() : 0;
+        double *dst = out.re_store.data();
+        try {
+            for (; i < n; ++i) {
+                const double x = xs[i * xstride];
+                const double y = ys[i * ystride];
+                if (errors[i] != 0) {
+                    continue;
+                }
+                if (needs_complex(id, x, y)) {
+                    break;
+                }
+                dst[i] = real(calc, x, y, unit);
+            }
+        } catch (const std::exception &error) {
+            if (stops_array(error)) {
+                throw;
+            }
+            // Element i is retried and recorded by the general loop.
+        }
+    }
+
+    for (; i < n; ++i) {
+        if (errors[i] != 0) {
+            continue;
+        }
+        try {
+            if (!a.is_complex(i) && (b == nullptr || !b->is_complex(i))) {
+                const double x = a.real(i);
+                const double y = b != nullptr ? b->real(i) : 0.0;
+                if (id == OpId::Polar) {
+                    out.set_complex(i, calc.polar(x, unit));
+                    continue;
+                }
+                if (!needs_complex(id, x, y)) {
+                    out.set_real(i, real(calc, x, y, unit));
+                    continue;
+                }
+            }
+            if (complex == nullptr) {
+                calc_detail::math_error();
+            }
+            const Complex y = b != nullptr ? b->complex(i) : Complex{};
+            out.set_complex(i, complex(calc, a.complex(i), y, unit));
+        } catch (const std::exception &error) {
+            if (stops_array(error)) {
+                throw;
+            }
+            errors[i] = 1;
+            out.set_real(i, kNaN);
+        }
+    }
+}
+
+void check_variable(std::string_view variable) {
+    const std::vector<ops::Token> tokens = ops::tokenize(variable);
+    bool ok = tokens.size() == 1 && tokens.front().kind == ops::TokenKind::Number &&
+              tokens.front().value == variable;
+    if (ok) {
+        try {
+            parse_literal(variable);
+            ok = false;
+        } catch (const std::exception &) {
+            // Not a number or constant, so it is free to name the variable.
+        }
+    }
+    if (!ok) {
+        throw std::invalid_argument("Not a variable name: '" + std::string(variable) + "'");
+    }
+}
+
+template <typename T>
+ArrayResult evaluate_columns(const ops::Program &program, std::string_view variable,
+                             std::span<const T> values, AngleUnit unit, const Limits &limits,
+                             Precision precision) {
+    check_variable(variable);
+    const Budget budget(limits);
+    const Budget *metered = limits.unlimited() ? nullptr : &budget;
+    const Plan plan(program.rpn(), variable, metered, precision);
+    if (plan.is_malformed()) {
+        throw CalculatorError(kMalformedMessage.data());
+    }
+
+    const auto &nodes = plan.nodes();
+    const std::uint32_t root = plan.root();
+
+    // Operand columns are freed after their last reader to bound peak memory.
+    std::vector<std::uint32_t> last_use(nodes.size(), 0);
+    for (std::uint32_t i = 0; i < nodes.size(); ++i) {
+        for (const std::uint32_t operand : {nodes[i].a, nodes[i].b}) {
+            if (operand != Plan::kNone) {
+                last_use[operand] = i;
+            }
+        }
+    }
+
+    const Calculator calc(metered, precision);
+    std::vector<Number> constants(nodes.size());
+    std::vector<Column> columns(nodes.size());
+    ArrayResult result;
+    result.errors.assign(values.size(), 0);
+
+    for (std::uint32_t i = 0; i < nodes.size(); ++i) {
+        const Plan::Node &node = nodes[i];
+        if (!node.varying) {
+            if (plan.folded(i)) {
+                constants[i] = *plan.folded(i);
+            } else if (node.op == OpId::Count) {
+                constants[i] = parse_literal(plan.literals()[node.literal]);
+            } else {
+                constants[i] = apply(calc, node.op, constants[node.a],
+                                     node.b == Plan::kNone ? Number{} : constants[node.b], unit);
+            }
+            columns[i] = broadcast(constants[i]);
+        } else if (node.op == OpId::Count) {
+            columns[i] = view(values);
+        } else {
+            const Column *b = node.b == Plan::kNone ? nullptr : &columns[node.b];
+            run_node(calc, node.op, columns[node.a], b, columns[i], result.errors, unit);
+        }
+
+        for (const std::uint32_t operand : {node.a, node.b}) {
+            if (operand != Plan::kNone && operand != root && last_use[operand] == i) {
+                columns[operand] = Column{};
+            }
+        }
+    }
+
+    Column &out = columns[root];
+    const std::size_t n = values.size();
+    bool any_complex = false;
+    for (std::size_t i = 0; i < n && !any_complex; ++i) {
+        any_complex = result.errors[i] == 0 && out.is_complex(i);
+    }
+
+    result.is_complex = any_complex;
+    if (any_complex) {
+        if (!out.cx_store.empty()) {
+            result.complex = std::move(out.cx_store);
+        } else {
+            result.complex.resize(n);
+            for (std::size_t i = 0; i < n; ++i) {
+                result.complex[i] = out.complex(i);
+            }
+        }
+    } else if (!out.re_store.empty()) {
+        result.real = std::move(out.re_store);
+    } else {
+        result.real.resize(n);
+        for (std::size_t i = 0; i < n; ++i) {
+            result.real[i] = out.real(i);
+        }
+    }
+
+    // Failed elements read NaN whichever storage the values came from.
+    for (std::size_t i = 0; i < n; ++i) {
+        if (result.errors[i] != 0) {
+            if (any_complex) {
+                result.complex[i] = Complex(kNaN, kNaN);
+            } else {
+                result.real[i] = kNaN;
+            }
+        }
+    }
+    return result;
+}
+
+} // namespace
+
+ArrayResult evaluate_array(const ops::Program &program, std::string_view variable,
+                           std::span<const double> values, AngleUnit unit, const Limits &limits,
+                           Precision precision) {
+    return evaluate_columns(program, variable, values, unit, limits, precision);
+}
+
+ArrayResult evaluate_array(const ops::Program &program, std::string_view variable,
+                           std::span<const Complex> values, AngleUnit unit, const Limits &limits,
+                           Precision precision) {
+    return evaluate_columns(program, variable, values, unit, limits, precision);
+}
+
+} // namespace tcalc::eval
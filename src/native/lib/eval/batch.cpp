@@ -0,0 +1,60 @@
+#include "eval/pub/batch.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <thread>
+
+namespace tcalc::eval {
+
+namespace {
+
+// Items are handed out in chunks so threads do not contend on the counter, but
+// small enough that one slow chunk (big factorials, BigReal) does not stall a worker.
+constexpr std::size_t kChunk = 64;
+
+} // namespace
+
+BatchResult evaluate_many(const std::vector<std::string> &expressions, AngleUnit unit,
+                          unsigned workers, const Limits &limits, Precision precision) {
+    const std::size_t n = expressions.size();
+    BatchResult result;
+    result.values.resize(n);
+    result.errors.resize(n, ErrorKind::Ok);
+
+    std::atomic<std::size_t> next{0};
+    const auto work = [&] {
+        for (std::size_t begin = next.fetch_add(kChunk); begin < n;
+             begin = next.fetch_add(kChunk)) {
+            const std::size_t end = std::min(n, begin + kChunk);
+            for (std::size_t i = begin; i < end; ++i) {
+                try {
+                    const auto program = ops::compile(expressions[i]);
+                    result.values[i] = limits.unlimited()
+                                           ? evaluate(program, unit, precision)
+                                           : evaluate(program, unit, limits, precision);
+                } catch (const std::exception &e) {
+                    result.errors[i] = error_kind(e);
+                }
+            }
+        }
+    };
+
+    if (workers == 0) {
+        workers = std::max(1U, std::thread::hardware_concurrency());
+    }
+    const auto chunks = static_cast<unsigned>((n + kChunk - 1) / kChunk);
+    workers = std::min(workers, std::max(1U, chunks));
+
+    std::vector<std::jthread> pool;
+    pool.reserve(workers - 1);
+    for (unsigned w = 1; w < workers; ++w) {
+        pool.emplace_back(work);
+    }
+    work();
+    pool.clear(); // join before result leaves this frame
+
+    return result;
+}
+
+} // namespace tcalc::eval
@@ -0,0 +1,799 @@
+#include "eval/pub/evaluator.hpp"
+#include "calc/internal/helpers.hpp"
+#include "calc/pub/exact_parts.hpp"
+#include "eval/pub/plan.hpp"
+
+#include <cmath>
+#include <cstdlib>
+#include <string>
+#include <type_traits>
+#include <utility>
+
+#include <boost/math/constants/constants.hpp>
+
+namespace tcalc::eval {
+
+namespace {
+
+using ops::Arity;
+using ops::OpId;
+using BF = boost::multiprecision::cpp_bin_float_50;
+
+// Indexes of the Number alternatives.
+enum Kind : std::size_t { kInt = 0, kReal, kComplex, kBig, kBigComplex, kExt };
+
+Kind kind_of(const Number &v) {
+    return static_cast<Kind>(v.index());
+}
+
+bool is_real_like(const Number &v) {
+    return v.index() == kInt || v.index() == kReal;
+}
+
+[[noreturn]] void invalid() {
+    throw CalculatorError(kInvalidMessage.data());
+}
+
+[[noreturn]] void malformed() {
+    throw CalculatorError(kMalformedMessage.data());
+}
+
+const BigReal &e_constant() {
+    static const BigReal value = boost::math::constants::e<BigReal>();
+    return value;
+}
+
+const BigReal &pi_constant() {
+    static const BigReal value = boost::math::constants::pi<BigReal>();
+    return value;
+}
+
+BF to_bin_float(double x) {
+    return std::isfinite(x) ? to_bin_float(decimal_parts(x)) : BF(x);
+}
+
+ExtDouble to_ext(const Number &v) {
+    switch (kind_of(v)) {
+    case kInt:
+        return ExtDouble(std::get<long long>(v));
+    case kReal:
+        return ExtDouble::from_decimal(std::get<double>(v));
+    case kExt:
+        return std::get<ExtDouble>(v);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+// ExtDouble results that land back in double's range become doubles again.
+Number narrow(const ExtDouble &v) {
+    if (v.fits_double()) {
+        return v.to_double();
+    }
+    return v;
+}
+
+// Ops with ExtDouble kernels. The rest need more digits than a double has (trig
+// argument reduction, mod, roots), so ExtDouble operands escalate to BigReal.
+bool ext_supported(OpId id) {
+    switch (id) {
+    case OpId::Add:
+    case OpId::Sub:
+    case OpId::Mul:
+    case OpId::Div:
+    case OpId::Pow:
+    case OpId::Sqrt:
+    case OpId::Log:
+    case OpId::Ln:
+    case OpId::Fact:
+    case OpId::Gamma:
+        return true;
+    default:
+        return false;
+    }
+}
+
+void promote_complex(OpId id, bool binary, Number &x, const Number &y) {
+    if (!is_real_like(x) || (binary && !is_real_like(y))) {
+        return;
+    }
+    const double xv = to_real(x);
+    const double yv = binary ? to_real(y) : 0.0;
+    if (needs_complex(id, xv, yv)) {
+        x = Complex(xv, 0.0);
+    }
+}
+
+void coerce(const ops::OpSpec &spec, bool binary, Number &x, Number &y) {
+    const auto any = [&](Kind k) { return kind_of(x) == k || (binary && kind_of(y) == k); };
+    const bool has_complex = any(kComplex);
+    const bool has_big = any(kBig);
+    const bool has_big_complex = any(kBigComplex);
+    const bool has_ext = any(kExt);
+    const bool big_ok = ops::big_supported(spec);
+    const bool big_complex_ok = ops::big_complex_supported(spec);
+
+    if (spec.id == OpId::Pow && binary && !has_big_complex && is_real_like(y) &&
+        std::abs(to_real(y)) >= 309.0) {
+        if (has_complex && big_complex_ok) {
+            x = to_big_complex(x);
+            y = to_big_complex(y);
+        } else if (has_complex || has_big) {
+            x = to_big(x);
+            y = to_big(y);
+        } else {
+            x = to_ext(x); // the exponent stays a double
+        }
+        return;
+    }
+
+    if (big_complex_ok && (has_big_complex || ((has_big || has_ext) && has_complex))) {
+        x = to_big_complex(x);
+        if (binary) {
+            y = to_big_complex(y);
+        }
+        return;
+    }
+
+    if (has_complex) {
+        if (is_real_like(x)) {
+            x = to_complex(x);
+        }
+        if (binary && is_real_like(y)) {
+            y = to_complex(y);
+        }
+        return;
+    }
+
+    if (has_big && big_ok) {
+        if (kind_of(x) != kBig) {
+            x = to_big(x);
+        }
+        if (binary && kind_of(y) != kBig) {
+            y = to_big(y);
+        }
+    }
+}
+
+// Pick the overload an operand kind lands on. ExtDouble values escalate to BigReal
+// for ops without an ExtDouble kernel; BigReal values fall back to their double
+// counterparts for ops that only have double/complex kernels.
+Kind fit(OpId id, Kind k) {
+    const ops::OpSpec &spec = *ops::op_spec(id);
+    if (k == kInt) {
+        k = kReal;
+    }
+    if (k == kBigComplex && !ops::big_complex_supported(spec)) {
+        k = kComplex;
+    }
+    if (k == kExt && !ext_supported(id)) {
+        k = kBig;
+    }
+    if (k == kBig && !ops::big_supported(spec)) {
+        k = kReal;
+    }
+    if (k == kComplex && !has_complex_overload(id)) {
+        calc_detail::math_error();
+    }
+    return k;
+}
+
+Kind join(Kind a, Kind b) {
+    a = a == kInt ? kReal : a;
+    b = b == kInt ? kReal : b;
+    if (a == b) {
+        return a;
+    }
+    // ExtDouble ranks above double and below BigReal.
+    if (a == kExt || b == kExt) {
+        const Kind other = a == kExt ? b : a;
+        return other == kReal ? kExt : join(other, kBig);
+    }
+    if (a == kBigComplex || b == kBigComplex || (a == kComplex && b == kBig) ||
+        (a == kBig && b == kComplex)) {
+        return kBigComplex;
+    }
+    return a > b ? a : b;
+}
+
+// A double result that overflowed is redone in ExtDouble from the same operands,
+// read as decimals the way to_big() reads them. Infinite operands stay infinite.
+template <typename ExtFn, typename... Args>
+Number widen_overflow(double r, ExtFn &&ext_fn, Args... args) {
+    if (!std::isinf(r) || !(std::isfinite(args) && ...)) {
+        return r;
+    }
+    return narrow(std::forward<ExtFn>(ext_fn)(ExtDouble::from_decimal(args)...));
+}
+
+long long to_count(const Number &v) {
+    if (kind_of(v) == kInt) {
+        return std::get<long long>(v);
+    }
+    if (kind_of(v) == kReal) {
+        const double d = std::get<double>(v);
+        if (std::isfinite(d) && std::abs(d) < 9.2e18 && std::floor(d) == d) {
+            return static_cast<long long>(d);
+        }
+    }
+    calc_detail::math_error();
+}
+
+Number binary_real(const Calculator &calc, OpId id, const Number &x, const Number &y) {
+    const double a = to_real(x);
+    const double b = to_real(y);
+    switch (id) {
+    case OpId::Add:
+        return widen_overflow(
+            calc.add(a, b), [&](const auto &x, const auto &y) { return calc.add(x, y); }, a, b);
+    case OpId::Sub:
+        return widen_overflow(
+            calc.sub(a, b), [&](const auto &x, const auto &y) { return calc.sub(x, y); }, a, b);
+    case OpId::Mul:
+        return widen_overflow(
+            calc.mul(a, b), [&](const auto &x, const auto &y) { return calc.mul(x, y); }, a, b);
+    case OpId::Div:
+        return widen_overflow(
+            calc.div(a, b), [&](const auto &x, const auto &y) { return calc.div(x, y); }, a, b);
+    case OpId::IntDiv:
+        return calc.intdiv(a, b);
+    case OpId::Mod:
+        return calc.mod(a, b);
+    case OpId::Pow:
+        if (kind_of(y) == kInt) {
+            const long long n = std::get<long long>(y);
+            return widen_overflow(calc.pow(a, n), [&](const auto &x) { return calc.pow(x, b); }, a);
+        }
+        return widen_overflow(calc.pow(a, b), [&](const auto &x) { return calc.pow(x, b); }, a);
+    case OpId::Root:
+        return calc.root(a, b);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+template <typename T>
+Number binary_generic(const Calculator &calc, OpId id, const T &a, const T &b) {
+    switch (id) {
+    case OpId::Add:
+        return calc.add(a, b);
+    case OpId::Sub:
+        return calc.sub(a, b);
+    case OpId::Mul:
+        return calc.mul(a, b);
+    case OpId::Div:
+        return calc.div(a, b);
+    case OpId::Pow:
+        return calc.pow(a, b);
+    case OpId::Root:
+        return calc.root(a, b);
+    default:
+        break;
+    }
+    if constexpr (std::is_same_v<T, BigReal>) {
+        switch (id) {
+        case OpId::IntDiv:
+            return calc.intdiv(a, b);
+        case OpId::Mod:
+            return calc.mod(a, b);
+        default:
+            break;
+        }
+    }
+    calc_detail::math_error();
+}
+
+Number binary_ext(const Calculator &calc, OpId id, const Number &x, const Number &y) {
+    const ExtDouble a = to_ext(x);
+    switch (id) {
+    case OpId::Add:
+        return narrow(calc.add(a, to_ext(y)));
+    case OpId::Sub:
+        return narrow(calc.sub(a, to_ext(y)));
+    case OpId::Mul:
+        return narrow(calc.mul(a, to_ext(y)));
+    case OpId::Div:
+        return narrow(calc.div(a, to_ext(y)));
+    case OpId::Pow:
+        return narrow(calc.pow(a, to_real(y)));
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number apply_binary(const Calculator &calc, OpId id, const Number &x, const Number &y) {
+    if (id == OpId::Choose || id == OpId::Permute) {
+        const long long n = to_count(x);
+        const long long r = to_count(y);
+        return id == OpId::Choose ? calc.choose(n, r) : calc.permute(n, r);
+    }
+
+    switch (fit(id, join(kind_of(x), kind_of(y)))) {
+    case kExt:
+        return binary_ext(calc, id, x, y);
+    case kComplex:
+        return binary_generic(calc, id, to_complex(x), to_complex(y));
+    case kBig:
+        return binary_generic(calc, id, to_big(x), to_big(y));
+    case kBigComplex:
+        return binary_generic(calc, id, to_big_complex(x), to_big_complex(y));
+    default:
+        return binary_real(calc, id, x, y);
+    }
+}
+
+Number unary_real(const Calculator &calc, OpId id, double a, AngleUnit unit) {
+    switch (id) {
+    case OpId::Sqrt:
+        return calc.sqrt(a);
+    case OpId::Cbrt:
+        return calc.cbrt(a);
+    case OpId::Sin:
+        return calc.sin(a, unit);
+    case OpId::Cos:
+        return calc.cos(a, unit);
+    case OpId::Tan:
+        return calc.tan(a, unit);
+    case OpId::Sinh:
+        return calc.sinh(a);
+    case OpId::Cosh:
+        return calc.cosh(a);
+    case OpId::Tanh:
+        return calc.tanh(a);
+    case OpId::Asin:
+        return calc.asin(a, unit);
+    case OpId::Acos:
+        return calc.acos(a, unit);
+    case OpId::Atan:
+        return calc.atan(a, unit);
+    case OpId::Asinh:
+        return calc.asinh(a);
+    case OpId::Acosh:
+        return calc.acosh(a);
+    case OpId::Atanh:
+        return calc.atanh(a);
+    case OpId::Polar:
+        return calc.polar(a, unit);
+    case OpId::Log:
+        return calc.log(a);
+    case OpId::Ln:
+        return calc.ln(a);
+    case OpId::Fact: {
+        // Past double's range an integer n! comes from the exact factorial (or the
+        // BigReal gamma at the working precision) rather than ExtDouble's estimate,
+        // so it keeps every digit BigReal holds.
+        const double r = calc.fact(a);
+        if (std::isinf(r) && std::isfinite(a)) {
+            return calc.fact(BigReal(a));
+        }
+        return r;
+    }
+    case OpId::Gamma:
+        return widen_overflow(calc.gamma(a), [&](const auto &x) { return calc.gamma(x); }, a);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number unary_complex(const Calculator &calc, OpId id, Complex a, AngleUnit unit) {
+    switch (id) {
+    case OpId::Sqrt:
+        return calc.sqrt(a);
+    case OpId::Sin:
+        return calc.sin(a, unit);
+    case OpId::Cos:
+        return calc.cos(a, unit);
+    case OpId::Tan:
+        return calc.tan(a, unit);
+    case OpId::Sinh:
+        return calc.sinh(a);
+    case OpId::Cosh:
+        return calc.cosh(a);
+    case OpId::Tanh:
+        return calc.tanh(a);
+    case OpId::Asin:
+        return calc.asin(a, unit);
+    case OpId::Acos:
+        return calc.acos(a, unit);
+    case OpId::Atan:
+        return calc.atan(a, unit);
+    case OpId::Asinh:
+        return calc.asinh(a);
+    case OpId::Acosh:
+        return calc.acosh(a);
+    case OpId::Atanh:
+        return calc.atanh(a);
+    case OpId::Polar:
+        return calc.polar(a, unit);
+    case OpId::Log:
+        return calc.log(a);
+    case OpId::Ln:
+        return calc.ln(a);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number unary_big(const Calculator &calc, OpId id, const BigReal &a, AngleUnit unit) {
+    switch (id) {
+    case OpId::Sqrt:
+        return calc.sqrt(a);
+    case OpId::Sin:
+        return calc.sin(a, unit);
+    case OpId::Cos:
+        return calc.cos(a, unit);
+    case OpId::Tan:
+        return calc.tan(a, unit);
+    case OpId::Log:
+        return calc.log(a);
+    case OpId::Ln:
+        return calc.ln(a);
+    case OpId::Fact:
+        return calc.fact(a);
+    case OpId::Gamma:
+        return calc.gamma(a);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number unary_big_complex(const Calculator &calc, OpId id, const BigComplex &a, AngleUnit unit) {
+    switch (id) {
+    case OpId::Sqrt:
+        return calc.sqrt(a);
+    case OpId::Sin:
+        return calc.sin(a, unit);
+    case OpId::Cos:
+        return calc.cos(a, unit);
+    case OpId::Tan:
+        return calc.tan(a, unit);
+    case OpId::Log:
+        return calc.log(a);
+    case OpId::Ln:
+        return calc.ln(a);
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number unary_ext(const Calculator &calc, OpId id, const ExtDouble &a) {
+    switch (id) {
+    case OpId::Sqrt:
+        return narrow(calc.sqrt(a));
+    case OpId::Log:
+        return narrow(calc.log(a));
+    case OpId::Ln:
+        return narrow(calc.ln(a));
+    case OpId::Fact:
+        return narrow(calc.fact(a));
+    case OpId::Gamma:
+        return narrow(calc.gamma(a));
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Number apply_unary(const Calculator &calc, OpId id, const Number &x, AngleUnit unit) {
+    switch (fit(id, kind_of(x))) {
+    case kExt:
+        return unary_ext(calc, id, std::get<ExtDouble>(x));
+    case kComplex:
+        return unary_complex(calc, id, to_complex(x), unit);
+    case kBig:
+        return unary_big(calc, id, to_big(x), unit);
+    case kBigComplex:
+        return unary_big_complex(calc, id, to_big_complex(x), unit);
+    default:
+        return unary_real(calc, id, to_real(x), unit);
+    }
+}
+
+// One call through the Python wrapper: promotion, coercion, then the kernel.
+Number call(const Calculator &calc, OpId id, Number x, Number y, AngleUnit unit) {
+    const ops::OpSpec &spec = *ops::op_spec(id);
+    const bool binary = spec.arity == Arity::Binary;
+
+    promote_complex(id, binary, x, y);
+    coerce(spec, binary, x, y);
+
+    if (binary) {
+        return apply_binary(calc, id, x, y);
+    }
+    return apply_unary(calc, id, x, unit);
+}
+
+} // namespace
+
+double to_real(const Number &v) {
+    switch (kind_of(v)) {
+    case kInt:
+        return static_cast<double>(std::get<long long>(v));
+    case kReal:
+        return std::get<double>(v);
+    case kBig:
+        return std::get<BigReal>(v).convert_to<double>();
+    case kExt:
+        return std::get<ExtDouble>(v).to_double();
+    default:
+        calc_detail::math_error();
+    }
+}
+
+Complex to_complex(const Number &v) {
+    switch (kind_of(v)) {
+    case kComplex:
+        return std::get<Complex>(v);
+    case kBigComplex: {
+        const BigComplex &z = std::get<BigComplex>(v);
+        return {z.real().convert_to<double>(), z.imag().convert_to<double>()};
+    }
+    default:
+        return {to_real(v), 0.0};
+    }
+}
+
+BigReal to_big(const Number &v) {
+    switch (kind_of(v)) {
+    case kInt:
+        return BigReal(std::get<long long>(v));
+    case kReal: {
+        const double d = std::get<double>(v);
+        return std::isfinite(d) ? to_big_real(decimal_parts(d)) : BigReal(d);
+    }
+    case kBig:
+        return std::get<BigReal>(v);
+    case kExt:
+        return std::get<ExtDouble>(v).to_big();
+    default:
+        calc_detail::math_error();
+    }
+}
+
+BigComplex to_big_complex(const Number &v) {
+    switch (kind_of(v)) {
+    case kInt:
+        return BigComplex(std::get<long long>(v));
+    case kReal:
+        return BigComplex(to_bin_float(std::get<double>(v)), BF(0));
+    case kComplex: {
+        const Complex z = std::get<Complex>(v);
+        return BigComplex(to_bin_float(z.real()), to_bin_float(z.imag()));
+    }
+    case kBig:
+        return BigComplex(BF(std::get<BigReal>(v)), BF(0));
+    case kExt:
+        return BigComplex(BF(std::get<ExtDouble>(v).to_big()), BF(0));
+    default:
+        return std::get<BigComplex>(v);
+    }
+}
+
+// Mirrors tcalc.core.ops._PROMO_RULES_BY_ID.
+bool needs_complex(OpId id, double x, double y) {
+    switch (id) {
+    case OpId::Sqrt:
+        return x < 0.0;
+    case OpId::Asin:
+    case OpId::Acos:
+        return std::abs(x) > 1.0;
+    case OpId::Acosh:
+        return x < 1.0;
+    case OpId::Atanh:
+        return std::abs(x) >= 1.0;
+    case OpId::Log:
+    case OpId::Ln:
+        return x <= 0.0;
+    case OpId::Root:
+        return x < 0.0 && (!calc_detail::int_like(y) || std::fmod(std::round(y), 2.0) == 0.0);
+    default:
+        return false;
+    }
+}
+
+bool has_complex_overload(OpId id) {
+    switch (id) {
+    case OpId::IntDiv:
+    case OpId::Mod:
+    case OpId::Cbrt:
+    case OpId::Fact:
+    case OpId::Gamma:
+    case OpId::Choose:
+    case OpId::Permute:
+        return false;
+    default:
+        return true;
+    }
+}
+
+ErrorKind operand_error(OpId id, const Number &a, const Number &b) noexcept {
+    const auto is_zero = [](const Number &v) {
+        return std::visit(
+            [](const auto &x) {
+                using T = std::decay_t<decltype(x)>;
+                if constexpr (std::is_same_v<T, ExtDouble>) {
+                    return x.is_zero();
+                } else if constexpr (std::is_same_v<T, BigComplex>) {
+                    return x.real() == 0 && x.imag() == 0;
+                } else {
+                    return x == T{};
+                }
+            },
+            v);
+    };
+    const auto is_complex = [](const Number &v) {
+        return kind_of(v) == kComplex || kind_of(v) == kBigComplex;
+    };
+    const bool binary = ops::op_spec(id)->arity == Arity::Binary;
+
+    if (!has_complex_overload(id) && (is_complex(a) || (binary && is_complex(b)))) {
+        return ErrorKind::MathErr;
+    }
+
+    bool fails = false;
+    switch (id) {
+    case OpId::Div:
+    case OpId::Mod:
+    case OpId::IntDiv:
+    case OpId::Root:
+        fails = is_zero(b);
+        break;
+    case OpId::Log:
+    case OpId::Ln:
+        fails = is_zero(a);
+        break;
+    case OpId::Pow:
+        fails = is_real_like(a) && is_zero(a) && kind_of(b) == kInt && std::get<long long>(b) < 0;
+        break;
+    case OpId::Recip:
+        fails = is_real_like(a) && is_zero(a);
+        break;
+    case OpId::Fact:
+        // The double kernel's own test; BigReal and ExtDouble are left to apply().
+        fails =
+            is_real_like(a) && (!calc_detail::int_like(to_real(a)) || std::round(to_real(a)) < 0.0);
+        break;
+    case OpId::Gamma:
+        fails = is_real_like(a) && to_real(a) <= 0.0 && calc_detail::int_like(to_real(a));
+        break;
+    default:
+        break;
+    }
+    return fails ? ErrorKind::MathErr : ErrorKind::Ok;
+}
+
+Number literal_value(const ops::Literal &literal, std::string_view text) {
+    switch (literal.kind) {
+    case ops::LiteralKind::Int:
+        return literal.integer;
+    case ops::LiteralKind::Real:
+        return literal.real;
+    case ops::LiteralKind::Imag:
+        return Complex(0.0, literal.real);
+    case ops::LiteralKind::Big:
+        return BigReal(std::string(text));
+    case ops::LiteralKind::E:
+        return e_constant();
+    case ops::LiteralKind::Pi:
+        return pi_constant();
+    case ops::LiteralKind::None:
+        return literal_value(ops::classify_literal(text), text);
+    case ops::LiteralKind::Invalid:
+    default:
+        invalid();
+    }
+}
+
+Number literal_value(const ops::Token &token) {
+    return literal_value(token.literal, token.value);
+}
+
+Number parse_literal(std::string_view text) {
+    return literal_value(ops::classify_literal(text), text);
+}
+
+Number apply(const Calculator &calc, OpId id, const Number &a, const Number &b, AngleUnit unit) {
+    calc.checkpoint();
+
+    // Derived ops go through a second op, exactly like the Python wrapper methods.
+    switch (id) {
+    case OpId::Negate:
+        return call(calc, OpId::Sub, 0LL, a, unit);
+    case OpId::Percent:
+        return call(calc, OpId::Div, a, 100LL, unit);
+    case OpId::Sqr:
+        return call(calc, OpId::Pow, a, 2LL, unit);
+    case OpId::Cube:
+        return call(calc, OpId::Pow, a, 3LL, unit);
+    case OpId::Recip:
+        return call(calc, OpId::Pow, a, -1LL, unit);
+    case OpId::Pow10:
+        return call(calc, OpId::Pow, 10LL, a, unit);
+    case OpId::Exp:
+        return call(calc, OpId::Pow, e_constant(), a, unit);
+    default:
+        return call(calc, id, a, b, unit);
+    }
+}
+
+ErrorKind error_kind(const std::exception &error) noexcept {
+    const std::string_view message = error.what();
+    if (message == kInvalidMessage) {
+        return ErrorKind::Invalid;
+    }
+    if (message == kMalformedMessage) {
+        return ErrorKind::Malformed;
+    }
+    if (message == Budget::kTimeoutMessage) {
+        return ErrorKind::Timeout;
+    }
+    if (message == Budget::kCancelledMessage) {
+        return ErrorKind::Cancelled;
+    }
+    return ErrorKind::MathErr;
+}
+
+Number evaluate_rpn(const std::vector<ops::Token> &rpn, AngleUnit unit, const Budget *budget) {
+    const Calculator calc(budget);
+    std::vector<Number> stack;
+    stack.reserve(rpn.size());
+
+    for (const ops::Token &tok : rpn) {
+        if (tok.kind == ops::TokenKind::Number) {
+            stack.push_back(literal_value(tok));
+            continue;
+        }
+        if (tok.kind != ops::TokenKind::Op) {
+            malformed();
+        }
+
+        if (ops::op_spec(tok.op_id)->arity == Arity::Binary) {
+            if (stack.size() < 2) {
+                malformed();
+            }
+            const Number b = std::move(stack.back());
+            stack.pop_back();
+            stack.back() = apply(calc, tok.op_id, stack.back(), b, unit);
+            continue;
+        }
+
+        if (stack.empty()) {
+            malformed();
+        }
+        stack.back() = apply(calc, tok.op_id, stack.back(), Number{}, unit);
+    }
+
+    if (stack.empty()) {
+        malformed();
+    }
+    return std::move(stack.front());
+}
+
+Number evaluate(const ops::Program &program, AngleUnit unit, Precision precision) {
+    return optimize(program, nullptr, precision)->run(unit);
+}
+
+Number evaluate(const ops::Program &program, AngleUnit unit, const Limits &limits,
+                Precision precision) {
+    const Budget budget(limits);
+    return optimize(program, &budget, precision)->run(unit, &budget);
+}
+
+Outcome try_evaluate(const ops::Program &program, AngleUnit unit, Precision precision) noexcept {
+    try {
+        return optimize(program, nullptr, precision)->try_run(unit);
+    } catch (const std::exception &e) {
+        return {error_kind(e), {}};
+    }
+}
+
+Outcome try_evaluate(const ops::Program &program, AngleUnit unit, const Limits &limits,
+                     Precision precision) noexcept {
+    try {
+        const Budget budget(limits);
+        return optimize(program, &budget, precision)->try_run(unit, &budget);
+    } catch (const std::exception &e) {
+        return {error_kind(e), {}};
+    }
+}
+
+} // namespace tcalc::eval
@@ -0,0 +1,315 @@
+#include "eval/pub/plan.hpp"
+
+#include <array>
+#include <charconv>
+#include <exception>
+#include <functional>
+#include <sstream>
+#include <string_view>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <variant>
+
+namespace tcalc::eval {
+
+namespace {
+
+using ops::Arity;
+using ops::OpId;
+
+struct NodeKey {
+    OpId op;
+    std::uint32_t a;
+    std::uint32_t b;
+
+    bool operator==(const NodeKey &) const = default;
+};
+
+struct NodeKeyHash {
+    std::size_t operator()(const NodeKey &k) const noexcept {
+        std::size_t h = std::hash<std::uint32_t>{}(k.a);
+        h = h * 31 + std::hash<std::uint32_t>{}(k.b);
+        return h * 31 + static_cast<std::size_t>(k.op);
+    }
+};
+
+std::string describe(double x) {
+    std::array<char, 32> buf{};
+    const auto res = std::to_chars(buf.data(), buf.data() + buf.size(), x);
+    return {buf.data(), res.ptr};
+}
+
+std::string describe(const Number &v) {
+    return std::visit(
+        [](const auto &x) -> std::string {
+            using T = std::decay_t<decltype(x)>;
+            if constexpr (std::is_same_v<T, long long>) {
+                return std::to_string(x);
+            } else if constexpr (std::is_same_v<T, double>) {
+                return describe(x);
+            } else if constexpr (std::is_same_v<T, Complex>) {
+                return "(" + describe(x.real()) + (x.imag() < 0 ? "" : "+") + describe(x.imag()) +
+                       "j)";
+            } else {
+                std::ostringstream out;
+                out.precision(16);
+                out << x;
+                return out.str();
+            }
+        },
+        v);
+}
+
+std::string_view node_name(const Plan::Node &node) {
+    return ops::op_spec(node.op)->symbol;
+}
+
+[[noreturn]] void malformed() {
+    throw CalculatorError(kMalformedMessage.data());
+}
+
+} // namespace
+
+Plan::Plan(const std::vector<ops::Token> &rpn, std::string_view variable, const Budget *budget,
+           Precision precision)
+    : precision_(precision) {
+    const Calculator calc(budget, precision_);
+    std::unordered_map<std::string, std::uint32_t> literal_nodes;
+    std::unordered_map<NodeKey, std::uint32_t, NodeKeyHash> op_nodes;
+    std::vector<std::uint32_t> stack;
+    stack.reserve(rpn.size());
+
+    const auto add_node = [&](Node node, std::optional<Number> value, ErrorKind failure) {
+        nodes_.push_back(node);
+        folded_.push_back(std::move(value));
+        failed_.push_back(failure);
+        return static_cast<std::uint32_t>(nodes_.size() - 1);
+    };
+
+    for (const ops::Token &tok : rpn) {
+        if (tok.kind == ops::TokenKind::Number) {
+            const auto [it, inserted] =
+                literal_nodes.try_emplace(tok.value, static_cast<std::uint32_t>(nodes_.size()));
+            if (inserted) {
+                const bool varying = !variable.empty() && tok.value == variable;
+                std::optional<Number> value;
+                ErrorKind failure = ErrorKind::Ok;
+                try {
+                    if (!varying) {
+                        value = literal_value(tok);
+                    }
+                } catch (const std::exception &e) {
+                    // Left for run() so the error surfaces in evaluation order.
+                    failure = error_kind(e);
+                }
+                literals_.push_back(tok.value);
+                add_node(Node{.literal = static_cast<std::uint32_t>(literals_.size() - 1),
+                              .varying = varying},
+                         std::move(value), failure);
+            }
+            stack.push_back(it->second);
+            continue;
+        }
+
+        const bool binary =
+            tok.kind == ops::TokenKind::Op && ops::op_spec(tok.op_id)->arity == Arity::Binary;
+        if (tok.kind != ops::TokenKind::Op || stack.size() < (binary ? 2U : 1U)) {
+            malformed_ = true;
+            break;
+        }
+
+        Node node{.op = tok.op_id};
+        if (binary) {
+            node.b = stack.back();
+            stack.pop_back();
+        }
+        node.a = stack.back();
+        stack.pop_back();
+
+        const NodeKey key{node.op, node.a, node.b};
+        if (const auto found = op_nodes.find(key); found != op_nodes.end()) {
+            stack.push_back(found->second);
+            continue;
+        }
+
+        node.unit_dependent = ops::needs_angle_unit(*ops::op_spec(node.op)) ||
+                              nodes_[node.a].unit_dependent ||
+                              (binary && nodes_[node.b].unit_dependent);
+        node.varying = nodes_[node.a].varying || (binary && nodes_[node.b].varying);
+
+        std::optional<Number> value;
+        ErrorKind failure = ErrorKind::Ok;
+        if (!node.unit_dependent && folded_[node.a] && (!binary || folded_[node.b])) {
+            // The unit is irrelevant here: unit-dependent nodes are never folded early.
+            const Number &b = binary ? *folded_[node.b] : Number{};
+            failure = operand_error(node.op, *folded_[node.a], b);
+            try {
+                if (failure == ErrorKind::Ok) {
+                    value = apply(calc, node.op, *folded_[node.a], b, AngleUnit::RAD);
+                }
+            } catch (const std::exception &e) {
+                // Not folded; run() raises it. Running out of budget says nothing
+                // about the node, so a later run with a new budget tries again.
+                failure = error_kind(e);
+                if (failure == ErrorKind::Timeout || failure == ErrorKind::Cancelled) {
+                    failure = ErrorKind::Ok;
+                }
+            }
+        }
+
+        const std::uint32_t id = add_node(node, std::move(value), failure);
+        op_nodes.emplace(key, id);
+        stack.push_back(id);
+    }
+
+    if (stack.empty()) {
+        malformed_ = true;
+    } else {
+        root_ = stack.front();
+    }
+
+    constant_ = !malformed_;
+    for (const auto &value : folded_) {
+        constant_ = constant_ && value.has_value();
+    }
+}
+
+Number Plan::run(AngleUnit unit, const Budget *budget) const {
+    return compute(unit, true, budget).value;
+}
+
+Outcome Plan::try_run(AngleUnit unit, const Budget *budget) const noexcept {
+    try {
+        return compute(unit, false, budget);
+    } catch (const std::exception &e) {
+        return {error_kind(e), {}};
+    }
+}
+
+Outcome Plan::compute(AngleUnit unit, bool rethrow_known, const Budget *budget) const {
+    if (constant_) {
+        return {ErrorKind::Ok, *folded_[root_]};
+    }
+
+    auto &cached = per_unit_.at(static_cast<std::size_t>(unit));
+    if (const auto hit = cached.load()) {
+        return {ErrorKind::Ok, *hit};
+    }
+
+    const Calculator calc(budget, precision_);
+    std::vector<Number> values(nodes_.size());
+    for (std::size_t i = 0; i < nodes_.size(); ++i) {
+        const Node &node = nodes_[i];
+        if (folded_[i]) {
+            values[i] = *folded_[i];
+        } else if (!rethrow_known && failed_[i] != ErrorKind::Ok) {
+            // Its inputs are constants, so it fails the same way on every run.
+            return {failed_[i], {}};
+        } else if (node.op == OpId::Count) {
+            values[i] = parse_literal(literals_[node.literal]);
+        } else {
+            const Number &b = node.b == kNone ? Number{} : values[node.b];
+            if (!rethrow_known) {
+                if (const ErrorKind failure = operand_error(node.op, values[node.a], b);
+                    failure != ErrorKind::Ok) {
+                    return {failure, {}};
+                }
+            }
+            values[i] = apply(calc, node.op, values[node.a], b, unit);
+        }
+    }
+
+    if (malformed_) {
+        if (rethrow_known) {
+            malformed();
+        }
+        return {ErrorKind::Malformed, {}};
+    }
+
+    auto result = std::make_shared<const Number>(std::move(values[root_]));
+    cached.store(result);
+    return {ErrorKind::Ok, *result};
+}
+
+std::size_t Plan::folded_count() const noexcept {
+    std::size_t n = 0;
+    for (std::size_t i = 0; i < nodes_.size(); ++i) {
+        n += (folded_[i] && nodes_[i].op != OpId::Count) ? 1 : 0;
+    }
+    return n;
+}
+
+std::string Plan::dump() const {
+    std::ostringstream out;
+    for (std::size_t i = 0; i < nodes_.size(); ++i) {
+        const Node &node = nodes_[i];
+        out << "  %" << i << " = ";
+        if (node.op == OpId::Count) {
+            out << literals_[node.literal];
+        } else {
+            out << node_name(node) << " %" << node.a;
+            if (node.b != kNone) {
+                out << " %" << node.b;
+            }
+        }
+        if (folded_[i] && node.op != OpId::Count) {
+            out << "  => " << describe(*folded_[i]);
+        } else if (node.varying) {
+            out << "  ; varying";
+        } else if (node.unit_dependent) {
+            out << "  ; per unit";
+        }
+        out << '\n';
+    }
+    if (malformed_) {
+        out << "  malformed\n";
+    } else {
+        out << "  return %" << root_ << '\n';
+    }
+    return out.str();
+}
+
+std::size_t Plan::byte_size() const noexcept {
+    std::size_t n = sizeof(Plan) + nodes_.capacity() * sizeof(Node) +
+                    folded_.capacity() * sizeof(std::optional<Number>) +
+                    failed_.capacity() * sizeof(ErrorKind) +
+                    literals_.capacity() * sizeof(std::string);
+    for (const std::string &literal : literals_) {
+        n += literal.capacity() > std::string().capacity() ? literal.capacity() + 1 : 0;
+    }
+    // per_unit_ results are filled lazily; count them up front so the size is fixed.
+    return n + kUnits * sizeof(Number);
+}
+
+std::shared_ptr<const Plan> optimize(const ops::Program &program, const Budget *budget,
+                                     Precision precision) {
+    auto stale = program.plan_slot().get();
+    if (stale && stale->precision() == precision) {
+        return stale;
+    }
+    auto fresh = std::make_shared<const Plan>(program.rpn(), "", budget, precision);
+    if (precision != default_precision()) {
+        return fresh;
+    }
+    auto published = program.plan_slot().publish(fresh, fresh->byte_size(), std::move(stale));
+    // Lost a race to a plan for another precision: use ours without publishing it.
+    return published->precision() == fresh->precision() ? published : fresh;
+}
+
+std::string dump(const ops::Program &program) {
+    std::ostringstream out;
+    out << "rpn (" << program.rpn().size() << " tokens):\n ";
+    for (const ops::Token &tok : program.rpn()) {
+        out << ' '
+            << (tok.kind == ops::TokenKind::Number ? std::string_view(tok.value)
+                                                   : ops::op_spec(tok.op_id)->symbol);
+    }
+
+    const auto plan = optimize(program);
+    out << "\nplan (" << plan->nodes().size() << " nodes, " << plan->folded_count() << " folded):\n"
+        << plan->dump();
+    return out.str();
+}
+
+} // namespace tcalc::eval
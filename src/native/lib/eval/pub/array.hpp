@@ -0,0 +1,49 @@
+#pragma once
+
+#include <cstdint>
+#include <span>
+#include <string_view>
+#include <vector>
+
+#include "eval/pub/evaluator.hpp"
+
+namespace tcalc::eval {
+
+struct ArrayResult {
+    // Exactly one of real / complex holds the values: complex when any element
+    // ended on the complex plane. Failed elements are NaN and flagged in errors.
+    std::vector<double> real;
+    std::vector<Complex> complex;
+    std::vector<std::uint8_t> errors;
+    bool is_complex = false;
+
+    std::size_t size() const noexcept { return errors.size(); }
+};
+
+//
+// Evaluate `program` once per input element, with number tokens spelled
+// `variable` bound to that element. Each plan node runs as one loop over the
+// whole column through the double/complex Calculator kernels, with the same
+// per-element promotion to the complex plane as the scalar evaluator.
+//
+// Array mode never widens to BigReal: overflow gives inf and exact-integer ops
+// work in doubles. An element whose computation fails is masked instead of
+// raising. Failures that do not depend on the element (malformed programs, bad
+// literals, errors in constant subexpressions) throw as evaluate() would.
+//
+// With limits, each plan node charges one op per element to a Budget started
+// here, on top of what its kernels charge; running out stops the whole array
+// with Timeout or Cancelled instead of masking the elements left. Constant
+// subexpressions fold at `precision`.
+//
+// The variable must be a plain name (e.g. "t"): not a number, a constant or an
+// operator symbol. Safe to call without the Python GIL.
+//
+ArrayResult evaluate_array(const ops::Program &program, std::string_view variable,
+                           std::span<const double> values, AngleUnit unit,
+                           const Limits &limits = {}, Precision precision = default_precision());
+ArrayResult evaluate_array(const ops::Program &program, std::string_view variable,
+                           std::span<const Complex> values, AngleUnit unit,
+                           const Limits &limits = {}, Precision precision = default_precision());
+
+} // namespace tcalc::eval
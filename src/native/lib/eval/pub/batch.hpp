@@ -0,0 +1,25 @@
+#pragma once
+
+#include <string>
+#include <vector>
+
+#include "eval/pub/evaluator.hpp"
+
+namespace tcalc::eval {
+
+struct BatchResult {
+    // values[i] is only meaningful when errors[i] == ErrorKind::Ok.
+    std::vector<Number> values;
+    std::vector<ErrorKind> errors;
+};
+
+// Compile and evaluate every expression on `workers` threads (0 = one per
+// hardware thread). Results come back in input order; an error in one item
+// never affects the others. `limits` apply to each item separately, so one
+// runaway item times out on its own. Every item works at `precision`. Safe to
+// call without the Python GIL.
+BatchResult evaluate_many(const std::vector<std::string> &expressions, AngleUnit unit,
+                          unsigned workers = 0, const Limits &limits = {},
+                          Precision precision = default_precision());
+
+} // namespace tcalc::eval
@@ -0,0 +1,93 @@
+#pragma once
+
+#include <cstdint>
+#include <exception>
+#include <string_view>
+#include <variant>
+#include <vector>
+
+#include "calc/pub/calculator.hpp"
+#include "parser/pub/parser.hpp"
+
+namespace tcalc::eval {
+
+using Complex = Calculator::Complex;
+using AngleUnit = Calculator::AngleUnit;
+
+// Tagged operand of the native evaluator. The first five alternatives mirror the
+// Python numeric tower: int, float, complex, BigReal and BigComplex. ExtDouble holds
+// results that overflowed double; it ranks between double and BigReal, and the
+// bindings hand it to Python as BigReal.
+using Number = std::variant<long long, double, Complex, BigReal, BigComplex, ExtDouble>;
+
+// Error categories, matching tcalc.core.errors.ErrorKind. Ok means no error;
+// Timeout and Cancelled come from an evaluation's Limits.
+enum class ErrorKind : std::uint8_t { Ok, Invalid, Malformed, MathErr, Timeout, Cancelled };
+
+inline constexpr std::string_view kInvalidMessage = "Invalid expression";
+inline constexpr std::string_view kMalformedMessage = "Malformed Expression";
+
+// Result of a non-throwing evaluation. `value` is only meaningful when status is Ok.
+struct Outcome {
+    ErrorKind status = ErrorKind::Ok;
+    Number value{};
+};
+
+// Classify an exception thrown by compile/evaluate. Anything that is not an
+// invalid-literal, malformed-expression or budget error counts as a math error.
+ErrorKind error_kind(const std::exception &error) noexcept;
+
+// Value of a number token (or one of the constants e, pi, π, i), with the type
+// the tokenizer classified it as. Only BigReal literals are parsed here; a
+// literal of kind None is classified from `text` first.
+Number literal_value(const ops::Literal &literal, std::string_view text);
+Number literal_value(const ops::Token &token);
+// literal_value of untokenized text.
+Number parse_literal(std::string_view text);
+
+// Apply one operation to already evaluated operands, with the same domain
+// promotion and coercion rules as tcalc.core.engine.Calculator. `b` is ignored
+// for unary and postfix ops.
+Number apply(const Calculator &calc, ops::OpId id, const Number &a, const Number &b,
+             AngleUnit unit);
+
+// Domain promotion rules, mirroring tcalc.core.ops._PROMO_RULES_BY_ID: whether a
+// real operation must move to the complex plane, and whether it can.
+bool needs_complex(ops::OpId id, double x, double y);
+bool has_complex_overload(ops::OpId id);
+
+// MathErr when apply(id, a, b) is sure to fail from its operands alone (zero
+// divisors, ln/log of zero, 0 to a negative integer power, n! and gamma at their
+// poles, complex operands of real-only ops), checked without calling a kernel so
+// try_evaluate() can report these without an exception. Ok means apply() may
+// still fail.
+ErrorKind operand_error(ops::OpId id, const Number &a, const Number &b) noexcept;
+
+// Direct stack interpreter over RPN tokens.
+Number evaluate_rpn(const std::vector<ops::Token> &rpn, AngleUnit unit,
+                    const Budget *budget = nullptr);
+// Evaluate through the program's optimized plan (see eval/pub/plan.hpp) at
+// `precision`. With limits, every op and every kernel loop is charged to a Budget
+// started here.
+Number evaluate(const ops::Program &program, AngleUnit unit,
+                Precision precision = default_precision());
+Number evaluate(const ops::Program &program, AngleUnit unit, const Limits &limits,
+                Precision precision = default_precision());
+// evaluate() for live preview: failures come back as a status instead of an
+// exception. Failures the plan already knows about (malformed programs, bad
+// literals, errors in constant subexpressions) and operand errors caught by
+// operand_error() are reported without throwing; only rarer kernel failures and
+// running out of limits still unwind internally before becoming a status.
+Outcome try_evaluate(const ops::Program &program, AngleUnit unit,
+                     Precision precision = default_precision()) noexcept;
+Outcome try_evaluate(const ops::Program &program, AngleUnit unit, const Limits &limits,
+                     Precision precision = default_precision()) noexcept;
+
+// Conversions used by coercion. Floats go through their shortest round-trip
+// representation so 0.1 becomes BigReal("0.1"), as the Python wrapper did.
+double to_real(const Number &v);
+Complex to_complex(const Number &v);
+BigReal to_big(const Number &v);
+BigComplex to_big_complex(const Number &v);
+
+} // namespace tcalc::eval
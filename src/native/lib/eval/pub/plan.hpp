@@ -0,0 +1,98 @@
+#pragma once
+
+#include <array>
+#include <atomic>
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include "eval/pub/evaluator.hpp"
+
+namespace tcalc::eval {
+
+//
+// Optimized form of a compiled RPN program: an SSA list of nodes in evaluation
+// order. Identical literals and identical (op, operand, operand) triples share one
+// node, so repeated subexpressions are computed once. Subtrees that do not depend
+// on the angle unit are folded to constants when the plan is built; the rest are
+// folded per unit on the first run with that unit.
+//
+// Folding goes through eval::apply, so promotion and coercion are the same as for
+// the plain RPN interpreter. A node whose fold throws is left in the plan, and
+// run() raises the same error at the same point as evaluate_rpn() would.
+//
+// A plan built with a `variable` name treats number tokens spelled that way as a
+// free variable: they and every node above them are marked varying and never
+// folded. run() cannot bind the variable and rejects it as an invalid literal;
+// evaluate_array() (eval/pub/array.hpp) evaluates such plans.
+//
+// BigReal folds depend on the working precision, so a plan keeps the precision
+// it was built for and optimize() rebuilds it when a caller asks for another.
+//
+class Plan {
+  public:
+    static constexpr std::uint32_t kNone = UINT32_MAX;
+
+    struct Node {
+        ops::OpId op = ops::OpId::Count; // Count marks a literal
+        std::uint32_t a = kNone;
+        std::uint32_t b = kNone;
+        std::uint32_t literal = kNone; // index into literals()
+        bool unit_dependent = false;
+        bool varying = false; // depends on the free variable
+    };
+
+    // Folding is charged to `budget`; a fold cut short by it is left for run().
+    // Folds and run() both work at `precision`.
+    explicit Plan(const std::vector<ops::Token> &rpn, std::string_view variable = {},
+                  const Budget *budget = nullptr, Precision precision = default_precision());
+
+    Number run(AngleUnit unit, const Budget *budget = nullptr) const;
+    // run() without exceptions for failures known when the plan was built and
+    // for operand errors (see operand_error).
+    Outcome try_run(AngleUnit unit, const Budget *budget = nullptr) const noexcept;
+
+    const std::vector<Node> &nodes() const noexcept { return nodes_; }
+    const std::vector<std::string> &literals() const noexcept { return literals_; }
+    const std::optional<Number> &folded(std::uint32_t i) const { return folded_[i]; }
+    std::uint32_t root() const noexcept { return root_; }
+    bool is_malformed() const noexcept { return malformed_; }
+    Precision precision() const noexcept { return precision_; }
+    std::size_t folded_count() const noexcept;
+    // Approximate native footprint, counting a filled result slot for every unit.
+    std::size_t byte_size() const noexcept;
+    std::string dump() const;
+
+  private:
+    // Evaluate every node in order. Failures recorded at build time are either
+    // recomputed so they throw their own error, or reported by status; so are
+    // the operand errors operand_error() catches before a kernel would throw.
+    Outcome compute(AngleUnit unit, bool rethrow_known, const Budget *budget) const;
+
+    std::vector<Node> nodes_;
+    std::vector<std::optional<Number>> folded_;
+    std::vector<ErrorKind> failed_; // why a node whose inputs were known did not fold
+    std::vector<std::string> literals_;
+    std::uint32_t root_ = kNone;
+    bool malformed_ = false;
+    bool constant_ = false; // every node folded at build time
+    Precision precision_;
+
+    static constexpr std::size_t kUnits = 3;
+    mutable std::array<std::atomic<std::shared_ptr<const Number>>, kUnits> per_unit_{};
+};
+
+// The program's plan at `precision`. The plan for the default precision is
+// built and published on first use and rebuilt when the default changes; a plan
+// for any other precision is built for the caller and not published, so callers
+// alternating between precisions do not keep replacing the shared one.
+std::shared_ptr<const Plan> optimize(const ops::Program &program, const Budget *budget = nullptr,
+                                     Precision precision = default_precision());
+
+// RPN before optimization followed by the plan after it; for debugging.
+std::string dump(const ops::Program &program);
+
+} // namespace tcalc::eval
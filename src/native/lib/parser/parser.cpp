@@ -1,34 +1,90 @@
 #include "parser/pub/parser.hpp"
 
-#include <cctype>
+#include <algorithm>
+#include <array>
+#include <charconv>
+#include <cstdint>
+#include <cstdlib>
+#include <cstring>
 #include <string>
+#include <system_error>
 #include <utility>
 
-
 namespace tcalc::ops {
 
 namespace {
 
-inline unsigned char as_uchar(char c) {
+constexpr unsigned char as_uchar(char c) {
     return static_cast<unsigned char>(c);
 }
 
-std::string_view scan_number(std::string_view s, std::size_t start, std::size_t &out_next) {
+//
+// Locale-independent ASCII classes used in place of std::isspace / std::isdigit.
+//
+enum CharClass : std::uint8_t { Space = 1U << 0, Digit = 1U << 1 };
+
+constexpr auto kCharClass = [] {
+    std::array<std::uint8_t, 256> out{};
+    for (const unsigned char c : {' ', '\t', '\n', '\v', '\f', '\r'}) {
+        out[c] = Space;
+    }
+    for (unsigned char c = '0'; c <= '9'; ++c) {
+        out[c] = Digit;
+    }
+    return out;
+}();
+
+inline bool is_space(char c) {
+    return (kCharClass[as_uchar(c)] & Space) != 0;
+}
+
+inline bool is_digit(char c) {
+    return (kCharClass[as_uchar(c)] & Digit) != 0;
+}
+
+inline std::uint64_t load8(const char *p) {
+    std::uint64_t v;
+    std::memcpy(&v, p, sizeof v);
+    return v;
+}
+
+// SWAR: true when all eight bytes are ASCII digits.
+inline bool all_digits8(std::uint64_t v) {
+    constexpr std::uint64_t hi = 0xF0F0F0F0F0F0F0F0ULL;
+    return ((v & hi) | (((v + 0x0606060606060606ULL) & hi) >> 4)) == 0x3333333333333333ULL;
+}
+
+std::size_t skip_digits(std::string_view s, std::size_t i) {
     const std::size_t n = s.size();
-    std::size_t i = start;
-    bool saw_digit = false;
+    while (i + 8 <= n && all_digits8(load8(s.data() + i))) {
+        i += 8;
+    }
+    while (i < n && is_digit(s[i])) {
+        ++i;
+    }
+    return i;
+}
 
-    while (i < n && std::isdigit(as_uchar(s[i])) != 0) {
-        saw_digit = true;
+std::size_t skip_spaces(std::string_view s, std::size_t i) {
+    const std::size_t n = s.size();
+    while (i + 8 <= n && load8(s.data() + i) == 0x2020202020202020ULL) {
+        i += 8;
+    }
+    while (i < n && is_space(s[i])) {
         ++i;
     }
+    return i;
+}
+
+std::string_view scan_number(std::string_view s, std::size_t start, std::size_t &out_next) {
+    const std::size_t n = s.size();
+    std::size_t i = skip_digits(s, start);
+    bool saw_digit = i != start;
 
     if (i < n && s[i] == '.') {
-        ++i;
-        while (i < n && std::isdigit(as_uchar(s[i])) != 0) {
-            saw_digit = true;
-            ++i;
-        }
+        const std::size_t frac = i + 1;
+        i = skip_digits(s, frac);
+        saw_digit = saw_digit || i != frac;
     }
 
     if (!saw_digit) {
@@ -41,9 +97,7 @@ std::string_view scan_number(std::string_view s, std::size_t start, std::size_t
             ++j;
         }
         const std::size_t exp_start = j;
-        while (j < n && std::isdigit(as_uchar(s[j])) != 0) {
-            ++j;
-        }
+        j = skip_digits(s, j);
         if (j != exp_start) {
             i = j;
         }
@@ -53,59 +107,138 @@ std::string_view scan_number(std::string_view s, std::size_t start, std::size_t
     return s.substr(start, i - start);
 }
 
-const OpSpec *match_op(std::string_view s, std::size_t i, std::size_t &out_len) {
-    const std::string_view rest = s.substr(i);
-    const OpSpec *best = nullptr;
-    std::size_t best_len = 0;
+//
+// Byte trie over every symbol and alias in kTokenTable, built at compile time.
+// Multi-byte UTF-8 symbols (√, ⌄, ², ...) are just longer byte paths, so the
+// longest match needs one table step per input byte instead of a scan of the
+// whole table. Bytes that occur in no symbol share class 0 and stop the walk.
+//
+consteval auto build_byte_classes() {
+    std::array<std::uint8_t, 256> out{};
+    std::uint8_t next = 1;
+    for (const auto &entry : kTokenTable) {
+        for (const char c : entry.token) {
+            if (out[as_uchar(c)] == 0) {
+                out[as_uchar(c)] = next++;
+            }
+        }
+    }
+    return out;
+}
+
+inline constexpr auto kByteClass = build_byte_classes();
+
+consteval std::size_t byte_class_count() {
+    std::size_t n = 0;
+    for (const auto cls : kByteClass) {
+        n = cls > n ? cls : n;
+    }
+    return n + 1;
+}
 
+consteval std::size_t trie_node_bound() {
+    std::size_t n = 1;
+    for (const auto &entry : kTokenTable) {
+        n += entry.token.size();
+    }
+    return n;
+}
+
+struct OpTrie {
+    // Node 0 is the root and never a child, so 0 doubles as "no edge".
+    std::array<std::array<std::uint16_t, byte_class_count()>, trie_node_bound()> next{};
+    std::array<const OpSpec *, trie_node_bound()> accept{};
+};
+
+consteval OpTrie build_op_trie() {
+    OpTrie trie{};
+    std::uint16_t nodes = 1;
     for (const auto &entry : kTokenTable) {
         if (entry.token.empty()) {
             continue;
         }
-        if (entry.token.size() <= best_len) {
-            continue;
+        std::uint16_t node = 0;
+        for (const char c : entry.token) {
+            auto &edge = trie.next[node][kByteClass[as_uchar(c)]];
+            if (edge == 0) {
+                edge = nodes++;
+            }
+            node = edge;
         }
-        if (rest.starts_with(entry.token)) {
-            best = entry.spec;
-            best_len = entry.token.size();
+        // First entry wins on duplicates, as with the old linear scan.
+        if (trie.accept[node] == nullptr) {
+            trie.accept[node] = entry.spec;
+        }
+    }
+    return trie;
+}
+
+inline constexpr OpTrie kOpTrie = build_op_trie();
+
+const OpSpec *match_op(std::string_view s, std::size_t i, std::size_t &out_len) {
+    const OpSpec *best = nullptr;
+    std::size_t best_len = 0;
+    std::uint16_t node = 0;
+
+    for (std::size_t j = i; j < s.size(); ++j) {
+        const std::uint8_t cls = kByteClass[as_uchar(s[j])];
+        if (cls == 0) {
+            break;
+        }
+        node = kOpTrie.next[node][cls];
+        if (node == 0) {
+            break;
+        }
+        if (kOpTrie.accept[node] != nullptr) {
+            best = kOpTrie.accept[node];
+            best_len = j - i + 1;
         }
     }
     out_len = best_len;
     return best;
 }
 
-} // namespace
-
-std::vector<Token> tokenize(std::string_view expression) {
-    std::vector<Token> tokens;
-    if (expression.empty()) {
-        return tokens;
+// Longest distance the tokenizer looks past the end of a token before deciding
+// where it ends: a full operator symbol, or "e+d" after a number.
+consteval std::size_t max_lookahead() {
+    std::size_t n = 3;
+    for (const auto &entry : kTokenTable) {
+        n = entry.token.size() > n ? entry.token.size() : n;
     }
+    return n;
+}
 
-    std::size_t i = 0;
+inline constexpr std::size_t kLookahead = max_lookahead();
+
+//
+// Scan the next token at or after `i`. Returns false once only whitespace is left.
+// `expect_operand` is the only state carried between tokens, which is what lets
+// IncrementalParser resume from any token boundary.
+//
+bool next_token(std::string_view expression, std::size_t &i, bool &expect_operand, Token &out,
+                std::size_t &out_start) {
     const std::size_t n = expression.size();
-    bool expect_operand = true;
 
     while (i < n) {
-        const unsigned char c = static_cast<unsigned char>(expression[i]);
-
-        if (std::isspace(c) != 0) {
-            ++i;
+        if (is_space(expression[i])) {
+            i = skip_spaces(expression, i);
             continue;
         }
 
+        out_start = i;
+
         if (expression[i] == '(') {
-            tokens.push_back(Token{TokenKind::LParen});
+            out = Token{TokenKind::LParen};
             ++i;
             expect_operand = true;
-            continue;
+            return true;
         }
 
         if (expression[i] == ')') {
-            tokens.push_back(Token{TokenKind::RParen});
+            out = Token{TokenKind::RParen};
             ++i;
             expect_operand = false;
-            continue;
+            return true;
         }
 
         std::size_t len = 0;
@@ -114,13 +247,13 @@ std::vector<Token> tokenize(std::string_view expression) {
             if (spec->id == OpId::Sub && expect_operand) {
                 spec = op_spec(OpId::Negate);
             }
-            tokens.push_back(Token{TokenKind::Op, spec->id});
+            out = Token{TokenKind::Op, spec->id};
             i += len;
             expect_operand = (spec->arity != Arity::Postfix);
-            continue;
+            return true;
         }
 
-        if (std::isdigit(c) != 0 || expression[i] == '.') {
+        if (is_digit(expression[i]) || expression[i] == '.') {
             std::size_t next = i;
             const std::string_view sv = scan_number(expression, i, next);
 
@@ -132,16 +265,16 @@ std::vector<Token> tokenize(std::string_view expression) {
                     number.push_back('i');
                     ++i;
                 }
-                tokens.push_back(Token{TokenKind::Number, OpId::Count, std::move(number)});
+                const Literal literal = classify_literal(number);
+                out = Token{TokenKind::Number, OpId::Count, std::move(number), literal};
                 expect_operand = false;
-                continue;
+                return true;
             }
         }
 
         const std::size_t start = i;
         while (i < n) {
-            const unsigned char cc = static_cast<unsigned char>(expression[i]);
-            if (std::isspace(cc) != 0) {
+            if (is_space(expression[i])) {
                 break;
             }
 
@@ -162,60 +295,248 @@ std::vector<Token> tokenize(std::string_view expression) {
         }
 
         const std::string_view chunk = expression.substr(start, i - start);
-        tokens.push_back(Token{TokenKind::Number, OpId::Count, std::string(chunk)});
+        out = Token{TokenKind::Number, OpId::Count, std::string(chunk), classify_literal(chunk)};
         expect_operand = false;
+        return true;
+    }
+
+    return false;
+}
+
+// A literal without an imaginary suffix: an int unless it has a '.' or an
+// exponent, and a BigReal when it has an exponent or overflows long long.
+Literal classify_real(std::string_view s) {
+    Literal out;
+    out.kind = LiteralKind::Invalid;
+    if (s.empty()) {
+        return out;
+    }
+    const char *first = s.data();
+    const char *last = s.data() + s.size();
+    const bool has_dot = s.find('.') != std::string_view::npos;
+    const bool has_exp = s.find_first_of("eE") != std::string_view::npos;
+
+    if (!has_dot && !has_exp) {
+        const auto res = std::from_chars(first, last, out.integer);
+        if (res.ptr != last) {
+            return out;
+        }
+        if (res.ec == std::errc::result_out_of_range) {
+            out.kind = LiteralKind::Big;
+            out.real = std::strtod(std::string(s).c_str(), nullptr);
+        } else {
+            out.kind = LiteralKind::Int;
+            out.real = static_cast<double>(out.integer);
+        }
+        return out;
+    }
+
+    const auto res = std::from_chars(first, last, out.real);
+    if (res.ptr != last) {
+        return out;
+    }
+    if (res.ec == std::errc::result_out_of_range) {
+        // from_chars leaves the value alone; strtod gives the inf or 0 Python would.
+        out.real = std::strtod(std::string(s).c_str(), nullptr);
+    }
+    out.kind = has_exp ? LiteralKind::Big : LiteralKind::Real;
+    return out;
+}
+
+} // namespace
+
+Literal classify_literal(std::string_view text) {
+    if (text == "e") {
+        return Literal{LiteralKind::E};
+    }
+    if (text == "pi" || text == "π") {
+        return Literal{LiteralKind::Pi};
+    }
+
+    std::string_view body = text;
+    if (!text.empty() && (text.front() == 'i' || text.front() == 'I')) {
+        body = text.substr(1);
+    } else if (!text.empty() && (text.back() == 'i' || text.back() == 'I')) {
+        body = text.substr(0, text.size() - 1);
+    } else {
+        return classify_real(text);
+    }
+
+    // Imaginary: the magnitude is read as a float, whatever type it has alone.
+    Literal out = body.empty() ? Literal{LiteralKind::Real, 0, 1.0} : classify_real(body);
+    if (out.kind != LiteralKind::Invalid) {
+        out.kind = LiteralKind::Imag;
+    }
+    return out;
+}
+
+std::vector<Token> tokenize(std::string_view expression) {
+    std::vector<Token> tokens;
+
+    std::size_t i = 0;
+    std::size_t start = 0;
+    bool expect_operand = true;
+    Token tok{TokenKind::Number};
+    while (next_token(expression, i, expect_operand, tok, start)) {
+        tokens.push_back(std::move(tok));
     }
 
     return tokens;
 }
 
-std::vector<Token> normalize(const std::vector<Token> &raw) {
-    std::vector<Token> normalized;
-    normalized.reserve(raw.size());
+void TokenBuffer::push(const Token &tok, std::size_t offset, std::size_t end) {
+    kinds_.push_back(tok.kind);
+    op_ids_.push_back(tok.op_id);
+    offsets_.push_back(static_cast<std::uint32_t>(offset));
+    lengths_.push_back(static_cast<std::uint32_t>(end - offset));
+}
 
-    const auto is_plus_minus = [](const Token &t) -> bool {
-        return t.kind == TokenKind::Op && (t.op_id == OpId::Add || t.op_id == OpId::Sub);
-    };
+std::string_view TokenBuffer::text(std::size_t i) const {
+    return std::string_view(source_).substr(offsets_.at(i), lengths_.at(i));
+}
 
-    const auto ends_operand = [](const Token &t) -> bool {
-        return t.kind == TokenKind::Number || t.kind == TokenKind::RParen ||
-               (t.kind == TokenKind::Op && op_spec(t.op_id)->arity == Arity::Postfix);
-    };
+std::string TokenBuffer::value(std::size_t i) const {
+    if (kinds_.at(i) != TokenKind::Number) {
+        return {};
+    }
+    std::string out(text(i));
+    // Only the number scanner rewrites the suffix; identifier chunks keep their case.
+    std::size_t next = 0;
+    if (out.size() > 1 && out.back() == 'I' && !scan_number(out, 0, next).empty() &&
+        next == out.size() - 1) {
+        out.back() = 'i';
+    }
+    return out;
+}
 
-    const auto starts_operand = [](const Token &t) -> bool {
-        return t.kind == TokenKind::Number || t.kind == TokenKind::LParen ||
-               (t.kind == TokenKind::Op && op_spec(t.op_id)->arity == Arity::Unary);
-    };
+Token TokenBuffer::token(std::size_t i) const {
+    std::string text = value(i);
+    const Literal literal = kinds_[i] == TokenKind::Number ? classify_literal(text) : Literal{};
+    return Token{kinds_[i], op_ids_[i], std::move(text), literal};
+}
 
-    for (const auto &tok : raw) {
-        if (!normalized.empty()) {
-            const Token &last = normalized.back();
-
-            if (is_plus_minus(tok) && is_plus_minus(last)) {
-                if (last.op_id == OpId::Sub) {
-                    // - followed by - => +
-                    // - followed by + => keep -
-                    if (tok.op_id == OpId::Sub) {
-                        normalized.back().op_id = OpId::Add;
-                    }
-                    continue;
-                }
+TokenBuffer tokenize_buffer(std::string_view expression) {
+    TokenBuffer buffer;
+    buffer.source_ = std::string(expression);
 
-                // + followed by +/- => replace with last
-                normalized.back() = tok;
-                continue;
-            }
+    std::size_t i = 0;
+    std::size_t start = 0;
+    bool expect_operand = true;
+    Token tok{TokenKind::Number};
+    while (next_token(expression, i, expect_operand, tok, start)) {
+        buffer.push(tok, start, i);
+    }
+
+    return buffer;
+}
+
+namespace {
+
+bool is_plus_minus(const Token &t) {
+    return t.kind == TokenKind::Op && (t.op_id == OpId::Add || t.op_id == OpId::Sub);
+}
+
+bool ends_operand(const Token &t) {
+    return t.kind == TokenKind::Number || t.kind == TokenKind::RParen ||
+           (t.kind == TokenKind::Op && op_spec(t.op_id)->arity == Arity::Postfix);
+}
+
+bool starts_operand(const Token &t) {
+    return t.kind == TokenKind::Number || t.kind == TokenKind::LParen ||
+           (t.kind == TokenKind::Op && op_spec(t.op_id)->arity == Arity::Unary);
+}
+
+// Whether `tok` may follow the tokens before it without making the RPN malformed.
+// A binary + right after + or - is fine: the normalizer folds the pair.
+bool fits(const Token &tok, bool expect_operand, const Token *prev) {
+    switch (tok.kind) {
+    case TokenKind::Number:
+    case TokenKind::LParen:
+        return true;
+    case TokenKind::RParen:
+        return !expect_operand;
+    case TokenKind::Op:
+        break;
+    }
+    switch (op_spec(tok.op_id)->arity) {
+    case Arity::Unary:
+        return true;
+    case Arity::Postfix:
+        return !expect_operand;
+    case Arity::Binary:
+        return !expect_operand || (is_plus_minus(tok) && prev != nullptr && is_plus_minus(*prev));
+    }
+    return false;
+}
+
+struct VectorSink {
+    std::vector<Token> &out;
+
+    void push(Token tok) { out.push_back(std::move(tok)); }
+};
+
+//
+// Streaming form of normalize(). The last token is held back so that a following
+// +/- can still be folded into it; everything before it is final and goes to the sink.
+//
+template <typename Sink> class Normalizer {
+  public:
+    explicit Normalizer(Sink &sink) : sink_(sink) {}
+
+    void push(Token tok) {
+        if (!has_last_) {
+            last_ = std::move(tok);
+            has_last_ = true;
+            return;
+        }
 
-            if (ends_operand(last) && starts_operand(tok)) {
-                normalized.push_back(Token{TokenKind::Op, OpId::Mul});
+        if (is_plus_minus(tok) && is_plus_minus(last_)) {
+            if (last_.op_id == OpId::Sub) {
+                // - followed by - => +
+                // - followed by + => keep -
+                if (tok.op_id == OpId::Sub) {
+                    last_.op_id = OpId::Add;
+                }
+                return;
             }
+
+            // + followed by +/- => replace with last
+            last_ = std::move(tok);
+            return;
         }
 
-        normalized.push_back(tok);
+        const bool implicit_mul = ends_operand(last_) && starts_operand(tok);
+        sink_.push(std::move(last_));
+        if (implicit_mul) {
+            sink_.push(Token{TokenKind::Op, OpId::Mul});
+        }
+        last_ = std::move(tok);
     }
 
-    return normalized;
-}
+    void finish() {
+        if (has_last_) {
+            sink_.push(std::move(last_));
+            has_last_ = false;
+        }
+    }
+
+    struct Mark {
+        Token last;
+        bool has_last;
+    };
+
+    Mark mark() const { return Mark{last_, has_last_}; }
+
+    void rewind(const Mark &m) {
+        last_ = m.last;
+        has_last_ = m.has_last;
+    }
+
+  private:
+    Sink &sink_;
+    Token last_{TokenKind::Number};
+    bool has_last_ = false;
+};
 
 //
 // Shunting Yard Algorithm
@@ -223,66 +544,338 @@ std::vector<Token> normalize(const std::vector<Token> &raw) {
 //
 // Ref: https://www.sunshine2k.de/articles/coding/shuntingyardalgorithm/shunting_yard_algorithm.html
 //
-std::vector<Token> shunting_yard(const std::vector<Token> &tokens) {
-    std::vector<Token> normalized = normalize(tokens);
-
-    std::vector<Token> output;
-    std::vector<Token> operator_stack;
+class ShuntingYard {
+  public:
+    explicit ShuntingYard(std::size_t expected) {
+        output_.reserve(expected);
+        stack_.reserve(expected);
+    }
 
-    for (const Token &tok : normalized) {
+    void push(Token tok) {
         switch (tok.kind) {
         case TokenKind::Number:
-            output.push_back(tok);
+            output_.push_back(std::move(tok));
             break;
         case TokenKind::LParen:
-            operator_stack.push_back(tok);
+            push_operator(std::move(tok));
             break;
         case TokenKind::RParen:
-            while (!operator_stack.empty() && operator_stack.back().kind != TokenKind::LParen) {
-                output.push_back(operator_stack.back());
-                operator_stack.pop_back();
+            while (top_ != kNone && top().kind != TokenKind::LParen) {
+                pop_to_output();
             }
-            if (!operator_stack.empty() && operator_stack.back().kind == TokenKind::LParen) {
-                operator_stack.pop_back();
+            if (top_ != kNone && top().kind == TokenKind::LParen) {
+                top_ = stack_[top_].below;
             }
             break;
         case TokenKind::Op: {
             const OpSpec *op = op_spec(tok.op_id);
 
-            while (!operator_stack.empty() && operator_stack.back().kind == TokenKind::Op) {
-                const OpSpec *top = op_spec(operator_stack.back().op_id);
+            while (top_ != kNone && top().kind == TokenKind::Op) {
+                const OpSpec *top_op = op_spec(top().op_id);
 
-                if (op->id == OpId::Negate && top->arity == Arity::Unary &&
-                    top->id != OpId::Negate) {
+                if (op->id == OpId::Negate && top_op->arity == Arity::Unary &&
+                    top_op->id != OpId::Negate) {
                     break;
                 }
 
                 const bool pop_left =
-                    (op->associativity == Assoc::Left) && (op->precedence <= top->precedence);
+                    (op->associativity == Assoc::Left) && (op->precedence <= top_op->precedence);
                 const bool pop_right =
-                    (op->associativity == Assoc::Right) && (op->precedence < top->precedence);
+                    (op->associativity == Assoc::Right) && (op->precedence < top_op->precedence);
                 if (!(pop_left || pop_right)) {
                     break;
                 }
 
-                output.push_back(operator_stack.back());
-                operator_stack.pop_back();
+                pop_to_output();
             }
 
-            operator_stack.push_back(tok);
+            push_operator(std::move(tok));
             break;
         }
         }
     }
 
-    while (!operator_stack.empty()) {
-        if (operator_stack.back().kind == TokenKind::Op) {
-            output.push_back(operator_stack.back());
+    // Output so far plus the pending operators, without consuming the state.
+    std::vector<Token> rpn() const {
+        std::vector<Token> out(output_);
+        for (std::size_t k = top_; k != kNone; k = stack_[k].below) {
+            if (stack_[k].tok.kind == TokenKind::Op) {
+                out.push_back(stack_[k].tok);
+            }
+        }
+        return out;
+    }
+
+    std::vector<Token> finish() {
+        for (; top_ != kNone; top_ = stack_[top_].below) {
+            if (stack_[top_].tok.kind == TokenKind::Op) {
+                output_.push_back(std::move(stack_[top_].tok));
+            }
         }
-        operator_stack.pop_back();
+        return std::move(output_);
     }
 
-    return output;
+    struct Mark {
+        std::size_t output;
+        std::size_t stack;
+        std::size_t top;
+    };
+
+    Mark mark() const { return Mark{output_.size(), stack_.size(), top_}; }
+
+    // Only valid for marks taken on this yard, newest first.
+    void rewind(const Mark &m) {
+        output_.resize(m.output);
+        stack_.resize(m.stack);
+        top_ = m.top;
+    }
+
+  private:
+    static constexpr std::size_t kNone = static_cast<std::size_t>(-1);
+
+    //
+    // The operator stack is a linked list in an append-only arena: popping only moves
+    // top_, so a Mark is three integers and rewinding never has to restore popped ops.
+    //
+    struct Node {
+        Token tok;
+        std::size_t below;
+    };
+
+    const Token &top() const { return stack_[top_].tok; }
+
+    void push_operator(Token tok) {
+        stack_.push_back(Node{std::move(tok), top_});
+        top_ = stack_.size() - 1;
+    }
+
+    void pop_to_output() {
+        output_.push_back(stack_[top_].tok);
+        top_ = stack_[top_].below;
+    }
+
+    std::vector<Token> output_;
+    std::vector<Node> stack_;
+    std::size_t top_ = kNone;
+};
+
+} // namespace
+
+std::vector<Token> normalize(const std::vector<Token> &raw) {
+    std::vector<Token> normalized;
+    normalized.reserve(raw.size());
+
+    VectorSink sink{normalized};
+    Normalizer<VectorSink> normalizer(sink);
+    for (const auto &tok : raw) {
+        normalizer.push(tok);
+    }
+    normalizer.finish();
+
+    return normalized;
+}
+
+std::vector<Token> shunting_yard(const std::vector<Token> &tokens) {
+    ShuntingYard yard(tokens.size());
+    Normalizer<ShuntingYard> normalizer(yard);
+    for (const Token &tok : tokens) {
+        normalizer.push(tok);
+    }
+    normalizer.finish();
+
+    return yard.finish();
+}
+
+std::size_t Program::byte_size() const noexcept {
+    const auto heap = [](const std::string &s) -> std::size_t {
+        return s.capacity() > std::string().capacity() ? s.capacity() + 1 : 0;
+    };
+    std::size_t n = sizeof(Program) + heap(expression_);
+    for (const auto *tokens : {&tokens_, &rpn_}) {
+        n += tokens->capacity() * sizeof(Token);
+        for (const Token &tok : *tokens) {
+            n += heap(tok.value);
+        }
+    }
+    return n + plan_.plan_bytes();
+}
+
+Program compile(std::string_view expression) {
+    Program program;
+    program.expression_ = std::string(expression);
+    program.tokens_ = tokenize(expression);
+
+    ShuntingYard yard(program.tokens_.size());
+    Normalizer<ShuntingYard> normalizer(yard);
+    for (const Token &tok : program.tokens_) {
+        normalizer.push(tok);
+    }
+    normalizer.finish();
+    program.rpn_ = yard.finish();
+
+    return program;
+}
+
+struct IncrementalParser::State {
+    struct Checkpoint {
+        std::size_t start;
+        std::size_t end;
+        bool expect_operand;
+        bool valid;
+        int depth;
+        Normalizer<ShuntingYard>::Mark normalizer;
+        ShuntingYard::Mark yard;
+    };
+
+    State()
+        : yard(0), normalizer(yard), yard_origin(yard.mark()),
+          normalizer_origin(normalizer.mark()) {}
+
+    // Drop every token whose scan may have looked past `unchanged`, restore the
+    // state after the last survivor and tokenize the rest of `text` from there.
+    void resync(std::size_t unchanged) {
+        program.reset();
+        while (!checkpoints.empty() && checkpoints.back().end + kLookahead > unchanged) {
+            checkpoints.pop_back();
+            tokens.pop_back();
+        }
+
+        std::size_t i = 0;
+        bool expect_operand = true;
+        bool valid = true;
+        int depth = 0;
+        if (checkpoints.empty()) {
+            yard.rewind(yard_origin);
+            normalizer.rewind(normalizer_origin);
+        } else {
+            const Checkpoint &last = checkpoints.back();
+            i = last.end;
+            expect_operand = last.expect_operand;
+            valid = last.valid;
+            depth = last.depth;
+            yard.rewind(last.yard);
+            normalizer.rewind(last.normalizer);
+        }
+
+        Token tok{TokenKind::Number};
+        std::size_t start = 0;
+        bool expected = expect_operand;
+        while (next_token(text, i, expect_operand, tok, start)) {
+            valid = valid && fits(tok, expected, tokens.empty() ? nullptr : &tokens.back());
+            if (tok.kind == TokenKind::LParen) {
+                ++depth;
+            } else if (tok.kind == TokenKind::RParen && depth > 0) {
+                --depth;
+            }
+            expected = expect_operand;
+
+            normalizer.push(tok);
+            tokens.push_back(std::move(tok));
+            checkpoints.push_back(
+                Checkpoint{start, i, expect_operand, valid, depth, normalizer.mark(), yard.mark()});
+        }
+    }
+
+    std::vector<Token> rpn() {
+        const auto yard_mark = yard.mark();
+        const auto normalizer_mark = normalizer.mark();
+        normalizer.finish();
+        std::vector<Token> out = yard.rpn();
+        yard.rewind(yard_mark);
+        normalizer.rewind(normalizer_mark);
+        return out;
+    }
+
+    std::string text;
+    std::vector<Token> tokens;
+    std::vector<Checkpoint> checkpoints;
+    ShuntingYard yard;
+    Normalizer<ShuntingYard> normalizer;
+    const ShuntingYard::Mark yard_origin;
+    const Normalizer<ShuntingYard>::Mark normalizer_origin;
+    std::shared_ptr<Program> program;
+};
+
+IncrementalParser::IncrementalParser() : state_(std::make_unique<State>()) {
+}
+IncrementalParser::~IncrementalParser() = default;
+IncrementalParser::IncrementalParser(IncrementalParser &&) noexcept = default;
+IncrementalParser &IncrementalParser::operator=(IncrementalParser &&) noexcept = default;
+
+void IncrementalParser::append(std::string_view text) {
+    const std::size_t unchanged = state_->text.size();
+    state_->text.append(text);
+    state_->resync(unchanged);
+}
+
+void IncrementalParser::backspace(std::size_t count) {
+    const std::string &text = state_->text;
+    std::size_t n = text.size();
+    for (; count > 0 && n > 0; --count) {
+        --n;
+        while (n > 0 && (as_uchar(text[n]) & 0xC0U) == 0x80U) {
+            --n;
+        }
+    }
+    state_->text.resize(n);
+    state_->resync(n);
+}
+
+void IncrementalParser::assign(std::string_view text) {
+    const std::string &old = state_->text;
+    const std::size_t limit = std::min(old.size(), text.size());
+    const auto diff =
+        std::mismatch(old.begin(), old.begin() + static_cast<std::ptrdiff_t>(limit), text.begin());
+    const auto unchanged = static_cast<std::size_t>(diff.first - old.begin());
+    state_->text.assign(text);
+    state_->resync(unchanged);
+}
+
+void IncrementalParser::clear() {
+    state_->text.clear();
+    state_->resync(0);
+}
+
+const std::string &IncrementalParser::text() const noexcept {
+    return state_->text;
+}
+
+const std::vector<Token> &IncrementalParser::tokens() const noexcept {
+    return state_->tokens;
+}
+
+TokenBuffer IncrementalParser::token_buffer() const {
+    TokenBuffer buffer;
+    buffer.source_ = state_->text;
+    for (std::size_t k = 0; k < state_->tokens.size(); ++k) {
+        const auto &checkpoint = state_->checkpoints[k];
+        buffer.push(state_->tokens[k], checkpoint.start, checkpoint.end);
+    }
+    return buffer;
+}
+
+int IncrementalParser::paren_depth() const noexcept {
+    return state_->checkpoints.empty() ? 0 : state_->checkpoints.back().depth;
+}
+
+bool IncrementalParser::complete() const noexcept {
+    const auto &checkpoints = state_->checkpoints;
+    return !checkpoints.empty() && checkpoints.back().valid && !checkpoints.back().expect_operand;
+}
+
+std::vector<Token> IncrementalParser::rpn() const {
+    return state_->rpn();
+}
+
+std::shared_ptr<Program> IncrementalParser::program() const {
+    if (!state_->program) {
+        auto program = std::make_shared<Program>();
+        program->expression_ = state_->text;
+        program->tokens_ = state_->tokens;
+        program->rpn_ = state_->rpn();
+        state_->program = std::move(program);
+    }
+    return state_->program;
 }
 
 } // namespace tcalc::ops
@@ -477,7 +477,7 @@ consteval std::size_t token_table_size() {
     std::size_t n = 0;
     for (const auto &op : kOps) {
         n += 1; // primary symbol
-        for (const auto alias : op.aliases) {
+        for (const auto &alias : op.aliases) {
             if (!alias.empty()) {
                 n += 1;
             }
@@ -491,7 +491,7 @@ consteval auto build_token_table() {
     std::size_t i = 0;
     for (const auto &op : kOps) {
         out[i++] = TokenToSpec{op.symbol, &op};
-        for (const auto alias : op.aliases) {
+        for (const auto &alias : op.aliases) {
             if (!alias.empty()) {
                 out[i++] = TokenToSpec{alias, &op};
             }
@@ -1,26 +1,194 @@
 #pragma once
 
+#include <atomic>
 #include <cstdint>
+#include <memory>
 #include <string>
 #include <string_view>
 #include <vector>
 
 #include "parser/pub/ops.hpp"
 
+namespace tcalc::eval {
+class Plan;
+} // namespace tcalc::eval
+
 namespace tcalc::ops {
 
 using Value = std::string;
 
 enum class TokenKind : std::uint8_t { Number, Op, LParen, RParen };
 
+// Type of a number literal, following the Python numeric tower: an int, a float,
+// an imaginary float, a BigReal (exponent forms and ints past long long) or one
+// of the constants. None marks a token nobody classified yet.
+enum class LiteralKind : std::uint8_t { None, Int, Real, Imag, Big, E, Pi, Invalid };
+
+// Number literal parsed by the tokenizer. Int keeps `integer`; Real and Imag keep
+// `real` (the imaginary part for Imag). Big literals are read from the token text
+// when evaluated, so a Token stays small.
+struct Literal {
+    LiteralKind kind = LiteralKind::None;
+    long long integer = 0;
+    double real = 0.0;
+};
+
+// Classify and parse a number token's text. Never throws; malformed text is Invalid.
+Literal classify_literal(std::string_view text);
+
 struct Token {
     TokenKind kind;
     OpId op_id = OpId::Count;
     Value value{};
+    Literal literal{};
+};
+
+//
+// Slot for the evaluator's optimized form of a Program. The parser never looks
+// inside; tcalc::eval fills it on first evaluation and replaces it when the
+// precision changes. Copies share the plan, and concurrent publishers keep
+// whichever plan landed first. The slot also records the published plan's
+// footprint, which Program::byte_size() adds to its own.
+//
+class PlanSlot {
+  public:
+    PlanSlot() = default;
+    PlanSlot(const PlanSlot &other)
+        : plan_(other.plan_.load()), plan_bytes_(other.plan_bytes_.load()) {}
+    PlanSlot &operator=(const PlanSlot &other) {
+        plan_.store(other.plan_.load());
+        plan_bytes_.store(other.plan_bytes_.load());
+        return *this;
+    }
+
+    std::shared_ptr<const eval::Plan> get() const { return plan_.load(); }
+    std::size_t plan_bytes() const noexcept { return plan_bytes_.load(); }
+
+    // Store `plan`, `plan_bytes` large, if the slot still holds `expected` (empty
+    // by default); returns whichever plan the slot holds afterwards.
+    std::shared_ptr<const eval::Plan>
+    publish(std::shared_ptr<const eval::Plan> plan, std::size_t plan_bytes,
+            std::shared_ptr<const eval::Plan> expected = {}) const {
+        if (plan_.compare_exchange_strong(expected, plan)) {
+            plan_bytes_.store(plan_bytes);
+            return plan;
+        }
+        return expected;
+    }
+
+  private:
+    mutable std::atomic<std::shared_ptr<const eval::Plan>> plan_;
+    mutable std::atomic<std::size_t> plan_bytes_{0};
+};
+
+// Immutable result of compile(): the raw token stream and its RPN, kept in native
+// memory so callers do not round-trip token lists through Python between stages.
+class Program {
+  public:
+    Program() = default;
+
+    const std::string &expression() const noexcept { return expression_; }
+    const std::vector<Token> &tokens() const noexcept { return tokens_; }
+    const std::vector<Token> &rpn() const noexcept { return rpn_; }
+
+    // Approximate native footprint, used for cache byte budgets. Includes the plan
+    // once one has been built, so it grows after the first evaluation.
+    std::size_t byte_size() const noexcept;
+
+    const PlanSlot &plan_slot() const noexcept { return plan_; }
+
+  private:
+    friend Program compile(std::string_view expression);
+    friend class IncrementalParser;
+
+    std::string expression_;
+    std::vector<Token> tokens_;
+    std::vector<Token> rpn_;
+    PlanSlot plan_;
+};
+
+//
+// Struct-of-arrays token stream: parallel kind / op_id / (offset, length) columns
+// with spans into a copy of the source. Nothing is allocated per token; Token
+// objects are only built on request. Offsets and lengths are in UTF-8 bytes.
+//
+class TokenBuffer {
+  public:
+    TokenBuffer() = default;
+
+    const std::string &source() const noexcept { return source_; }
+    std::size_t size() const noexcept { return kinds_.size(); }
+
+    const std::vector<TokenKind> &kinds() const noexcept { return kinds_; }
+    const std::vector<OpId> &op_ids() const noexcept { return op_ids_; }
+    const std::vector<std::uint32_t> &offsets() const noexcept { return offsets_; }
+    const std::vector<std::uint32_t> &lengths() const noexcept { return lengths_; }
+
+    std::string_view text(std::size_t i) const;
+    // Token::value for numbers: the source text, with an "I" suffix spelled "i".
+    std::string value(std::size_t i) const;
+    Token token(std::size_t i) const;
+
+  private:
+    friend TokenBuffer tokenize_buffer(std::string_view expression);
+    friend class IncrementalParser;
+
+    void push(const Token &tok, std::size_t offset, std::size_t end);
+
+    std::string source_;
+    std::vector<TokenKind> kinds_;
+    std::vector<OpId> op_ids_;
+    std::vector<std::uint32_t> offsets_;
+    std::vector<std::uint32_t> lengths_;
 };
 
 std::vector<Token> tokenize(std::string_view expression);
+TokenBuffer tokenize_buffer(std::string_view expression);
 std::vector<Token> normalize(const std::vector<Token> &raw);
 std::vector<Token> shunting_yard(const std::vector<Token> &tokens);
 
+// Tokenize, normalize and convert to RPN in one pass.
+Program compile(std::string_view expression);
+
+//
+// Parser state for keystroke editing. Every raw token keeps a checkpoint of the
+// tokenizer, normalizer and shunting-yard state after it, so an edit only rewinds
+// to the last token the edit cannot affect and rescans the tail. Appending to or
+// backspacing a long expression costs about as much as for a short one.
+//
+class IncrementalParser {
+  public:
+    IncrementalParser();
+    ~IncrementalParser();
+    IncrementalParser(IncrementalParser &&) noexcept;
+    IncrementalParser &operator=(IncrementalParser &&) noexcept;
+
+    void append(std::string_view text);
+    // Remove `count` code points from the end, like str[:-count] in Python.
+    void backspace(std::size_t count = 1);
+    // Replace the whole text; only the part after the common prefix is rescanned.
+    void assign(std::string_view text);
+    void clear();
+
+    const std::string &text() const noexcept;
+    const std::vector<Token> &tokens() const noexcept;
+    TokenBuffer token_buffer() const;
+    int paren_depth() const noexcept;
+
+    // O(1): the token stream is non-empty, ends on an operand and never puts an
+    // operator where an operand is required. Literals are not validated.
+    bool complete() const noexcept;
+
+    std::vector<Token> rpn() const;
+
+    // Snapshot of the current state, reused until the next edit. Building one copies
+    // the tokens and RPN, so callers that preview as the user types should build it
+    // once per burst of edits rather than on every keystroke.
+    std::shared_ptr<Program> program() const;
+
+  private:
+    struct State;
+    std::unique_ptr<State> state_;
+};
+
 } // namespace tcalc::ops
@@ -1,3 +1,4 @@
+#include <pybind11/complex.h>
 #include <pybind11/pybind11.h>
 
 #include <iomanip>
@@ -5,6 +6,7 @@
 
 #include "bindings.hpp"
 #include "calc/pub/calculator.hpp"
+#include "calc/pub/exact_parts.hpp"
 
 namespace py = pybind11;
 
@@ -12,12 +14,21 @@ void bind_bigcomplex(py::module_ &m) {
     using BC = BigComplex;
     using BF = boost::multiprecision::cpp_bin_float_50;
 
-    py::class_<BC>(m, "BigComplex")
-        .def(py::init<>())
+    py::class_<BC> cls(m, "BigComplex");
+    cls.def(py::init<>())
+        .def(py::init([](const BigReal &real) { return BC(to_bin_float(exact_parts(real))); }),
+             py::arg("real"))
         .def(py::init<double>(), py::arg("real"))
         .def(py::init<double, double>(), py::arg("real"), py::arg("imag"))
         .def(py::init<const std::string &>(), py::arg("real"))
         .def(py::init<const std::string &, const std::string &>(), py::arg("real"), py::arg("imag"))
+        .def_static(
+            "from_complex",
+            [](const Calculator::Complex &z) {
+                return BC(to_bin_float(decimal_parts(z.real())),
+                          to_bin_float(decimal_parts(z.imag())));
+            },
+            py::arg("z"), "Each part as the decimal it prints as, like BigReal.from_float.")
         .def("__str__",
              [](const BC &v) {
                  std::ostringstream oss;
@@ -41,4 +52,5 @@ void bind_bigcomplex(py::module_ &m) {
             oss << std::setprecision(16) << im << "i";
             return std::string("BigComplex(\"") + oss.str() + "\")";
         });
+    def_number_protocol(cls);
 }
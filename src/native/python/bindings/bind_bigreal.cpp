@@ -8,15 +8,20 @@
 
 #include "bindings.hpp"
 #include "calc/pub/calculator.hpp"
+#include "calc/pub/exact_parts.hpp"
 
 namespace py = pybind11;
 
 void bind_bigreal(py::module_ &m) {
     using B = BigReal;
 
-    py::class_<B>(m, "BigReal")
+    py::class_<B> cls(m, "BigReal");
+    cls.def(py::init([](const py::int_ &n) { return to_big_real(to_big_int(n)); }))
         .def(py::init<double>())
         .def(py::init<const std::string &>())
+        .def_static(
+            "from_float", [](double x) { return to_big_real(decimal_parts(x)); }, py::arg("x"),
+            "The decimal x prints as, so from_float(0.1) == BigReal(\"0.1\").")
         .def("__str__",
              [](const B &v) {
                  std::ostringstream oss;
@@ -28,4 +33,5 @@ void bind_bigreal(py::module_ &m) {
             oss << std::setprecision(16) << v;
             return std::string("BigReal(\"") + oss.str() + "\")";
         });
+    def_number_protocol(cls);
 }
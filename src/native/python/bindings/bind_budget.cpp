@@ -0,0 +1,19 @@
+#include <pybind11/pybind11.h>
+
+#include "bindings.hpp"
+#include "calc/pub/budget.hpp"
+
+namespace py = pybind11;
+
+void bind_budget(py::module_ &m) {
+    py::class_<CancelToken>(m, "CancelToken",
+                            "Cancel flag for evaluations started with cancel=token. cancel() may "
+                            "be called from any thread; running kernels stop with "
+                            "CalculatorError('Cancelled') shortly after.")
+        .def(py::init<>())
+        .def("cancel", &CancelToken::cancel)
+        .def_property_readonly("cancelled", &CancelToken::cancelled)
+        .def("__repr__", [](const CancelToken &t) {
+            return std::string("CancelToken(cancelled=") + (t.cancelled() ? "True" : "False") + ")";
+        });
+}
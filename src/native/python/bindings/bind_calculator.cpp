@@ -1,13 +1,144 @@
 #include <pybind11/complex.h>
 #include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
 
+#include <algorithm>
+#include <array>
 #include <cmath>
+#include <cstdint>
+#include <iterator>
+#include <optional>
+#include <string>
+#include <string_view>
+#include <utility>
+#include <vector>
 
 #include "bindings.hpp"
 #include "calc/pub/calculator.hpp"
+#include "eval/pub/evaluator.hpp"
 
 namespace py = pybind11;
 
+namespace {
+
+using tcalc::ops::OpId;
+
+// Double overloads that can overflow share the evaluator's range handling: the
+// result is a float, or a BigReal when it left double's range.
+template <typename Arg>
+tcalc::eval::Number real_op(const Calculator &calc, OpId id, double a, Arg b) {
+    return tcalc::eval::apply(calc, id, a, b, Calculator::AngleUnit::RAD);
+}
+
+OpId to_op_id(py::handle value) {
+    std::size_t index = tcalc::ops::kOpsById.size();
+    if (PyLong_Check(value.ptr())) {
+        const long long raw = PyLong_AsLongLong(value.ptr());
+        if (raw == -1 && PyErr_Occurred() != nullptr) {
+            throw py::error_already_set();
+        }
+        if (raw >= 0) {
+            index = static_cast<std::size_t>(raw);
+        }
+    } else {
+        index = static_cast<std::size_t>(value.cast<OpId>());
+    }
+    if (index >= tcalc::ops::kOpsById.size() || tcalc::ops::kOpsById[index] == nullptr) {
+        throw py::value_error("unknown op_id " + py::repr(value).cast<std::string>());
+    }
+    return static_cast<OpId>(index);
+}
+
+tcalc::eval::Number to_operand(py::handle value, std::string_view name) {
+    std::optional<tcalc::eval::Number> operand = to_number(value);
+    if (!operand) {
+        throw py::type_error("apply(): unsupported type for " + std::string(name) + ": " +
+                             std::string(py::str(py::type::handle_of(value).attr("__name__"))));
+    }
+    return std::move(*operand);
+}
+
+// Calculator.apply(op_id, a, b=None, unit=None). It is a METH_FASTCALL method, so
+// CPython calls it through vectorcall: no argument tuple, no pybind11 overload
+// resolution, and one switch on the operand types inside eval::apply instead of
+// trying each typed overload in turn.
+PyObject *calculator_apply(PyObject *self, PyObject *const *args, Py_ssize_t nargs,
+                           PyObject *kwnames) {
+    static constexpr std::array<std::string_view, 4> kParams{"op_id", "a", "b", "unit"};
+    try {
+        std::array<PyObject *, kParams.size()> params{};
+        if (nargs > static_cast<Py_ssize_t>(params.size())) {
+            throw py::type_error("apply() takes at most 4 arguments");
+        }
+        std::copy(args, args + nargs, params.begin());
+        const Py_ssize_t nkw = kwnames == nullptr ? 0 : PyTuple_GET_SIZE(kwnames);
+        for (Py_ssize_t k = 0; k < nkw; ++k) {
+            Py_ssize_t size = 0;
+            const char *utf8 = PyUnicode_AsUTF8AndSize(PyTuple_GET_ITEM(kwnames, k), &size);
+            if (utf8 == nullptr) {
+                throw py::error_already_set();
+            }
+            const std::string_view name(utf8, static_cast<std::size_t>(size));
+            const auto *it = std::find(kParams.begin(), kParams.end(), name);
+            if (it == kParams.end()) {
+                throw py::type_error("apply() got an unexpected keyword argument '" +
+                                     std::string(name) + "'");
+            }
+            PyObject *&param = params[static_cast<std::size_t>(it - kParams.begin())];
+            if (param != nullptr) {
+                throw py::type_error("apply() got multiple values for argument '" +
+                                     std::string(name) + "'");
+            }
+            param = args[nargs + k];
+        }
+        const auto given = [&](std::size_t i) {
+            return params[i] != nullptr && params[i] != Py_None;
+        };
+        if (params[0] == nullptr || params[1] == nullptr) {
+            throw py::type_error("apply() missing required argument 'op_id' or 'a'");
+        }
+
+        const Calculator &calc = py::handle(self).cast<const Calculator &>();
+        const OpId id = to_op_id(params[0]);
+        const tcalc::ops::OpSpec &spec = *tcalc::ops::op_spec(id);
+        const bool binary = spec.arity == tcalc::ops::Arity::Binary;
+        if (binary != given(2)) {
+            throw py::type_error(binary ? "apply(): binary op requires b"
+                                        : "apply(): b is only accepted by binary ops");
+        }
+        const bool needs_unit = tcalc::ops::needs_angle_unit(spec);
+        if (needs_unit && !given(3)) {
+            throw py::type_error("apply(): op requires unit");
+        }
+
+        const auto a = to_operand(params[1], "a");
+        const auto b = binary ? to_operand(params[2], "b") : tcalc::eval::Number{};
+        const auto unit = needs_unit ? py::handle(params[3]).cast<Calculator::AngleUnit>()
+                                     : Calculator::AngleUnit::RAD;
+        tcalc::eval::Number result;
+        {
+            py::gil_scoped_release release;
+            result = tcalc::eval::apply(calc, id, a, b, unit);
+        }
+        return py::cast(std::move(result)).release().ptr();
+    } catch (...) {
+        py::detail::try_translate_exceptions();
+        return nullptr;
+    }
+}
+
+PyMethodDef apply_method{
+    "apply", reinterpret_cast<PyCFunction>(reinterpret_cast<void (*)()>(&calculator_apply)),
+    METH_FASTCALL | METH_KEYWORDS,
+    "apply($self, op_id, a, b=None, unit=None)\n--\n\n"
+    "Apply one operation with the engine's promotion and coercion rules: b is required "
+    "for binary ops and unit for ops that take an angle unit. Operands are int, float, "
+    "complex, BigReal or BigComplex; results keep the type the kernel produced, and "
+    "values past double's range come back as BigReal. The GIL is released while the "
+    "kernel runs."};
+
+} // namespace
+
 void bind_calculator(py::module_ &m) {
     using C = Calculator;
     using Z = Calculator::Complex;
@@ -15,176 +146,219 @@ void bind_calculator(py::module_ &m) {
     using BC = BigComplex;
     using U = Calculator::AngleUnit;
 
+    m.def(
+        "precision_tiers",
+        [] {
+            return std::vector<unsigned>{
+                digits10(Precision::Digits20), digits10(Precision::Digits50),
+                digits10(Precision::Digits100), digits10(Precision::Digits500)};
+        },
+        "Supported working precisions, in decimal digits.");
+    m.def(
+        "get_precision", [] { return digits10(default_precision()); },
+        "Working precision (digits) of BigReal kernels for calculators without their own.");
+    m.def(
+        "set_precision", [](unsigned digits) { set_default_precision(to_precision(digits)); },
+        py::arg("digits"),
+        "Set the default working precision to one of precision_tiers(). Compiled programs "
+        "re-fold their constants at the new precision on their next evaluation.");
+
     py::class_<C> cls(m, "Calculator");
-    cls.def(py::init<>());
+    cls.def(py::init([](std::optional<unsigned> digits) {
+                C calc;
+                if (digits) {
+                    calc.set_precision(to_precision(*digits));
+                }
+                return calc;
+            }),
+            py::arg("precision") = py::none());
+    cls.def_property(
+        "precision", [](const C &calc) { return digits10(calc.precision()); },
+        [](C &calc, std::optional<unsigned> digits) {
+            calc.set_precision(digits ? std::optional(to_precision(*digits)) : std::nullopt);
+        },
+        "Working precision in digits; None follows get_precision().");
 
-    cls.def("add", py::overload_cast<double, double>(&C::add, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("add", py::overload_cast<Z, Z>(&C::add, py::const_), py::arg("a"), py::arg("b"));
-    cls.def("add", py::overload_cast<const B &, const B &>(&C::add, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("add", py::overload_cast<const BC &, const BC &>(&C::add, py::const_), py::arg("a"),
-            py::arg("b"));
+    // Kernels run without the GIL; operands are converted before it is released
+    // and the result after it is reacquired.
+    const py::call_guard<py::gil_scoped_release> nogil;
 
-    cls.def("sub", py::overload_cast<double, double>(&C::sub, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("sub", py::overload_cast<Z, Z>(&C::sub, py::const_), py::arg("a"), py::arg("b"));
-    cls.def("sub", py::overload_cast<const B &, const B &>(&C::sub, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("sub", py::overload_cast<const BC &, const BC &>(&C::sub, py::const_), py::arg("a"),
-            py::arg("b"));
+    cls.def(
+        "add", [](const C &calc, double a, double b) { return real_op(calc, OpId::Add, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
+    cls.def("add", py::overload_cast<Z, Z>(&C::add, py::const_), nogil, py::arg("a"), py::arg("b"));
+    cls.def("add", py::overload_cast<const B &, const B &>(&C::add, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("add", py::overload_cast<const BC &, const BC &>(&C::add, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
     cls.def(
-        "mul",
-        [](const C &calc, double a, double b) -> py::object {
-            const double r = calc.mul(a, b);
-            return promote_inf_to_big(r, [&] { return calc.mul(B(a), B(b)); });
-        },
-        py::arg("a"), py::arg("b"));
-    cls.def("mul", py::overload_cast<Z, Z>(&C::mul, py::const_), py::arg("a"), py::arg("b"));
-    cls.def("mul", py::overload_cast<const B &, const B &>(&C::mul, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("mul", py::overload_cast<const BC &, const BC &>(&C::mul, py::const_), py::arg("a"),
-            py::arg("b"));
+        "sub", [](const C &calc, double a, double b) { return real_op(calc, OpId::Sub, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
+    cls.def("sub", py::overload_cast<Z, Z>(&C::sub, py::const_), nogil, py::arg("a"), py::arg("b"));
+    cls.def("sub", py::overload_cast<const B &, const B &>(&C::sub, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("sub", py::overload_cast<const BC &, const BC &>(&C::sub, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
     cls.def(
-        "div",
-        [](const C &calc, double a, double b) -> py::object {
-            const double r = calc.div(a, b);
-            return promote_inf_to_big(r, [&] { return calc.div(B(a), B(b)); });
-        },
-        py::arg("a"), py::arg("b"));
-    cls.def("div", py::overload_cast<Z, Z>(&C::div, py::const_), py::arg("a"), py::arg("b"));
-    cls.def("div", py::overload_cast<const B &, const B &>(&C::div, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("div", py::overload_cast<const BC &, const BC &>(&C::div, py::const_), py::arg("a"),
-            py::arg("b"));
+        "mul", [](const C &calc, double a, double b) { return real_op(calc, OpId::Mul, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
+    cls.def("mul", py::overload_cast<Z, Z>(&C::mul, py::const_), nogil, py::arg("a"), py::arg("b"));
+    cls.def("mul", py::overload_cast<const B &, const B &>(&C::mul, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("mul", py::overload_cast<const BC &, const BC &>(&C::mul, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
-    cls.def("intdiv", py::overload_cast<double, double>(&C::intdiv, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("intdiv", py::overload_cast<const B &, const B &>(&C::intdiv, py::const_), py::arg("a"),
-            py::arg("b"));
+    cls.def(
+        "div", [](const C &calc, double a, double b) { return real_op(calc, OpId::Div, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
+    cls.def("div", py::overload_cast<Z, Z>(&C::div, py::const_), nogil, py::arg("a"), py::arg("b"));
+    cls.def("div", py::overload_cast<const B &, const B &>(&C::div, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("div", py::overload_cast<const BC &, const BC &>(&C::div, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
-    cls.def("mod", py::overload_cast<double, double>(&C::mod, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("mod", py::overload_cast<const B &, const B &>(&C::mod, py::const_), py::arg("a"),
+    cls.def("intdiv", py::overload_cast<double, double>(&C::intdiv, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("intdiv", py::overload_cast<const B &, const B &>(&C::intdiv, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+
+    cls.def("mod", py::overload_cast<double, double>(&C::mod, py::const_), nogil, py::arg("a"),
             py::arg("b"));
+    cls.def("mod", py::overload_cast<const B &, const B &>(&C::mod, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
     cls.def(
-        "pow",
-        [](const C &calc, double a, long long b) -> py::object {
-            const double r = calc.pow(a, b);
-            return promote_inf_to_big(r, [&] { return calc.pow(B(a), B(b)); });
-        },
-        py::arg("a"), py::arg("b"));
+        "pow", [](const C &calc, double a, long long b) { return real_op(calc, OpId::Pow, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
 
     cls.def(
-        "pow",
-        [](const C &calc, double a, double b) -> py::object {
-            const double r = calc.pow(a, b);
-            return promote_inf_to_big(r, [&] { return calc.pow(B(a), B(b)); });
-        },
-        py::arg("a"), py::arg("b"));
-    cls.def("pow", py::overload_cast<Z, Z>(&C::pow, py::const_), py::arg("a"), py::arg("b"));
+        "pow", [](const C &calc, double a, double b) { return real_op(calc, OpId::Pow, a, b); },
+        nogil, py::arg("a"), py::arg("b"));
+    cls.def("pow", py::overload_cast<Z, Z>(&C::pow, py::const_), nogil, py::arg("a"), py::arg("b"));
 
-    cls.def("pow", py::overload_cast<const B &, const B &>(&C::pow, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("pow", py::overload_cast<const BC &, const BC &>(&C::pow, py::const_), py::arg("a"),
-            py::arg("b"));
+    cls.def("pow", py::overload_cast<const B &, const B &>(&C::pow, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("pow", py::overload_cast<const BC &, const BC &>(&C::pow, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
-    cls.def("sqrt", py::overload_cast<double>(&C::sqrt, py::const_), py::arg("a"));
-    cls.def("sqrt", py::overload_cast<Z>(&C::sqrt, py::const_), py::arg("a"));
-    cls.def("sqrt", py::overload_cast<const B &>(&C::sqrt, py::const_), py::arg("a"));
-    cls.def("sqrt", py::overload_cast<const BC &>(&C::sqrt, py::const_), py::arg("a"));
+    cls.def("sqrt", py::overload_cast<double>(&C::sqrt, py::const_), nogil, py::arg("a"));
+    cls.def("sqrt", py::overload_cast<Z>(&C::sqrt, py::const_), nogil, py::arg("a"));
+    cls.def("sqrt", py::overload_cast<const B &>(&C::sqrt, py::const_), nogil, py::arg("a"));
+    cls.def("sqrt", py::overload_cast<const BC &>(&C::sqrt, py::const_), nogil, py::arg("a"));
 
-    cls.def("cbrt", py::overload_cast<double>(&C::cbrt, py::const_), py::arg("a"));
-    cls.def("root", py::overload_cast<double, double>(&C::root, py::const_), py::arg("a"),
+    cls.def("cbrt", py::overload_cast<double>(&C::cbrt, py::const_), nogil, py::arg("a"));
+    cls.def("root", py::overload_cast<double, double>(&C::root, py::const_), nogil, py::arg("a"),
             py::arg("b"));
 
-    cls.def("root", py::overload_cast<Z, Z>(&C::root, py::const_), py::arg("a"), py::arg("b"));
-    cls.def("root", py::overload_cast<const B &, const B &>(&C::root, py::const_), py::arg("a"),
-            py::arg("b"));
-    cls.def("root", py::overload_cast<const BC &, const BC &>(&C::root, py::const_), py::arg("a"),
+    cls.def("root", py::overload_cast<Z, Z>(&C::root, py::const_), nogil, py::arg("a"),
             py::arg("b"));
+    cls.def("root", py::overload_cast<const B &, const B &>(&C::root, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
+    cls.def("root", py::overload_cast<const BC &, const BC &>(&C::root, py::const_), nogil,
+            py::arg("a"), py::arg("b"));
 
-    cls.def("sin", py::overload_cast<double, U>(&C::sin, py::const_), py::arg("a"),
+    cls.def("sin", py::overload_cast<double, U>(&C::sin, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("sin", py::overload_cast<Z, U>(&C::sin, py::const_), py::arg("a"), py::arg("unit"));
-    cls.def("sin", py::overload_cast<const B &, U>(&C::sin, py::const_), py::arg("a"),
+    cls.def("sin", py::overload_cast<Z, U>(&C::sin, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("sin", py::overload_cast<const BC &, U>(&C::sin, py::const_), py::arg("a"),
+    cls.def("sin", py::overload_cast<const B &, U>(&C::sin, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("cos", py::overload_cast<double, U>(&C::cos, py::const_), py::arg("a"),
+    cls.def("sin", py::overload_cast<const BC &, U>(&C::sin, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("cos", py::overload_cast<Z, U>(&C::cos, py::const_), py::arg("a"), py::arg("unit"));
-    cls.def("cos", py::overload_cast<const B &, U>(&C::cos, py::const_), py::arg("a"),
+    cls.def("cos", py::overload_cast<double, U>(&C::cos, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("cos", py::overload_cast<const BC &, U>(&C::cos, py::const_), py::arg("a"),
+    cls.def("cos", py::overload_cast<Z, U>(&C::cos, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("tan", py::overload_cast<double, U>(&C::tan, py::const_), py::arg("a"),
+    cls.def("cos", py::overload_cast<const B &, U>(&C::cos, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("tan", py::overload_cast<Z, U>(&C::tan, py::const_), py::arg("a"), py::arg("unit"));
-    cls.def("tan", py::overload_cast<const B &, U>(&C::tan, py::const_), py::arg("a"),
+    cls.def("cos", py::overload_cast<const BC &, U>(&C::cos, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("tan", py::overload_cast<const BC &, U>(&C::tan, py::const_), py::arg("a"),
+    cls.def("tan", py::overload_cast<double, U>(&C::tan, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("tan", py::overload_cast<Z, U>(&C::tan, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("tan", py::overload_cast<const B &, U>(&C::tan, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("tan", py::overload_cast<const BC &, U>(&C::tan, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
 
-    cls.def("sinh", py::overload_cast<double>(&C::sinh, py::const_), py::arg("a"));
-    cls.def("sinh", py::overload_cast<Z>(&C::sinh, py::const_), py::arg("a"));
-    cls.def("cosh", py::overload_cast<double>(&C::cosh, py::const_), py::arg("a"));
-    cls.def("cosh", py::overload_cast<Z>(&C::cosh, py::const_), py::arg("a"));
-    cls.def("tanh", py::overload_cast<double>(&C::tanh, py::const_), py::arg("a"));
-    cls.def("tanh", py::overload_cast<Z>(&C::tanh, py::const_), py::arg("a"));
+    cls.def("sinh", py::overload_cast<double>(&C::sinh, py::const_), nogil, py::arg("a"));
+    cls.def("sinh", py::overload_cast<Z>(&C::sinh, py::const_), nogil, py::arg("a"));
+    cls.def("cosh", py::overload_cast<double>(&C::cosh, py::const_), nogil, py::arg("a"));
+    cls.def("cosh", py::overload_cast<Z>(&C::cosh, py::const_), nogil, py::arg("a"));
+    cls.def("tanh", py::overload_cast<double>(&C::tanh, py::const_), nogil, py::arg("a"));
+    cls.def("tanh", py::overload_cast<Z>(&C::tanh, py::const_), nogil, py::arg("a"));
 
-    cls.def("asin", py::overload_cast<double, U>(&C::asin, py::const_), py::arg("a"),
+    cls.def("asin", py::overload_cast<double, U>(&C::asin, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("asin", py::overload_cast<Z, U>(&C::asin, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("asin", py::overload_cast<Z, U>(&C::asin, py::const_), py::arg("a"), py::arg("unit"));
-    cls.def("acos", py::overload_cast<double, U>(&C::acos, py::const_), py::arg("a"),
+    cls.def("acos", py::overload_cast<double, U>(&C::acos, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("acos", py::overload_cast<Z, U>(&C::acos, py::const_), py::arg("a"), py::arg("unit"));
-    cls.def("atan", py::overload_cast<double, U>(&C::atan, py::const_), py::arg("a"),
+    cls.def("acos", py::overload_cast<Z, U>(&C::acos, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("atan", py::overload_cast<double, U>(&C::atan, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("atan", py::overload_cast<Z, U>(&C::atan, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("atan", py::overload_cast<Z, U>(&C::atan, py::const_), py::arg("a"), py::arg("unit"));
 
-    cls.def("asinh", py::overload_cast<double>(&C::asinh, py::const_), py::arg("a"));
-    cls.def("asinh", py::overload_cast<Z>(&C::asinh, py::const_), py::arg("a"));
-    cls.def("acosh", py::overload_cast<double>(&C::acosh, py::const_), py::arg("a"));
-    cls.def("acosh", py::overload_cast<Z>(&C::acosh, py::const_), py::arg("a"));
-    cls.def("atanh", py::overload_cast<double>(&C::atanh, py::const_), py::arg("a"));
-    cls.def("atanh", py::overload_cast<Z>(&C::atanh, py::const_), py::arg("a"));
+    cls.def("asinh", py::overload_cast<double>(&C::asinh, py::const_), nogil, py::arg("a"));
+    cls.def("asinh", py::overload_cast<Z>(&C::asinh, py::const_), nogil, py::arg("a"));
+    cls.def("acosh", py::overload_cast<double>(&C::acosh, py::const_), nogil, py::arg("a"));
+    cls.def("acosh", py::overload_cast<Z>(&C::acosh, py::const_), nogil, py::arg("a"));
+    cls.def("atanh", py::overload_cast<double>(&C::atanh, py::const_), nogil, py::arg("a"));
+    cls.def("atanh", py::overload_cast<Z>(&C::atanh, py::const_), nogil, py::arg("a"));
 
-    cls.def("polar", py::overload_cast<double, U>(&C::polar, py::const_), py::arg("a"),
+    cls.def("polar", py::overload_cast<double, U>(&C::polar, py::const_), nogil, py::arg("a"),
+            py::arg("unit"));
+    cls.def("polar", py::overload_cast<Z, U>(&C::polar, py::const_), nogil, py::arg("a"),
             py::arg("unit"));
-    cls.def("polar", py::overload_cast<Z, U>(&C::polar, py::const_), py::arg("a"), py::arg("unit"));
 
-    cls.def("log", py::overload_cast<double>(&C::log, py::const_), py::arg("a"));
-    cls.def("log", py::overload_cast<Z>(&C::log, py::const_), py::arg("a"));
-    cls.def("log", py::overload_cast<const B &>(&C::log, py::const_), py::arg("a"));
-    cls.def("log", py::overload_cast<const BC &>(&C::log, py::const_), py::arg("a"));
+    cls.def("log", py::overload_cast<double>(&C::log, py::const_), nogil, py::arg("a"));
+    cls.def("log", py::overload_cast<Z>(&C::log, py::const_), nogil, py::arg("a"));
+    cls.def("log", py::overload_cast<const B &>(&C::log, py::const_), nogil, py::arg("a"));
+    cls.def("log", py::overload_cast<const BC &>(&C::log, py::const_), nogil, py::arg("a"));
 
-    cls.def("ln", py::overload_cast<double>(&C::ln, py::const_), py::arg("a"));
-    cls.def("ln", py::overload_cast<Z>(&C::ln, py::const_), py::arg("a"));
-    cls.def("ln", py::overload_cast<const B &>(&C::ln, py::const_), py::arg("a"));
-    cls.def("ln", py::overload_cast<const BC &>(&C::ln, py::const_), py::arg("a"));
+    cls.def("ln", py::overload_cast<double>(&C::ln, py::const_), nogil, py::arg("a"));
+    cls.def("ln", py::overload_cast<Z>(&C::ln, py::const_), nogil, py::arg("a"));
+    cls.def("ln", py::overload_cast<const B &>(&C::ln, py::const_), nogil, py::arg("a"));
+    cls.def("ln", py::overload_cast<const BC &>(&C::ln, py::const_), nogil, py::arg("a"));
 
     cls.def(
-        "fact",
-        [](const C &calc, double a) -> py::object {
-            const double r = calc.fact(a);
-            return promote_inf_to_big(r, [&] { return calc.fact(B(a)); });
-        },
+        "fact", [](const C &calc, double a) { return real_op(calc, OpId::Fact, a, 0.0); }, nogil,
         py::arg("a"));
-    cls.def("fact", py::overload_cast<const B &>(&C::fact, py::const_), py::arg("a"));
+    cls.def("fact", py::overload_cast<const B &>(&C::fact, py::const_), nogil, py::arg("a"));
 
     cls.def(
-        "gamma",
-        [](const C &calc, double a) -> py::object {
-            const double r = calc.gamma(a);
-            return promote_inf_to_big(r, [&] { return calc.gamma(B(a)); });
-        },
+        "gamma", [](const C &calc, double a) { return real_op(calc, OpId::Gamma, a, 0.0); }, nogil,
         py::arg("a"));
-    cls.def("gamma", py::overload_cast<const B &>(&C::gamma, py::const_), py::arg("a"));
+    cls.def("gamma", py::overload_cast<const B &>(&C::gamma, py::const_), nogil, py::arg("a"));
+
+    cls.def(
+        "factorial",
+        [](const C &calc, std::uint64_t n) {
+            BigInt exact;
+            {
+                py::gil_scoped_release release;
+                exact = calc.factorial(n);
+            }
+            // Hand the digits over as bytes; int.from_bytes is linear, int(str) is not.
+            std::vector<unsigned char> bytes;
+            boost::multiprecision::export_bits(exact, std::back_inserter(bytes), 8);
+            const py::bytes data(reinterpret_cast<const char *>(bytes.data()), bytes.size());
+            return py::module_::import("builtins").attr("int").attr("from_bytes")(data, "big");
+        },
+        py::arg("n"), "Exact n! as a Python int, for n up to 1000000. The GIL is released.");
+
+    cls.def("permute", &C::permute, nogil, py::arg("n"), py::arg("r"));
+    cls.def("choose", &C::choose, nogil, py::arg("n"), py::arg("r"));
 
-    cls.def("permute", &C::permute, py::arg("n"), py::arg("r"));
-    cls.def("choose", &C::choose, py::arg("n"), py::arg("r"));
+    const auto apply = py::reinterpret_steal<py::object>(
+        PyDescr_NewMethod(reinterpret_cast<PyTypeObject *>(cls.ptr()), &apply_method));
+    if (!apply) {
+        throw py::error_already_set();
+    }
+    py::setattr(cls, "apply", apply);
 }
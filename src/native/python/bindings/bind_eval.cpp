@@ -0,0 +1,124 @@
+#include <pybind11/complex.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <cstdint>
+#include <optional>
+#include <span>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "bindings.hpp"
+#include "eval/pub/array.hpp"
+#include "eval/pub/batch.hpp"
+#include "eval/pub/evaluator.hpp"
+
+namespace py = pybind11;
+
+namespace {
+
+using Complex = tcalc::eval::Complex;
+
+// Hand a result vector to NumPy without copying; the capsule owns the storage.
+template <typename T>
+py::array adopt(std::vector<T> &&values, const py::dtype &dtype, const py::object &shape) {
+    auto *owned = new std::vector<T>(std::move(values));
+    const py::capsule base(owned, [](void *p) { delete static_cast<std::vector<T> *>(p); });
+    const py::array flat(dtype, {owned->size()}, {sizeof(T)}, owned->data(), base);
+    return flat.attr("reshape")(shape);
+}
+
+py::tuple evaluate_array(const tcalc::ops::Program &program, const std::string &variable,
+                         const py::array &values, Calculator::AngleUnit unit,
+                         std::optional<double> timeout, std::optional<std::uint64_t> max_ops,
+                         std::optional<CancelToken> cancel, std::optional<unsigned> digits) {
+    constexpr int kFlags = py::array::c_style | py::array::forcecast;
+    const Limits limits = make_limits(timeout, max_ops, std::move(cancel));
+    const Precision precision = to_precision(digits);
+    tcalc::eval::ArrayResult result;
+
+    // Contiguous float64/complex128 input is read in place; other dtypes and
+    // strided views are converted once.
+    if (values.dtype().kind() == 'c') {
+        const auto input = py::array_t<Complex, kFlags>::ensure(values);
+        if (!input) {
+            throw py::error_already_set();
+        }
+        const std::span<const Complex> span(input.data(), static_cast<std::size_t>(input.size()));
+        py::gil_scoped_release release;
+        result = tcalc::eval::evaluate_array(program, variable, span, unit, limits, precision);
+    } else {
+        const auto input = py::array_t<double, kFlags>::ensure(values);
+        if (!input) {
+            throw py::error_already_set();
+        }
+        const std::span<const double> span(input.data(), static_cast<std::size_t>(input.size()));
+        py::gil_scoped_release release;
+        result = tcalc::eval::evaluate_array(program, variable, span, unit, limits, precision);
+    }
+
+    const py::object shape = values.attr("shape");
+    py::array out = result.is_complex
+                        ? adopt(std::move(result.complex), py::dtype::of<Complex>(), shape)
+                        : adopt(std::move(result.real), py::dtype::of<double>(), shape);
+    py::array mask = adopt(std::move(result.errors), py::dtype("bool"), shape);
+    return py::make_tuple(std::move(out), std::move(mask));
+}
+
+} // namespace
+
+void bind_eval(py::module_ &m) {
+    using tcalc::eval::ErrorKind;
+
+    py::enum_<ErrorKind>(m, "ErrorKind", "Evaluation error category; Ok means success.")
+        .value("Ok", ErrorKind::Ok)
+        .value("Invalid", ErrorKind::Invalid)
+        .value("Malformed", ErrorKind::Malformed)
+        .value("MathErr", ErrorKind::MathErr)
+        .value("Timeout", ErrorKind::Timeout)
+        .value("Cancelled", ErrorKind::Cancelled);
+
+    m.def(
+        "evaluate_many",
+        [](const std::vector<std::string> &expressions, Calculator::AngleUnit unit,
+           unsigned workers, std::optional<double> timeout, std::optional<std::uint64_t> max_ops,
+           std::optional<CancelToken> cancel, std::optional<unsigned> digits) {
+            const Limits limits = make_limits(timeout, max_ops, std::move(cancel));
+            const Precision precision = to_precision(digits);
+            tcalc::eval::BatchResult batch;
+            {
+                py::gil_scoped_release release;
+                batch = tcalc::eval::evaluate_many(expressions, unit, workers, limits, precision);
+            }
+
+            py::list values(expressions.size());
+            std::string errors(expressions.size(), '\0');
+            for (std::size_t i = 0; i < expressions.size(); ++i) {
+                errors[i] = static_cast<char>(batch.errors[i]);
+                values[i] = batch.errors[i] == ErrorKind::Ok ? py::cast(std::move(batch.values[i]))
+                                                             : py::none();
+            }
+            return py::make_tuple(std::move(values), py::bytes(errors));
+        },
+        py::arg("expressions"), py::arg("angle_unit"), py::arg("workers") = 0, py::kw_only(),
+        py::arg("timeout") = py::none(), py::arg("max_ops") = py::none(),
+        py::arg("cancel") = py::none(), py::arg("precision") = py::none(),
+        "Compile and evaluate expressions on native threads with the GIL released. Returns "
+        "(values, errors): values[i] is None on failure and errors is a bytes object of "
+        "ErrorKind codes, both in input order. timeout (seconds) and max_ops limit each item "
+        "on its own; cancelling the token stops every remaining item. precision (digits) "
+        "defaults to get_precision().");
+
+    m.def("evaluate_array", &evaluate_array, py::arg("program"), py::arg("variable"),
+          py::arg("values"), py::arg("angle_unit"), py::kw_only(), py::arg("timeout") = py::none(),
+          py::arg("max_ops") = py::none(), py::arg("cancel") = py::none(),
+          py::arg("precision") = py::none(),
+          "Evaluate a compiled program once per element of a float64 or complex128 array, "
+          "with `variable` bound to the element. Runs without the GIL and returns (values, "
+          "errors): a float64 array, or complex128 when any result is complex, and a bool mask "
+          "of failed elements (their values are NaN). Both have the input's shape. timeout "
+          "(seconds), max_ops and cancel limit the whole array and raise CalculatorError when "
+          "they run out; precision (digits) defaults to get_precision().");
+}
@@ -0,0 +1,297 @@
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <array>
+#include <compare>
+#include <limits>
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "bindings.hpp"
+#include "calc/pub/calculator.hpp"
+#include "calc/pub/exact_parts.hpp"
+#include "eval/pub/evaluator.hpp"
+
+namespace py = pybind11;
+
+// Ints past long long travel as little-endian bytes, never as text.
+BigInt to_big_int(py::handle value) {
+    int overflow = 0;
+    const long long small = PyLong_AsLongLongAndOverflow(value.ptr(), &overflow);
+    if (overflow == 0) {
+        if (small == -1 && PyErr_Occurred() != nullptr) {
+            throw py::error_already_set();
+        }
+        return BigInt(small);
+    }
+    const auto magnitude = py::reinterpret_steal<py::object>(PyNumber_Absolute(value.ptr()));
+    const auto bits = magnitude.attr("bit_length")().cast<std::size_t>();
+    const auto bytes = magnitude.attr("to_bytes")((bits + 7) / 8, "little").cast<std::string>();
+    BigInt result;
+    const auto *data = reinterpret_cast<const unsigned char *>(bytes.data());
+    boost::multiprecision::import_bits(result, data, data + bytes.size(), 8, false);
+    return overflow < 0 ? BigInt(-result) : result;
+}
+
+std::optional<tcalc::eval::Number> to_number(py::handle value) {
+    using tcalc::eval::Number;
+    if (PyFloat_Check(value.ptr())) {
+        return Number(PyFloat_AS_DOUBLE(value.ptr()));
+    }
+    if (PyLong_Check(value.ptr())) {
+        int overflow = 0;
+        const long long small = PyLong_AsLongLongAndOverflow(value.ptr(), &overflow);
+        if (overflow == 0) {
+            if (small == -1 && PyErr_Occurred() != nullptr) {
+                throw py::error_already_set();
+            }
+            return Number(small);
+        }
+        return Number(to_big_real(to_big_int(value)));
+    }
+    if (PyComplex_Check(value.ptr())) {
+        return Number(value.cast<Calculator::Complex>());
+    }
+    if (py::isinstance<BigReal>(value)) {
+        return Number(value.cast<const BigReal &>());
+    }
+    if (py::isinstance<BigComplex>(value)) {
+        return Number(value.cast<const BigComplex &>());
+    }
+    return std::nullopt;
+}
+
+namespace {
+
+using BF = boost::multiprecision::cpp_bin_float_50;
+using tcalc::eval::Number;
+using tcalc::ops::OpId;
+
+py::object to_py_int(const BigInt &value) {
+    if (value >= std::numeric_limits<long long>::min() &&
+        value <= std::numeric_limits<long long>::max()) {
+        return py::int_(value.convert_to<long long>());
+    }
+    std::string bytes;
+    const BigInt magnitude = boost::multiprecision::abs(value);
+    boost::multiprecision::export_bits(magnitude, std::back_inserter(bytes), 8, false);
+    const auto int_type =
+        py::reinterpret_borrow<py::object>(reinterpret_cast<PyObject *>(&PyLong_Type));
+    py::object result = int_type.attr("from_bytes")(py::bytes(bytes), "little");
+    if (value < 0) {
+        result = py::reinterpret_steal<py::object>(PyNumber_Negative(result.ptr()));
+    }
+    return result;
+}
+
+// --- Operands ------------------------------------------------------------------
+
+// Exact real and imaginary parts of a comparison operand.
+std::optional<std::array<ExactParts, 2>> exact_operand(py::handle value) {
+    const ExactParts zero;
+    if (py::isinstance<BigReal>(value)) {
+        return std::array{exact_parts(value.cast<const BigReal &>()), zero};
+    }
+    if (py::isinstance<BigComplex>(value)) {
+        const auto &z = value.cast<const BigComplex &>();
+        return std::array{exact_parts(BF(z.real())), exact_parts(BF(z.imag()))};
+    }
+    if (PyFloat_Check(value.ptr())) {
+        return std::array{exact_parts(PyFloat_AS_DOUBLE(value.ptr())), zero};
+    }
+    if (PyLong_Check(value.ptr())) {
+        return std::array{exact_parts(to_big_int(value)), zero};
+    }
+    if (PyComplex_Check(value.ptr())) {
+        const auto z = value.cast<Calculator::Complex>();
+        return std::array{exact_parts(z.real()), exact_parts(z.imag())};
+    }
+    return std::nullopt;
+}
+
+py::object not_implemented() {
+    return py::reinterpret_borrow<py::object>(Py_NotImplemented);
+}
+
+// --- Hashing -------------------------------------------------------------------
+
+// Python's numeric hash: the value modulo sys.hash_info.modulus, so values equal
+// to an int or a float hash like it. NaN hashes as sys.hash_info.nan.
+Py_hash_t numeric_hash(const ExactParts &parts) {
+    static const BigInt modulus(static_cast<unsigned long long>(_PyHASH_MODULUS));
+
+    if (parts.kind != ExactParts::Kind::Finite) {
+        const Py_hash_t inf = _PyHASH_INF;
+        return parts.kind == ExactParts::Kind::NaN ? 0 : (parts.negative ? -inf : inf);
+    }
+    // The modulus is prime, so radix^-1 is radix^(modulus - 2).
+    static const BigInt inverse_two = boost::multiprecision::powm(BigInt(2), modulus - 2, modulus);
+    static const BigInt inverse_ten = boost::multiprecision::powm(BigInt(10), modulus - 2, modulus);
+    const BigInt base =
+        parts.exponent >= 0 ? BigInt(parts.radix) : (parts.radix == 2 ? inverse_two : inverse_ten);
+    const BigInt power = boost::multiprecision::powm(
+        base, BigInt(parts.exponent >= 0 ? parts.exponent : -parts.exponent), modulus);
+    auto hash = static_cast<Py_hash_t>(
+        ((parts.mantissa % modulus) * power % modulus).convert_to<long long>());
+    hash = parts.negative ? -hash : hash;
+    return hash == -1 ? -2 : hash;
+}
+
+Py_hash_t complex_hash(const BigComplex &z) {
+    const auto imag = static_cast<Py_uhash_t>(_PyHASH_IMAG);
+    const auto re = static_cast<Py_uhash_t>(numeric_hash(exact_parts(BF(z.real()))));
+    const auto im = static_cast<Py_uhash_t>(numeric_hash(exact_parts(BF(z.imag()))));
+    const auto hash = static_cast<Py_hash_t>(re + imag * im);
+    return hash == -1 ? -2 : hash;
+}
+
+// --- Arithmetic ------------------------------------------------------------------
+
+// a op b with the evaluator's coercions, so BigReal + 0.1 adds the decimal 0.1
+// and BigReal * 1j moves to BigComplex, exactly as in an expression.
+template <typename T> void def_arithmetic(py::class_<T> &cls) {
+    const auto binary = [](OpId id, bool reflected) {
+        return [id, reflected](const T &self, py::handle other) -> py::object {
+            const std::optional<Number> operand = to_number(other);
+            if (!operand) {
+                return not_implemented();
+            }
+            const Calculator calc;
+            const Number a(self);
+            const auto unit = Calculator::AngleUnit::RAD;
+            return py::cast(reflected ? tcalc::eval::apply(calc, id, *operand, a, unit)
+                                      : tcalc::eval::apply(calc, id, a, *operand, unit));
+        };
+    };
+    cls.def("__add__", binary(OpId::Add, false), py::is_operator())
+        .def("__radd__", binary(OpId::Add, true), py::is_operator())
+        .def("__sub__", binary(OpId::Sub, false), py::is_operator())
+        .def("__rsub__", binary(OpId::Sub, true), py::is_operator())
+        .def("__mul__", binary(OpId::Mul, false), py::is_operator())
+        .def("__rmul__", binary(OpId::Mul, true), py::is_operator())
+        .def("__truediv__", binary(OpId::Div, false), py::is_operator())
+        .def("__rtruediv__", binary(OpId::Div, true), py::is_operator())
+        .def("__pow__", binary(OpId::Pow, false), py::is_operator())
+        .def("__rpow__", binary(OpId::Pow, true), py::is_operator())
+        .def("__neg__", [](const T &self) { return T(-self); })
+        .def("__pos__", [](const T &self) { return self; })
+        .def("__bool__", [](const T &self) { return self != 0; });
+}
+
+// --- Pickling ------------------------------------------------------------------
+
+template <typename T>
+void def_pickle(py::class_<T> &cls, std::string (*to)(const T &), T (*from)(const std::string &)) {
+    cls.def(
+           "to_bytes", [to](const T &self) { return py::bytes(to(self)); },
+           "Compact exact byte form; from_bytes() reads it back.")
+        .def_static(
+            "from_bytes", [from](const py::bytes &data) { return from(data); }, py::arg("data"))
+        .def(py::pickle([to](const T &self) { return py::bytes(to(self)); },
+                        [from](const py::bytes &data) { return from(data); }));
+}
+
+std::string real_to_bytes(const BigReal &x) {
+    const std::array parts{exact_parts(x)};
+    return to_bytes(parts);
+}
+
+BigReal real_from_bytes(const std::string &data) {
+    const std::vector<ExactParts> parts = parts_from_bytes(data);
+    if (parts.size() != 1) {
+        throw CalculatorError("Invalid data");
+    }
+    return to_big_real(parts[0]);
+}
+
+std::string complex_to_bytes(const BigComplex &z) {
+    const std::array parts{exact_parts(BF(z.real())), exact_parts(BF(z.imag()))};
+    return to_bytes(parts);
+}
+
+BigComplex complex_from_bytes(const std::string &data) {
+    const std::vector<ExactParts> parts = parts_from_bytes(data);
+    if (parts.size() != 2) {
+        throw CalculatorError("Invalid data");
+    }
+    return BigComplex(to_bin_float(parts[0]), to_bin_float(parts[1]));
+}
+
+} // namespace
+
+void def_number_protocol(py::class_<BigReal> &cls) {
+    using B = BigReal;
+    def_arithmetic(cls);
+
+    // Comparisons are exact across int, float and BigReal, like int vs float.
+    const auto compare_with = [](auto accept) {
+        return [accept](const B &self, py::handle other) -> py::object {
+            const auto operand = exact_operand(other);
+            if (!operand || (*operand)[1].mantissa != 0) {
+                return not_implemented();
+            }
+            return py::bool_(accept(compare(exact_parts(self), (*operand)[0])));
+        };
+    };
+    cls.def("__eq__", compare_with([](std::partial_ordering o) { return o == 0; }),
+            py::is_operator())
+        .def("__ne__", compare_with([](std::partial_ordering o) { return o != 0; }),
+             py::is_operator())
+        .def("__lt__", compare_with([](std::partial_ordering o) { return o < 0; }),
+             py::is_operator())
+        .def("__le__", compare_with([](std::partial_ordering o) { return o <= 0; }),
+             py::is_operator())
+        .def("__gt__", compare_with([](std::partial_ordering o) { return o > 0; }),
+             py::is_operator())
+        .def("__ge__", compare_with([](std::partial_ordering o) { return o >= 0; }),
+             py::is_operator())
+        .def("__hash__", [](const B &self) { return numeric_hash(exact_parts(self)); })
+        .def("__abs__", [](const B &self) { return B(boost::multiprecision::abs(self)); })
+        .def("__float__", [](const B &self) { return self.convert_to<double>(); })
+        .def("__complex__",
+             [](const B &self) { return Calculator::Complex(self.convert_to<double>(), 0.0); })
+        .def("__int__", [](const B &self) -> py::object {
+            if (boost::multiprecision::isnan(self)) {
+                throw py::value_error("cannot convert BigReal NaN to integer");
+            }
+            if (boost::multiprecision::isinf(self)) {
+                throw std::overflow_error("cannot convert BigReal infinity to integer");
+            }
+            return to_py_int(BigInt(boost::multiprecision::trunc(self)));
+        });
+    def_pickle(cls, real_to_bytes, real_from_bytes);
+}
+
+void def_number_protocol(py::class_<BigComplex> &cls) {
+    using BC = BigComplex;
+    def_arithmetic(cls);
+
+    // Equality only, exact against every numeric type; complex has no ordering.
+    const auto equal_to = [](bool expected) {
+        return [expected](const BC &self, py::handle other) -> py::object {
+            const auto operand = exact_operand(other);
+            if (!operand) {
+                return not_implemented();
+            }
+            const bool equal = compare(exact_parts(BF(self.real())), (*operand)[0]) == 0 &&
+                               compare(exact_parts(BF(self.imag())), (*operand)[1]) == 0;
+            return py::bool_(equal == expected);
+        };
+    };
+    cls.def("__eq__", equal_to(true), py::is_operator())
+        .def("__ne__", equal_to(false), py::is_operator())
+        .def("__hash__", &complex_hash)
+        .def("__abs__", [](const BC &self) { return to_big_real(exact_parts(BF(abs(self)))); })
+        .def("__complex__",
+             [](const BC &self) {
+                 return Calculator::Complex(self.real().template convert_to<double>(),
+                                            self.imag().template convert_to<double>());
+             })
+        .def_property_readonly(
+            "real", [](const BC &self) { return to_big_real(exact_parts(BF(self.real()))); })
+        .def_property_readonly(
+            "imag", [](const BC &self) { return to_big_real(exact_parts(BF(self.imag()))); });
+    def_pickle(cls, complex_to_bytes, complex_from_bytes);
+}
@@ -1,16 +1,71 @@
+#include <pybind11/complex.h>
+#include <pybind11/critical_section.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <cstdint>
+#include <memory>
+#include <optional>
 #include <string>
+#include <type_traits>
+#include <utility>
 
 #include "bindings.hpp"
+#include "eval/pub/evaluator.hpp"
+#include "eval/pub/plan.hpp"
 #include "parser/pub/ops.hpp"
 #include "parser/pub/parser.hpp"
 
 namespace py = pybind11;
 
+namespace {
+
+using tcalc::ops::TokenBuffer;
+
+// Read-only 1-D buffer over one TokenBuffer column. Holds the buffer alive for as
+// long as any memoryview of it exists.
+struct TokenColumn {
+    std::shared_ptr<const TokenBuffer> owner;
+    const void *data;
+    py::ssize_t size;
+    py::ssize_t itemsize;
+    std::string format;
+};
+
+template <typename T>
+py::memoryview column(const std::shared_ptr<TokenBuffer> &buffer, const std::vector<T> &values) {
+    using U = typename std::conditional_t<std::is_enum_v<T>, std::underlying_type<T>,
+                                          std::type_identity<T>>::type;
+    return py::memoryview(
+        py::cast(TokenColumn{buffer, values.data(), static_cast<py::ssize_t>(values.size()),
+                             sizeof(U), py::format_descriptor<U>::format()}));
+}
+
+// IncrementalParser methods mutate the parser. They run inside a critical section
+// on the Python object, so free-threaded builds serialize concurrent calls on one
+// parser (with the GIL it costs nothing). Results are copied before it ends.
+template <typename F> auto with_parser(py::handle self, F &&f) {
+    py::scoped_critical_section guard(self);
+    return std::forward<F>(f)(self.cast<tcalc::ops::IncrementalParser &>());
+}
+
+std::size_t token_index(const TokenBuffer &buffer, py::ssize_t i) {
+    const auto n = static_cast<py::ssize_t>(buffer.size());
+    if (i < 0) {
+        i += n;
+    }
+    if (i < 0 || i >= n) {
+        throw py::index_error("token index out of range");
+    }
+    return static_cast<std::size_t>(i);
+}
+
+} // namespace
+
 void bind_parser(py::module_ &m) {
+    using tcalc::ops::IncrementalParser;
     using tcalc::ops::OpId;
+    using tcalc::ops::Program;
     using tcalc::ops::Token;
     using tcalc::ops::TokenKind;
 
@@ -60,10 +115,22 @@ void bind_parser(py::module_ &m) {
         .value("Pow10", OpId::Pow10);
 
     py::class_<Token>(m, "Token",
-                      "Parser token. 'value' is text for numbers; 'symbol' is only for ops.")
+                      "Parser token. 'value' is text for numbers and 'number' their parsed value; "
+                      "'symbol' is only for ops.")
         .def_readonly("kind", &Token::kind)
         .def_readonly("op_id", &Token::op_id)
         .def_readonly("value", &Token::value)
+        .def_property_readonly(
+            "number",
+            [](const Token &tok) -> py::object {
+                if (tok.kind != TokenKind::Number) {
+                    return py::none();
+                }
+                return py::cast(tcalc::eval::literal_value(tok));
+            },
+            "int, float, complex or BigReal as the tokenizer parsed it (the constants e, pi "
+            "and i included); None for other tokens. Raises CalculatorError('Invalid "
+            "expression') for malformed literals.")
         .def_property_readonly("symbol", [](const Token &tok) {
             if (tok.kind != TokenKind::Op) {
                 return std::string();
@@ -102,6 +169,203 @@ void bind_parser(py::module_ &m) {
         "Return tuples of (id, symbol, precedence, associativity, arity, aliases, method, "
         "needs_angle_unit, big_supported, big_complex_supported).");
 
-    m.def("tokenize_string", &tcalc::ops::tokenize, py::arg("expression"));
-    m.def("shunting_yard", &tcalc::ops::shunting_yard, py::arg("tokens"));
+    py::class_<Program, std::shared_ptr<Program>>(
+        m, "Program", "Compiled expression. Tokens and RPN stay in native memory; immutable.")
+        .def_property_readonly("expression", &Program::expression)
+        .def_property_readonly("tokens", &Program::tokens, "Raw token stream (copied on access).")
+        .def_property_readonly("rpn", &Program::rpn, "Tokens in RPN order (copied on access).")
+        .def(
+            "evaluate",
+            [](const Program &p, Calculator::AngleUnit unit, std::optional<double> timeout,
+               std::optional<std::uint64_t> max_ops, std::optional<CancelToken> cancel,
+               std::optional<unsigned> digits) {
+                const Limits limits = make_limits(timeout, max_ops, std::move(cancel));
+                const Precision precision = to_precision(digits);
+                // Released so other threads run, and can cancel the token, meanwhile.
+                py::gil_scoped_release release;
+                return limits.unlimited() ? tcalc::eval::evaluate(p, unit, precision)
+                                          : tcalc::eval::evaluate(p, unit, limits, precision);
+            },
+            py::arg("angle_unit"), py::kw_only(), py::arg("timeout") = py::none(),
+            py::arg("max_ops") = py::none(), py::arg("cancel") = py::none(),
+            py::arg("precision") = py::none(),
+            "Evaluate natively; only the final value is converted to a Python object. With a "
+            "timeout (seconds), max_ops or cancel token the evaluation stops with "
+            "CalculatorError('Timeout') or CalculatorError('Cancelled'). precision (digits, "
+            "one of precision_tiers()) defaults to get_precision().")
+        .def(
+            "try_evaluate",
+            [](const Program &p, Calculator::AngleUnit unit, std::optional<double> timeout,
+               std::optional<std::uint64_t> max_ops, std::optional<CancelToken> cancel,
+               std::optional<unsigned> digits) {
+                const Limits limits = make_limits(timeout, max_ops, std::move(cancel));
+                const Precision precision = to_precision(digits);
+                tcalc::eval::Outcome outcome;
+                {
+                    // Previews run on worker threads; let the UI thread keep going.
+                    py::gil_scoped_release release;
+                    outcome = limits.unlimited()
+                                  ? tcalc::eval::try_evaluate(p, unit, precision)
+                                  : tcalc::eval::try_evaluate(p, unit, limits, precision);
+                }
+                py::object value = outcome.status == tcalc::eval::ErrorKind::Ok
+                                       ? py::cast(std::move(outcome.value))
+                                       : py::none();
+                return py::make_tuple(outcome.status, std::move(value));
+            },
+            py::arg("angle_unit"), py::kw_only(), py::arg("timeout") = py::none(),
+            py::arg("max_ops") = py::none(), py::arg("cancel") = py::none(),
+            py::arg("precision") = py::none(),
+            "Evaluate without raising: returns (ErrorKind, value), with value None unless the "
+            "status is ErrorKind.Ok. Meant for live preview of half-typed input; the GIL is "
+            "released while it runs. Limits and precision work as in evaluate(); limits "
+            "report ErrorKind.Timeout or ErrorKind.Cancelled.")
+        .def("dump", &tcalc::eval::dump,
+             "Debug listing of the RPN and of the optimized plan (folded constants, shared "
+             "subexpressions).")
+        .def_property_readonly("nbytes", &Program::byte_size,
+                               "Approximate native memory held by the program.")
+        .def("__len__", [](const Program &p) { return p.rpn().size(); })
+        .def("__repr__", [](const Program &p) {
+            return "Program(" + py::repr(py::str(p.expression())).cast<std::string>() + ")";
+        });
+
+    py::class_<TokenColumn>(m, "TokenColumn", py::buffer_protocol(),
+                            "One column of a TokenBuffer; use memoryview() to read it.")
+        .def_buffer([](const TokenColumn &c) {
+            return py::buffer_info(const_cast<void *>(c.data), c.itemsize, c.format, 1, {c.size},
+                                   {c.itemsize}, /*readonly=*/true);
+        });
+
+    py::class_<TokenBuffer, std::shared_ptr<TokenBuffer>>(
+        m, "TokenBuffer",
+        "Struct-of-arrays token stream. Columns are zero-copy read-only memoryviews; "
+        "offsets and lengths are UTF-8 byte spans into `source`.")
+        .def_property_readonly("source", &TokenBuffer::source)
+        .def_property_readonly(
+            "kinds", [](const std::shared_ptr<TokenBuffer> &b) { return column(b, b->kinds()); })
+        .def_property_readonly(
+            "op_ids", [](const std::shared_ptr<TokenBuffer> &b) { return column(b, b->op_ids()); })
+        .def_property_readonly(
+            "offsets",
+            [](const std::shared_ptr<TokenBuffer> &b) { return column(b, b->offsets()); })
+        .def_property_readonly(
+            "lengths",
+            [](const std::shared_ptr<TokenBuffer> &b) { return column(b, b->lengths()); })
+        .def(
+            "kind",
+            [](const TokenBuffer &b, py::ssize_t i) { return b.kinds()[token_index(b, i)]; },
+            py::arg("index"))
+        .def(
+            "op_id",
+            [](const TokenBuffer &b, py::ssize_t i) { return b.op_ids()[token_index(b, i)]; },
+            py::arg("index"))
+        .def(
+            "text", [](const TokenBuffer &b, py::ssize_t i) { return b.text(token_index(b, i)); },
+            py::arg("index"), "Source text of one token.")
+        .def(
+            "value", [](const TokenBuffer &b, py::ssize_t i) { return b.value(token_index(b, i)); },
+            py::arg("index"), "Token.value of one token, without building the Token.")
+        .def(
+            "number",
+            [](const TokenBuffer &b, py::ssize_t i) -> py::object {
+                const Token tok = b.token(token_index(b, i));
+                if (tok.kind != TokenKind::Number) {
+                    return py::none();
+                }
+                return py::cast(tcalc::eval::literal_value(tok));
+            },
+            py::arg("index"), "Token.number of one token.")
+        .def("__getitem__",
+             [](const TokenBuffer &b, py::ssize_t i) { return b.token(token_index(b, i)); })
+        .def("__len__", &TokenBuffer::size);
+
+    py::class_<IncrementalParser>(
+        m, "IncrementalParser", "Keystroke-level parser state; edits only rescan the changed tail.")
+        .def(py::init<>())
+        .def(py::init([](std::string_view text) {
+                 IncrementalParser parser;
+                 parser.assign(text);
+                 return parser;
+             }),
+             py::arg("text"))
+        .def(
+            "append",
+            [](py::handle self, std::string_view text) {
+                with_parser(self, [&](IncrementalParser &p) { p.append(text); });
+            },
+            py::arg("text"))
+        .def(
+            "backspace",
+            [](py::handle self, std::size_t count) {
+                with_parser(self, [&](IncrementalParser &p) { p.backspace(count); });
+            },
+            py::arg("count") = 1, "Remove `count` characters from the end.")
+        .def(
+            "assign",
+            [](py::handle self, std::string_view text) {
+                with_parser(self, [&](IncrementalParser &p) { p.assign(text); });
+            },
+            py::arg("text"),
+            "Replace the text; only the part after the common prefix is rescanned.")
+        .def("clear",
+             [](py::handle self) { with_parser(self, [](IncrementalParser &p) { p.clear(); }); })
+        .def_property_readonly("text",
+                               [](py::handle self) {
+                                   return with_parser(
+                                       self, [](IncrementalParser &p) { return p.text(); });
+                               })
+        .def_property_readonly(
+            "tokens",
+            [](py::handle self) {
+                return with_parser(self, [](IncrementalParser &p) { return p.tokens(); });
+            },
+            "Raw token stream (copied on access).")
+        .def(
+            "token_buffer",
+            [](py::handle self) {
+                return with_parser(self, [](IncrementalParser &p) { return p.token_buffer(); });
+            },
+            "Current tokens as a TokenBuffer, without rescanning.")
+        .def_property_readonly("rpn",
+                               [](py::handle self) {
+                                   return with_parser(self,
+                                                      [](IncrementalParser &p) { return p.rpn(); });
+                               })
+        .def_property_readonly("paren_depth",
+                               [](py::handle self) {
+                                   return with_parser(
+                                       self, [](IncrementalParser &p) { return p.paren_depth(); });
+                               })
+        .def_property_readonly(
+            "complete",
+            [](py::handle self) {
+                return with_parser(self, [](IncrementalParser &p) { return p.complete(); });
+            },
+            "True when the expression ends on an operand and is well formed.")
+        .def(
+            "program",
+            [](py::handle self) {
+                return with_parser(self, [](IncrementalParser &p) { return p.program(); });
+            },
+            "Program for the current text; the same object until the next edit.")
+        .def("__len__",
+             [](py::handle self) {
+                 return with_parser(self, [](IncrementalParser &p) { return p.tokens().size(); });
+             })
+        .def("__repr__", [](py::handle self) {
+            const std::string text =
+                with_parser(self, [](IncrementalParser &p) { return p.text(); });
+            return "IncrementalParser(" + py::repr(py::str(text)).cast<std::string>() + ")";
+        });
+
+    // Stateless passes run without the GIL. IncrementalParser keeps it: its edits
+    // mutate the parser and are cheap next to the Python call around them.
+    const py::call_guard<py::gil_scoped_release> nogil;
+    m.def("compile", &tcalc::ops::compile, nogil, py::arg("expression"),
+          "Tokenize, normalize and convert an expression to RPN in one native pass.");
+    m.def("tokenize_string", &tcalc::ops::tokenize, nogil, py::arg("expression"));
+    m.def("tokenize_buffer", &tcalc::ops::tokenize_buffer, nogil, py::arg("expression"),
+          "Tokenize into a TokenBuffer; no Python object is created per token.");
+    m.def("shunting_yard", &tcalc::ops::shunting_yard, nogil, py::arg("tokens"));
 }
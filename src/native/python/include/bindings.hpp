@@ -2,18 +2,83 @@
 
 #include <pybind11/pybind11.h>
 
-#include <cmath>
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <optional>
 #include <utility>
 
+#include "calc/pub/budget.hpp"
+#include "calc/pub/ext_double.hpp"
+#include "eval/pub/evaluator.hpp"
+#include "types.hpp"
+
+// ExtDouble stays native: results reach Python as BigReal.
+namespace pybind11::detail {
+template <> struct type_caster<ExtDouble> {
+    PYBIND11_TYPE_CASTER(ExtDouble, const_name("BigReal"));
+
+    bool load(handle, bool) { return false; }
+
+    static handle cast(const ExtDouble &value, return_value_policy, handle) {
+        return pybind11::cast(value.to_big()).release();
+    }
+};
+} // namespace pybind11::detail
+
 void bind_bigreal(pybind11::module_ &m);
 void bind_bigcomplex(pybind11::module_ &m);
 void bind_angle_unit(pybind11::module_ &m);
 void bind_calculator(pybind11::module_ &m);
 void bind_parser(pybind11::module_ &m);
+void bind_eval(pybind11::module_ &m);
+void bind_budget(pybind11::module_ &m);
+
+// Arithmetic, comparisons, hashing, conversions and pickling of the big types
+// (bind_number.cpp), without formatting values as text.
+void def_number_protocol(pybind11::class_<BigReal> &cls);
+void def_number_protocol(pybind11::class_<BigComplex> &cls);
+// A Python int as an exact BigInt.
+BigInt to_big_int(pybind11::handle value);
+// An int, float, complex, BigReal or BigComplex as an evaluator operand; ints past
+// long long become BigReal. nullopt for any other type.
+std::optional<tcalc::eval::Number> to_number(pybind11::handle value);
 
-template <typename BigFn> inline pybind11::object promote_inf_to_big(double r, BigFn &&big_fn) {
-    if (!std::isinf(r)) {
-        return pybind11::float_(r);
+// Limits from the optional timeout (seconds), max_ops and cancel keyword arguments.
+inline Limits make_limits(std::optional<double> timeout, std::optional<std::uint64_t> max_ops,
+                          std::optional<CancelToken> cancel) {
+    Limits limits;
+    if (timeout) {
+        if (!(*timeout > 0.0)) {
+            throw pybind11::value_error("timeout must be a positive number of seconds");
+        }
+        // Clamped before the cast, which is undefined for values nanoseconds cannot
+        // hold; the longest timeout (about 292 years) means no deadline in practice.
+        using Seconds = std::chrono::duration<double>;
+        const auto longest = std::chrono::duration_cast<Seconds>(std::chrono::nanoseconds::max());
+        limits.timeout =
+            *timeout < longest.count()
+                ? std::chrono::duration_cast<std::chrono::nanoseconds>(Seconds(*timeout))
+                : std::chrono::nanoseconds::max();
+        limits.timeout = std::max(limits.timeout, std::chrono::nanoseconds{1});
     }
-    return pybind11::cast(std::forward<BigFn>(big_fn)());
+    if (max_ops) {
+        limits.max_ops = *max_ops;
+    }
+    limits.cancel = std::move(cancel);
+    return limits;
+}
+
+// A precision keyword given in digits; value_error unless it names a tier.
+inline Precision to_precision(unsigned digits) {
+    const auto precision = precision_from_digits(digits);
+    if (!precision) {
+        throw pybind11::value_error("precision must be one of 20, 50, 100 or 500 digits");
+    }
+    return *precision;
+}
+
+// An optional precision keyword; None means the default precision at call time.
+inline Precision to_precision(std::optional<unsigned> digits) {
+    return digits ? to_precision(*digits) : default_precision();
 }
@@ -1,13 +1,17 @@
 #include <pybind11/complex.h>
 #include <pybind11/pybind11.h>
 
-#include <boost/math/constants/constants.hpp>
+#include <string>
 
 #include "bindings.hpp"
 #include "calc/pub/calculator.hpp"
 
 namespace py = pybind11;
 
+// Written to be safe without the GIL: kernels and compiled programs share no
+// mutable state, Calculator's precision is atomic and IncrementalParser locks
+// itself per call. Not declared with py::mod_gil_not_used() until
+// scripts/stress_threads.py has passed on a free-threaded build (see README.md).
 PYBIND11_MODULE(calc_native, m) {
     m.doc() = "Calculator core exposed from C++ via pybind11";
     py::register_exception<CalculatorError>(m, "CalculatorError");
@@ -16,12 +20,24 @@ PYBIND11_MODULE(calc_native, m) {
     bind_bigcomplex(m);
 
     using Z = Calculator::Complex;
-    using B = BigReal;
-    m.attr("pi") = py::cast(boost::math::constants::pi<B>());
-    m.attr("e") = py::cast(boost::math::constants::e<B>());
     m.attr("i") = py::cast(Z(0.0, 1.0));
+    // pi and e are computed on first access, then stored on the module.
+    m.def("__getattr__", [m](const std::string &name) mutable -> py::object {
+        py::object value;
+        if (name == "pi") {
+            value = py::cast(pi_constant<BigReal>());
+        } else if (name == "e") {
+            value = py::cast(e_constant<BigReal>());
+        } else {
+            throw py::attribute_error("module 'calc_native' has no attribute '" + name + "'");
+        }
+        m.attr(name.c_str()) = value;
+        return value;
+    });
 
     bind_angle_unit(m);
     bind_calculator(m);
+    bind_budget(m);
     bind_parser(m);
+    bind_eval(m);
 }
@@ -0,0 +1,94 @@
+// Compares Calculator::permute/choose against the multiply-per-factor loops
+// they replaced.
+#include <algorithm>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <string>
+
+#include "bench_helpers.hpp"
+#include "calc/pub/calculator.hpp"
+
+namespace {
+
+BigReal loop_permute(long long a, long long b) {
+    BigReal res = 1;
+    for (long long i = 0; i < b; ++i) {
+        res *= BigReal(a - i);
+    }
+    return res;
+}
+
+BigReal loop_choose(long long a, long long b) {
+    const long long r = std::min(b, a - b);
+    BigReal res = 1;
+    for (long long i = 1; i <= r; ++i) {
+        res *= BigReal(a - r + i);
+        res /= BigReal(i);
+    }
+    return res;
+}
+
+// Relative difference between the two results, as a string for the table.
+std::string rel_diff(const BigReal &a, const BigReal &b) {
+    using boost::multiprecision::abs;
+    if (a == b) {
+        return "0";
+    }
+    std::ostringstream out;
+    out << std::setprecision(2) << std::scientific << abs(a - b) / abs(b);
+    return out.str();
+}
+
+} // namespace
+
+void bench_combinatorics() {
+    const Calculator calc;
+    // Loops above this many factors are skipped: they would take minutes.
+    constexpr long long kLoopLimit = 2'000'000;
+
+    struct Case {
+        const char *op;
+        long long n;
+        long long r;
+    };
+    const Case cases[] = {
+        {"nCr", 20, 10},
+        {"nCr", 150, 75},
+        {"nCr", 1000, 300},
+        {"nCr", 1000, 500},
+        {"nCr", 100000, 50000},
+        {"nCr", 1000000, 500000},
+        {"nCr", 1000000000, 500000000},
+        {"nCr", 1000000000000000000, 3},
+        {"nPr", 20, 10},
+        {"nPr", 1000, 300},
+        {"nPr", 100000, 50000},
+        {"nPr", 1000000, 1000000},
+        {"nPr", 1000000000, 1000000000},
+    };
+
+    std::cout << std::left << std::setw(28) << "case" << std::setw(14) << "loop" << std::setw(14)
+              << "new" << "rel. diff\n";
+    for (const Case &c : cases) {
+        const bool choose = c.op[1] == 'C';
+        BigReal fast;
+        const double t_new = time_call(
+            [&] { return choose ? calc.choose(c.n, c.r) : calc.permute(c.n, c.r); }, fast);
+
+        std::string t_loop = "skipped";
+        std::string diff = "-";
+        const long long factors = choose ? std::min(c.r, c.n - c.r) : c.r;
+        if (factors <= kLoopLimit) {
+            BigReal slow;
+            t_loop = seconds(time_call(
+                [&] { return choose ? loop_choose(c.n, c.r) : loop_permute(c.n, c.r); }, slow));
+            diff = rel_diff(slow, fast);
+        }
+
+        const std::string name =
+            std::string(c.op) + "(" + std::to_string(c.n) + ", " + std::to_string(c.r) + ")";
+        std::cout << std::setw(28) << name << std::setw(14) << t_loop << std::setw(14)
+                  << seconds(t_new) << diff << "\n";
+    }
+}
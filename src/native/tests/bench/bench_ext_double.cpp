@@ -0,0 +1,46 @@
+// Results past double's range: the BigReal kernel they used to be recomputed in
+// against the ExtDouble one.
+#include <iomanip>
+#include <iostream>
+
+#include "bench_helpers.hpp"
+#include "calc/pub/calculator.hpp"
+
+void bench_ext_double() {
+    const Calculator calc;
+
+    struct Case {
+        const char *name;
+        BigReal (*big)(const Calculator &);
+        ExtDouble (*ext)(const Calculator &);
+    };
+    const Case cases[] = {
+        {"1e200 x 1e200",
+         [](const Calculator &c) { return c.mul(BigReal("1e200"), BigReal("1e200")); },
+         [](const Calculator &c) {
+             return c.mul(ExtDouble::from_decimal(1e200), ExtDouble::from_decimal(1e200));
+         }},
+        {"2^2000", [](const Calculator &c) { return c.pow(BigReal(2), BigReal(2000)); },
+         [](const Calculator &c) { return c.pow(ExtDouble(2.0), 2000.0); }},
+        {"2.5^1000.5", [](const Calculator &c) { return c.pow(BigReal("2.5"), BigReal("1000.5")); },
+         [](const Calculator &c) { return c.pow(ExtDouble(2.5), 1000.5); }},
+        {"ln(2^2000)", [](const Calculator &c) { return c.ln(pow(BigReal(2), 2000)); },
+         [](const Calculator &c) { return c.ln(ExtDouble(2.0).pow(2000LL)); }},
+        {"200!", [](const Calculator &c) { return c.fact(BigReal(200)); },
+         [](const Calculator &c) { return c.fact(ExtDouble(200.0)); }},
+        {"gamma(200.5)", [](const Calculator &c) { return c.gamma(BigReal("200.5")); },
+         [](const Calculator &c) { return c.gamma(ExtDouble(200.5)); }},
+    };
+
+    std::cout << std::left << std::setw(16) << "case" << std::setw(14) << "BigReal" << std::setw(14)
+              << "ExtDouble"
+              << "\n";
+    for (const Case &c : cases) {
+        BigReal big;
+        ExtDouble ext;
+        const double big_s = time_call([&] { return c.big(calc); }, big);
+        const double ext_s = time_call([&] { return c.ext(calc); }, ext);
+        std::cout << std::setw(16) << c.name << std::setw(14) << seconds(big_s) << std::setw(14)
+                  << seconds(ext_s) << std::setprecision(3) << big_s / ext_s << "x\n";
+    }
+}
@@ -0,0 +1,35 @@
+#pragma once
+
+#include <chrono>
+#include <iomanip>
+#include <sstream>
+#include <string>
+
+// Mean seconds per call of fn over at least `min_seconds` of repetitions; the
+// last result is stored in `out` so the work cannot be optimised away.
+template <typename Fn, typename Out>
+double time_call(const Fn &fn, Out &out, double min_seconds = 0.2) {
+    using Clock = std::chrono::steady_clock;
+    int reps = 0;
+    const auto start = Clock::now();
+    double elapsed = 0.0;
+    do {
+        out = fn();
+        ++reps;
+        elapsed = std::chrono::duration<double>(Clock::now() - start).count();
+    } while (elapsed < min_seconds);
+    return elapsed / reps;
+}
+
+inline std::string seconds(double s) {
+    std::ostringstream out;
+    out << std::setprecision(3);
+    if (s < 1e-3) {
+        out << s * 1e6 << " us";
+    } else if (s < 1.0) {
+        out << s * 1e3 << " ms";
+    } else {
+        out << s << " s";
+    }
+    return out.str();
+}
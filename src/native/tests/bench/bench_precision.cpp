@@ -0,0 +1,44 @@
+// Cost of the BigReal kernels at each working precision.
+#include <iomanip>
+#include <iostream>
+#include <string>
+
+#include "bench_helpers.hpp"
+#include "calc/pub/calculator.hpp"
+
+void bench_precision() {
+    constexpr Precision tiers[] = {Precision::Digits20, Precision::Digits50, Precision::Digits100,
+                                   Precision::Digits500};
+
+    struct Case {
+        const char *name;
+        BigReal (*run)(const Calculator &);
+    };
+    const Case cases[] = {
+        {"sqrt(2)", [](const Calculator &c) { return c.sqrt(BigReal(2)); }},
+        {"ln(7)", [](const Calculator &c) { return c.ln(BigReal(7)); }},
+        {"1.5^2.5", [](const Calculator &c) { return c.pow(BigReal("1.5"), BigReal("2.5")); }},
+        {"sin(1e6 deg)",
+         [](const Calculator &c) { return c.sin(BigReal(1'000'000), Calculator::AngleUnit::DEG); }},
+        {"sin(1e300 deg)",
+         [](const Calculator &c) { return c.sin(BigReal("1e300"), Calculator::AngleUnit::DEG); }},
+        {"sin(1e22)",
+         [](const Calculator &c) { return c.sin(BigReal("1e22"), Calculator::AngleUnit::RAD); }},
+        {"gamma(10.5)", [](const Calculator &c) { return c.gamma(BigReal("10.5")); }},
+    };
+
+    std::cout << std::left << std::setw(16) << "case";
+    for (const Precision tier : tiers) {
+        std::cout << std::setw(14) << (std::to_string(digits10(tier)) + " digits");
+    }
+    std::cout << "\n";
+    for (const Case &c : cases) {
+        std::cout << std::setw(16) << c.name;
+        for (const Precision tier : tiers) {
+            const Calculator calc(nullptr, tier);
+            BigReal out;
+            std::cout << std::setw(14) << seconds(time_call([&] { return c.run(calc); }, out));
+        }
+        std::cout << "\n";
+    }
+}
@@ -0,0 +1,38 @@
+// Timing comparisons. Not part of native_tests; run native_bench from a Release
+// build, optionally naming the benchmarks to run.
+#include <cstring>
+#include <iostream>
+
+void bench_combinatorics();
+void bench_ext_double();
+void bench_precision();
+
+namespace {
+
+struct Bench {
+    const char *name;
+    void (*run)();
+};
+
+constexpr Bench kBenches[] = {
+    {"combinatorics", bench_combinatorics},
+    {"extended", bench_ext_double},
+    {"precision", bench_precision},
+};
+
+} // namespace
+
+int main(int argc, char **argv) {
+    for (const Bench &bench : kBenches) {
+        bool selected = argc < 2;
+        for (int i = 1; i < argc; ++i) {
+            selected = selected || std::strcmp(argv[i], bench.name) == 0;
+        }
+        if (selected) {
+            std::cout << "== " << bench.name << " ==\n";
+            bench.run();
+            std::cout << "\n";
+        }
+    }
+    return 0;
+}
@@ -6,7 +6,19 @@
 void unit_arithmetic(TestContext &ctx);
 void unit_transcendental(TestContext &ctx);
 void unit_trig(TestContext &ctx);
+void unit_trig_reduction(TestContext &ctx);
 void unit_combinatorics(TestContext &ctx);
+void unit_ext_double(TestContext &ctx);
+void unit_exact_parts(TestContext &ctx);
+void unit_parser(TestContext &ctx);
+void unit_token_buffer(TestContext &ctx);
+void unit_incremental_parser(TestContext &ctx);
+void unit_evaluator(TestContext &ctx);
+void unit_plan(TestContext &ctx);
+void unit_batch(TestContext &ctx);
+void unit_array(TestContext &ctx);
+void unit_budget(TestContext &ctx);
+void unit_precision(TestContext &ctx);
 void smoke_stress(TestContext &ctx);
 
 template <typename Fn> static void run_suite(TestContext &ctx, const char *name, Fn &&fn) {
@@ -42,7 +54,19 @@ int main(int argc, char **argv) { // NOLINT(modernize-use-trailing-return-type)
     run_suite(ctx, "unit_arithmetic", unit_arithmetic);
     run_suite(ctx, "unit_transcendental", unit_transcendental);
     run_suite(ctx, "unit_trig", unit_trig);
+    run_suite(ctx, "unit_trig_reduction", unit_trig_reduction);
     run_suite(ctx, "unit_combinatorics", unit_combinatorics);
+    run_suite(ctx, "unit_ext_double", unit_ext_double);
+    run_suite(ctx, "unit_exact_parts", unit_exact_parts);
+    run_suite(ctx, "unit_parser", unit_parser);
+    run_suite(ctx, "unit_token_buffer", unit_token_buffer);
+    run_suite(ctx, "unit_incremental_parser", unit_incremental_parser);
+    run_suite(ctx, "unit_evaluator", unit_evaluator);
+    run_suite(ctx, "unit_plan", unit_plan);
+    run_suite(ctx, "unit_batch", unit_batch);
+    run_suite(ctx, "unit_array", unit_array);
+    run_suite(ctx, "unit_budget", unit_budget);
+    run_suite(ctx, "unit_precision", unit_precision);
     run_suite(ctx, "smoke_stress", smoke_stress);
 
     if (ctx.failures == 0) {
@@ -0,0 +1,111 @@
+#include "eval/pub/array.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <array>
+#include <charconv>
+#include <optional>
+#include <string>
+#include <vector>
+
+namespace {
+
+using tcalc::eval::Complex;
+
+// Scalar reference: the element spelled as a float literal in place of `t`.
+std::optional<Complex> scalar(const std::string &expression, double t, Calculator::AngleUnit unit) {
+    std::array<char, 32> buf{};
+    const auto res = std::to_chars(buf.data(), buf.data() + buf.size(), t);
+    std::string literal(buf.data(), res.ptr);
+    if (literal.find('.') == std::string::npos) {
+        literal += ".0";
+    }
+
+    std::string text;
+    for (const char ch : expression) {
+        text += ch == 't' ? "(" + literal + ")" : std::string(1, ch);
+    }
+    try {
+        return tcalc::eval::to_complex(tcalc::eval::evaluate(tcalc::ops::compile(text), unit));
+    } catch (const CalculatorError &) {
+        return std::nullopt;
+    }
+}
+
+bool close(Complex a, Complex b) {
+    const double scale = std::max(1.0, std::abs(b));
+    return std::abs(a - b) <= 1e-12 * scale || (a == b);
+}
+
+} // namespace
+
+void unit_array(TestContext &ctx) {
+    using tcalc::eval::evaluate_array;
+    using U = Calculator::AngleUnit;
+
+    const std::vector<double> xs = {-2.5, -1.0, -0.5, 0.0, 0.5, 1.0, 1.5, 3.25};
+
+    // Element by element, the same values, kinds and failures as scalar evaluation.
+    bool consistent = true;
+    for (const char *expr :
+         {"t²+1", "√(t)", "ln(t)+1", "sin(t)+cos(30)", "t!", "asin(t)", "1÷t", "(t-1)(t+1)", "∠(t)",
+          "t mod 2", "2^t", "t^2", "√(t)x√(t)", "Γ(t)", "(t)⌄3", "t nCm 2", "e^t", "-t%", "7"}) {
+        const auto program = tcalc::ops::compile(expr);
+        for (const U unit : {U::DEG, U::RAD}) {
+            const auto out = evaluate_array(program, "t", xs, unit);
+            for (std::size_t i = 0; i < xs.size(); ++i) {
+                const auto expected = scalar(expr, xs[i], unit);
+                const Complex got = out.is_complex ? out.complex[i] : Complex(out.real[i], 0.0);
+                if (!expected) {
+                    consistent = consistent && out.errors[i] == 1 && std::isnan(got.real());
+                } else {
+                    consistent = consistent && out.errors[i] == 0 && close(got, *expected);
+                }
+            }
+        }
+    }
+    EXPECT_TRUE(ctx, consistent);
+
+    // Real results stay real; a single element off the real line makes the output complex.
+    const auto program = tcalc::ops::compile("√(t)");
+    const auto real = evaluate_array(program, "t", std::vector<double>{1.0, 4.0}, U::DEG);
+    EXPECT_TRUE(ctx, !real.is_complex && real.real[1] == 2.0);
+    const auto mixed = evaluate_array(program, "t", std::vector<double>{-4.0, 4.0}, U::DEG);
+    EXPECT_TRUE(ctx, mixed.is_complex);
+    EXPECT_TRUE(ctx, approx(mixed.complex[0].imag(), 2.0) && approx(mixed.complex[1].real(), 2.0));
+
+    const std::vector<Complex> zs = {Complex(0.0, 1.0), Complex(-1.0, 0.0)};
+    const auto squared = evaluate_array(tcalc::ops::compile("t²"), "t", zs, U::DEG);
+    EXPECT_TRUE(ctx, squared.is_complex && approx(squared.complex[0].real(), -1.0));
+
+    EXPECT_EQ(ctx, evaluate_array(program, "t", std::vector<double>{}, U::DEG).size(),
+              std::size_t{0});
+
+    // Failures that do not depend on the element raise instead of masking.
+    EXPECT_THROWS(ctx, evaluate_array(tcalc::ops::compile("1÷0+t"), "t", xs, U::DEG));
+    EXPECT_THROWS(ctx, evaluate_array(tcalc::ops::compile("t+"), "t", xs, U::DEG));
+    EXPECT_THROWS(ctx, evaluate_array(tcalc::ops::compile("abc+t"), "t", xs, U::DEG));
+    for (const char *name : {"x", "e", "i", "2", "", "t t"}) {
+        EXPECT_THROWS(ctx, evaluate_array(program, name, xs, U::DEG));
+    }
+
+    // Limits stop the whole array instead of masking the elements left.
+    const auto stopped = [&](const Limits &limits) {
+        try {
+            evaluate_array(tcalc::ops::compile("t²+1"), "t", xs, U::DEG, limits);
+        } catch (const CalculatorError &error) {
+            return tcalc::eval::error_kind(error);
+        }
+        return tcalc::eval::ErrorKind::Ok;
+    };
+    Limits tiny;
+    tiny.max_ops = 4;
+    EXPECT_TRUE(ctx, stopped(tiny) == tcalc::eval::ErrorKind::Timeout);
+    Limits roomy;
+    roomy.max_ops = 100;
+    EXPECT_TRUE(ctx, stopped(roomy) == tcalc::eval::ErrorKind::Ok);
+    CancelToken token;
+    token.cancel();
+    Limits cancelled;
+    cancelled.cancel = token;
+    EXPECT_TRUE(ctx, stopped(cancelled) == tcalc::eval::ErrorKind::Cancelled);
+}
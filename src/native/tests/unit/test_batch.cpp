@@ -0,0 +1,45 @@
+#include "eval/pub/batch.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <string>
+#include <vector>
+
+void unit_batch(TestContext &ctx) {
+    using tcalc::eval::ErrorKind;
+    using U = Calculator::AngleUnit;
+
+    const std::vector<std::string> base = {"1 + 2", "abc", "1 ÷ 0", "5 +", "sin(30)", "200!", "2i"};
+    const auto small = tcalc::eval::evaluate_many(base, U::DEG, 1);
+    EXPECT_EQ(ctx, small.values.size(), base.size());
+    EXPECT_TRUE(ctx, small.errors[0] == ErrorKind::Ok);
+    EXPECT_TRUE(ctx, small.errors[1] == ErrorKind::Invalid);
+    EXPECT_TRUE(ctx, small.errors[2] == ErrorKind::MathErr);
+    EXPECT_TRUE(ctx, small.errors[3] == ErrorKind::Malformed);
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(small.values[4]), 0.5));
+    EXPECT_TRUE(ctx, std::holds_alternative<BigReal>(small.values[5]));
+
+    // Many items over several workers land in input order, same as one by one.
+    std::vector<std::string> many;
+    for (int k = 0; k < 5000; ++k) {
+        many.push_back(base[k % base.size()] + " + " + std::to_string(k));
+    }
+    const auto parallel = tcalc::eval::evaluate_many(many, U::RAD, 4);
+    bool ordered = parallel.values.size() == many.size();
+    for (std::size_t i = 0; ordered && i < many.size(); ++i) {
+        ErrorKind kind = ErrorKind::Ok;
+        tcalc::eval::Number expected;
+        try {
+            expected = tcalc::eval::evaluate(tcalc::ops::compile(many[i]), U::RAD);
+        } catch (const std::exception &e) {
+            kind = tcalc::eval::error_kind(e);
+        }
+        ordered = parallel.errors[i] == kind &&
+                  (kind != ErrorKind::Ok || parallel.values[i].index() == expected.index());
+        if (ordered && kind == ErrorKind::Ok && expected.index() == 1) {
+            ordered = std::get<double>(parallel.values[i]) == std::get<double>(expected);
+        }
+    }
+    EXPECT_TRUE(ctx, ordered);
+
+    EXPECT_EQ(ctx, tcalc::eval::evaluate_many({}, U::DEG).values.size(), std::size_t{0});
+}
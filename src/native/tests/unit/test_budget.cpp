@@ -0,0 +1,132 @@
+#include "calc/pub/budget.hpp"
+#include "calc/pub/calculator.hpp"
+#include "eval/pub/batch.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <thread>
+#include <vector>
+
+void unit_budget(TestContext &ctx) {
+    using tcalc::eval::ErrorKind;
+    using U = Calculator::AngleUnit;
+    using namespace std::chrono_literals;
+
+    // An exact nCm charges one op per factor, so a big one runs out of ops.
+    const std::string slow = "1000 nCm 500";
+    Limits ops;
+    ops.max_ops = 100;
+    EXPECT_TRUE(ctx, tcalc::eval::try_evaluate(tcalc::ops::compile(slow), U::DEG, ops).status ==
+                         ErrorKind::Timeout);
+    EXPECT_THROWS(ctx, tcalc::eval::evaluate(tcalc::ops::compile(slow), U::DEG, ops));
+
+    // A deadline stops the whole evaluation: this sum of exact nCm takes well over 1 ms.
+    std::string long_sum = "0";
+    for (int k = 0; k < 200; ++k) {
+        long_sum += " + 4999 nCm " + std::to_string(2400 + k);
+    }
+    Limits deadline;
+    deadline.timeout = 1ms;
+    EXPECT_TRUE(ctx,
+                tcalc::eval::try_evaluate(tcalc::ops::compile(long_sum), U::DEG, deadline).status ==
+                    ErrorKind::Timeout);
+
+    CancelToken token;
+    Limits cancelled;
+    cancelled.cancel = token;
+    EXPECT_TRUE(ctx, !token.cancelled());
+    token.cancel();
+    EXPECT_TRUE(ctx, cancelled.cancel->cancelled()); // copies share the flag
+    EXPECT_TRUE(ctx,
+                tcalc::eval::try_evaluate(tcalc::ops::compile("1 + 2"), U::DEG, cancelled).status ==
+                    ErrorKind::Cancelled);
+    try {
+        tcalc::eval::evaluate(tcalc::ops::compile("1 + 2"), U::DEG, cancelled);
+        EXPECT_TRUE(ctx, false);
+    } catch (const CalculatorError &e) {
+        EXPECT_TRUE(ctx, tcalc::eval::error_kind(e) == ErrorKind::Cancelled);
+    }
+
+    // Gamma charges per recurrence step and series term, so an op budget runs out
+    // part way through one call rather than only before it starts. The first call
+    // fills the shared Bernoulli table, so both metered runs do the same work.
+    Calculator(nullptr, Precision::Digits500).gamma(BigReal("0.5"));
+    for (const char *arg : {"0.5", "-3.5", "123456.5"}) {
+        const Budget metered{Limits{}};
+        Calculator(&metered, Precision::Digits500).gamma(BigReal(arg));
+        const std::uint64_t cost = metered.used();
+        EXPECT_TRUE(ctx, cost > Budget::kCheckStride);
+
+        Limits half;
+        half.max_ops = cost / 2;
+        const Budget halfway(half);
+        try {
+            Calculator(&halfway, Precision::Digits500).gamma(BigReal(arg));
+            EXPECT_TRUE(ctx, false);
+        } catch (const CalculatorError &e) {
+            EXPECT_TRUE(ctx, e.what() == Budget::kTimeoutMessage);
+            EXPECT_TRUE(ctx, halfway.used() > half.max_ops && halfway.used() < cost);
+        }
+    }
+
+    // The log-gamma path of nCm and the factorial sieve are metered the same way.
+    const Budget choose_meter{Limits{}};
+    Calculator(&choose_meter).choose(100000, 50000);
+    const Budget sieve_meter{Limits{}};
+    Calculator(&sieve_meter).factorial(100000);
+    EXPECT_TRUE(ctx, choose_meter.used() > Budget::kCheckStride);
+    EXPECT_TRUE(ctx, sieve_meter.used() > 100000 / 2);
+
+    // A cancel from another thread lands inside a running 500-digit kernel.
+    CancelToken stop;
+    Limits stoppable;
+    stoppable.cancel = stop;
+    const Budget running(stoppable);
+    const Calculator slow_calc(&running, Precision::Digits500);
+    std::thread canceller([stop] {
+        std::this_thread::sleep_for(2ms);
+        stop.cancel();
+    });
+    bool stopped = false;
+    try {
+        for (int i = 0; i < 1000; ++i) {
+            slow_calc.gamma(BigReal("0.5") + i);
+        }
+    } catch (const CalculatorError &e) {
+        stopped = e.what() == Budget::kCancelledMessage;
+    }
+    canceller.join();
+    EXPECT_TRUE(ctx, stopped);
+
+    // A plan whose folding ran out of budget still evaluates once the limit is lifted.
+    const auto program = tcalc::ops::compile("200 nCm 100 + 1");
+    Limits tight;
+    tight.max_ops = 10;
+    EXPECT_TRUE(ctx,
+                tcalc::eval::try_evaluate(program, U::DEG, tight).status == ErrorKind::Timeout);
+    const auto lifted = tcalc::eval::try_evaluate(program, U::DEG, Limits{});
+    EXPECT_TRUE(ctx, lifted.status == ErrorKind::Ok);
+
+    // Generous limits change nothing.
+    Limits loose;
+    loose.timeout = 10s;
+    loose.max_ops = 1'000'000;
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(tcalc::eval::evaluate(
+                                tcalc::ops::compile("2^10 + 5!"), U::DEG, loose)),
+                            1144.0));
+    EXPECT_TRUE(ctx, Limits{}.unlimited() && !loose.unlimited());
+
+    // A timeout past the clock's range sets no deadline instead of overflowing it.
+    Limits forever;
+    forever.timeout = std::chrono::nanoseconds::max();
+    EXPECT_TRUE(ctx, tcalc::eval::try_evaluate(tcalc::ops::compile("3!"), U::DEG, forever).status ==
+                         ErrorKind::Ok);
+
+    // In a batch the limit applies per item.
+    const auto batch = tcalc::eval::evaluate_many({"1 + 1", slow, "3!"}, U::DEG, 1, ops);
+    EXPECT_TRUE(ctx, batch.errors[0] == ErrorKind::Ok);
+    EXPECT_TRUE(ctx, batch.errors[1] == ErrorKind::Timeout);
+    EXPECT_TRUE(ctx, batch.errors[2] == ErrorKind::Ok);
+}
@@ -1,6 +1,9 @@
 #include "calc/pub/calculator.hpp"
 #include "internal/test_helpers.hpp"
 
+#include <cmath>
+#include <cstdint>
+
 void unit_combinatorics(TestContext &ctx) {
     Calculator c;
 
@@ -23,6 +26,32 @@ void unit_combinatorics(TestContext &ctx) {
     EXPECT_THROWS(ctx, c.gamma(BigReal("0")));
     EXPECT_THROWS(ctx, c.gamma(BigReal("-2")));
 
+    // Table entries are within half an ulp of the exact factorial.
+    bool rounded = true;
+    for (unsigned n = 0; n <= 170; ++n) {
+        const BigReal exact = to_big_real(c.factorial(n));
+        const BigReal err = abs(BigReal(c.fact(static_cast<double>(n))) - exact) / exact;
+        rounded = rounded && err <= BigReal(std::ldexp(1.0, -53));
+    }
+    EXPECT_TRUE(ctx, rounded);
+    EXPECT_TRUE(ctx, std::isinf(c.fact(171.0)));
+
+    EXPECT_TRUE(ctx, c.factorial(0) == 1 && c.factorial(22) == BigInt("1124000727777607680000"));
+    EXPECT_TRUE(ctx,
+                c.factorial(100) ==
+                    BigInt("9332621544394415268169923885626670049071596826438162146859296389521759"
+                           "9993229915608941463976156518286253697920827223758251185210916864000000"
+                           "000000000000000000"));
+    for (const std::uint64_t n : {23, 64, 1000, 4097}) {
+        EXPECT_TRUE(ctx, c.factorial(n) == c.factorial(n - 1) * n);
+    }
+    EXPECT_THROWS(ctx, c.factorial(Calculator::kMaxExactFactorial + 1));
+    // Exact below the tgamma cutover, and continuous across it.
+    EXPECT_TRUE(ctx,
+                c.fact(BigReal(40)) == BigReal("815915283247897734345611269596115894272000000000"));
+    EXPECT_TRUE(ctx, approx_big(c.fact(BigReal(5001)) / c.fact(BigReal(5000)), BigReal(5001),
+                                BigReal("1e-40")));
+
     const BigReal f199 = c.fact(BigReal("199"));
     const BigReal f200 = c.fact(BigReal("200"));
     EXPECT_TRUE(ctx, approx_big(f200 / f199, BigReal("200"), BigReal("1e-30")));
@@ -31,4 +60,34 @@ void unit_combinatorics(TestContext &ctx) {
     EXPECT_TRUE(ctx, c.choose(5, 2) == BigReal("10"));
     EXPECT_TRUE(ctx, c.choose(5, 6) == BigReal("0"));
     EXPECT_TRUE(ctx, c.permute(5, 6) == BigReal("0"));
+    EXPECT_TRUE(ctx, c.permute(7, 0) == BigReal("1") && c.choose(7, 7) == BigReal("1"));
+    EXPECT_THROWS(ctx, c.choose(-1, 2));
+
+    // Exact products, even past what a multiply/divide loop keeps exact.
+    EXPECT_TRUE(ctx, c.permute(20, 10) == BigReal("670442572800"));
+    EXPECT_TRUE(ctx, c.choose(150, 75) == BigReal("92826069736708789698985814872605121940117520"));
+    EXPECT_TRUE(ctx, c.choose(1000000000000000000, 3) ==
+                         BigReal("166666666666666666166666666666666667000000000000000000"));
+    EXPECT_TRUE(ctx,
+                approx_big(c.choose(1000, 500) / BigReal("2.7028824094543656951561469362597527549"
+                                                         "6152008446548287e299"),
+                           BigReal(1), BigReal("1e-45")));
+
+    // Log-gamma path: relative error far below BigReal's precision.
+    EXPECT_TRUE(ctx,
+                approx_big(c.choose(100000, 50000) /
+                               BigReal("2.52060836892200338850090011673465787960817336907e30100"),
+                           BigReal(1), BigReal("1e-45")));
+    EXPECT_TRUE(ctx,
+                approx_big(c.permute(100000, 50000) /
+                               BigReal("8.43728408995482843708427164018884478482205242860e243336"),
+                           BigReal(1), BigReal("1e-45")));
+    EXPECT_TRUE(ctx, c.choose(100000, 60000) == c.choose(100000, 40000));
+
+    // Arguments no loop could handle, checked through C(n, k+1) = C(n, k) (n-k) / (k+1).
+    const long long n = 1000000000;
+    const BigReal big = c.choose(n, n / 2);
+    EXPECT_TRUE(ctx, approx_big(c.choose(n, n / 2 + 1) / big * BigReal(n / 2 + 1) / BigReal(n / 2),
+                                BigReal(1), BigReal("1e-45")));
+    EXPECT_TRUE(ctx, c.choose(n, n / 2 - 1) == c.choose(n, n / 2 + 1));
 }
@@ -0,0 +1,99 @@
+#include "eval/pub/evaluator.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <cmath>
+#include <complex>
+#include <variant>
+
+namespace {
+
+using tcalc::eval::Number;
+
+Number eval(const char *expression, Calculator::AngleUnit unit = Calculator::AngleUnit::DEG) {
+    return tcalc::eval::evaluate(tcalc::ops::compile(expression), unit);
+}
+
+template <typename T> bool holds(const Number &v) {
+    return std::holds_alternative<T>(v);
+}
+
+double real(const Number &v) {
+    return tcalc::eval::to_real(v);
+}
+
+} // namespace
+
+void unit_evaluator(TestContext &ctx) {
+    using Z = Calculator::Complex;
+    using U = Calculator::AngleUnit;
+
+    // Literals keep the Python numeric tower: int, float, complex, BigReal.
+    EXPECT_TRUE(ctx, holds<long long>(eval("42")));
+    EXPECT_TRUE(ctx, holds<double>(eval("4.5")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("1e400")));
+    EXPECT_TRUE(ctx, holds<Z>(eval("2i")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("pi")));
+
+    EXPECT_EQ(ctx, real(eval("1 + 2 x 3")), 7.0);
+    EXPECT_TRUE(ctx, holds<double>(eval("1 + 2")));
+    EXPECT_EQ(ctx, real(eval("-3 + -2")), -5.0);
+    EXPECT_EQ(ctx, real(eval("2(3)")), 6.0);
+    EXPECT_EQ(ctx, real(eval("50%")), 0.5);
+    EXPECT_EQ(ctx, real(eval("3²")), 9.0);
+    EXPECT_EQ(ctx, real(eval("2³")), 8.0);
+    EXPECT_EQ(ctx, real(eval("4⁻¹")), 0.25);
+    EXPECT_EQ(ctx, real(eval("5!")), 120.0);
+    EXPECT_TRUE(ctx, holds<long long>(eval("7 div 2")));
+    EXPECT_EQ(ctx, real(eval("7 div 2")), 3.0);
+    EXPECT_TRUE(ctx, approx(real(eval("sin(90)")), 1.0));
+    EXPECT_TRUE(ctx, approx(real(eval("sin(90)", U::RAD)), std::sin(90.0)));
+    EXPECT_TRUE(ctx, approx(real(eval("5 nCm 2")), 10.0));
+
+    // Domain promotion to complex, as in _PROMO_RULES_BY_ID.
+    const Number root = eval("√(-4)");
+    EXPECT_TRUE(ctx, holds<Z>(root));
+    EXPECT_TRUE(ctx, approx(std::get<Z>(root).imag(), 2.0));
+    EXPECT_TRUE(ctx, holds<Z>(eval("(-4) ⌄ 2")));
+    EXPECT_EQ(ctx, real(eval("(-8) ⌄ 3")), -2.0);
+    EXPECT_TRUE(ctx, holds<Z>(eval("ln(-1)")));
+
+    // pow with a large exponent and double overflow both move to ExtDouble; BigReal
+    // operands keep BigReal.
+    EXPECT_TRUE(ctx, holds<ExtDouble>(eval("2 ^ 1100")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("1e300 x 1e300")));
+    EXPECT_TRUE(ctx, holds<ExtDouble>(eval("10 ^ 200 x 10 ^ 200")));
+    EXPECT_TRUE(ctx, holds<ExtDouble>(eval("10 ^ 308 + 10 ^ 308")));
+    // Integer factorials past double's range are exact to BigReal's digits instead.
+    const auto f200 = eval("200!");
+    EXPECT_TRUE(ctx, holds<BigReal>(f200) &&
+                         std::get<BigReal>(f200) == to_big_real(Calculator().factorial(200)));
+    EXPECT_TRUE(ctx, holds<ExtDouble>(eval("Γ(200.5)")));
+    EXPECT_TRUE(ctx, holds<ExtDouble>(eval("0.5 ^ 5000")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("exp(1)")));
+
+    // ExtDouble results back in double's range narrow to double...
+    EXPECT_TRUE(ctx, holds<double>(eval("2 ^ 400")));
+    EXPECT_TRUE(ctx, holds<double>(eval("2 ^ 2000 ÷ 2 ^ 1999")));
+    EXPECT_EQ(ctx, real(eval("2 ^ 2000 ÷ 2 ^ 1999")), 2.0);
+    EXPECT_EQ(ctx, real(eval("201! ÷ 200!")), 201.0);
+    EXPECT_TRUE(ctx, approx(real(eval("ln(2 ^ 2000)")), 2000.0 * std::log(2.0)));
+    EXPECT_TRUE(ctx, approx(real(eval("1.0001 ^ 400")), std::pow(1.0001, 400.0)));
+    // ...and escalate to BigReal for ops that need more digits or other operands.
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("sin(2 ^ 2000)")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("2 ^ 2000 mod 7")));
+    EXPECT_TRUE(ctx, holds<BigReal>(eval("2 ^ 2000 + 1e400")));
+    EXPECT_TRUE(ctx, holds<BigComplex>(eval("2 ^ 2000 + 2i")));
+    EXPECT_TRUE(ctx, holds<BigComplex>(eval("1e400 + i")));
+    EXPECT_TRUE(ctx,
+                approx_big(std::get<BigReal>(eval("0.1 + 1e0")), BigReal("1.1"), BigReal("1e-45")));
+
+    // Ops without extended-range kernels fall back to double.
+    EXPECT_TRUE(ctx, approx(real(eval("sinh(e)")), std::sinh(std::exp(1.0))));
+
+    EXPECT_THROWS(ctx, eval("1 ÷ 0"));
+    EXPECT_THROWS(ctx, eval("abc"));
+    EXPECT_THROWS(ctx, eval("5 +"));
+    EXPECT_THROWS(ctx, eval("("));
+    EXPECT_THROWS(ctx, eval("2.5 nCm 1"));
+    EXPECT_THROWS(ctx, eval("i mod 2"));
+}
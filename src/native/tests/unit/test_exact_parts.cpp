@@ -0,0 +1,72 @@
+#include "calc/pub/exact_parts.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <array>
+#include <limits>
+#include <string>
+
+void unit_exact_parts(TestContext &ctx) {
+    using BF = boost::multiprecision::cpp_bin_float_50;
+    using Kind = ExactParts::Kind;
+
+    // Trailing zeros move into the exponent.
+    const ExactParts tenth = exact_parts(BigReal("0.1"));
+    EXPECT_TRUE(ctx, tenth.mantissa == 1);
+    EXPECT_EQ(ctx, tenth.exponent, -1);
+    EXPECT_EQ(ctx, tenth.radix, 10U);
+    const ExactParts million = exact_parts(BigInt(-1000000));
+    EXPECT_TRUE(ctx, million.negative && million.mantissa == 1);
+    EXPECT_EQ(ctx, million.exponent, 6);
+    const ExactParts half = exact_parts(0.5);
+    EXPECT_TRUE(ctx, half.mantissa == 1);
+    EXPECT_EQ(ctx, half.exponent, -1);
+    EXPECT_EQ(ctx, half.radix, 2U);
+    EXPECT_TRUE(ctx, exact_parts(-0.0).mantissa == 0 && !exact_parts(-0.0).negative);
+    EXPECT_TRUE(ctx, exact_parts(std::numeric_limits<double>::infinity()).kind == Kind::Infinite);
+    EXPECT_TRUE(ctx, exact_parts(BigReal("nan")).kind == Kind::NaN);
+
+    // decimal_parts reads a double as the digits it prints as.
+    const ExactParts shortest = decimal_parts(0.1);
+    EXPECT_TRUE(ctx, shortest.mantissa == 1 && shortest.radix == 10);
+    EXPECT_EQ(ctx, shortest.exponent, -1);
+    EXPECT_TRUE(ctx, to_big_real(decimal_parts(-2.5e-300)) == BigReal("-2.5e-300"));
+    EXPECT_TRUE(ctx, to_big_real(decimal_parts(1e22)) == BigReal("1e22"));
+    EXPECT_TRUE(ctx, to_bin_float(decimal_parts(0.1)) == BF("0.1"));
+
+    // Round trips are exact.
+    const BigReal third = BigReal(1) / 3;
+    EXPECT_TRUE(ctx, to_big_real(exact_parts(third)) == third);
+    EXPECT_TRUE(ctx, to_big_real(exact_parts(BigReal("-1e-99999"))) == BigReal("-1e-99999"));
+    const BF root2 = boost::multiprecision::sqrt(BF(2));
+    EXPECT_TRUE(ctx, to_bin_float(exact_parts(root2)) == root2);
+    EXPECT_TRUE(ctx, to_big_real(exact_parts(0.1)) != BigReal("0.1"));
+
+    // Comparisons are exact across radixes.
+    EXPECT_TRUE(ctx, compare(exact_parts(0.5), exact_parts(BigReal("0.5"))) == 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(0.1), exact_parts(BigReal("0.1"))) > 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(BigInt(3)), exact_parts(3.0)) == 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(-1.0), exact_parts(BigInt(0))) < 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(BigReal("1e400")), exact_parts(1e308)) > 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(BigReal("-1e400")),
+                             exact_parts(-std::numeric_limits<double>::infinity())) > 0);
+    EXPECT_TRUE(ctx, compare(exact_parts(BigReal("nan")), exact_parts(0.0)) ==
+                         std::partial_ordering::unordered);
+    EXPECT_TRUE(ctx, compare(exact_parts(BigReal("1e-5000000")), exact_parts(0x1p-1074)) < 0);
+
+    // Bytes round-trip every kind; malformed input throws.
+    const std::array values{exact_parts(third), exact_parts(root2), exact_parts(-0.0),
+                            exact_parts(-std::numeric_limits<double>::infinity()),
+                            exact_parts(BigReal("nan"))};
+    const std::vector<ExactParts> back = parts_from_bytes(to_bytes(values));
+    EXPECT_EQ(ctx, back.size(), values.size());
+    for (std::size_t k = 0; k < back.size() && k < values.size(); ++k) {
+        EXPECT_TRUE(ctx, back[k].kind == values[k].kind && back[k].negative == values[k].negative &&
+                             back[k].mantissa == values[k].mantissa &&
+                             back[k].exponent == values[k].exponent &&
+                             back[k].radix == values[k].radix);
+    }
+    const std::string bytes = to_bytes(values);
+    EXPECT_THROWS(ctx, parts_from_bytes(""));
+    EXPECT_THROWS(ctx, parts_from_bytes(std::string(1, '\x7f')));
+    EXPECT_THROWS(ctx, parts_from_bytes(bytes.substr(0, bytes.size() - 1)));
+}
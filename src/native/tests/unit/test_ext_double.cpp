@@ -0,0 +1,75 @@
+#include "calc/pub/calculator.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <cmath>
+#include <limits>
+
+namespace {
+
+// |x - expected| / |expected| <= tol, compared in BigReal.
+bool close(const ExtDouble &x, const BigReal &expected, const char *tol) {
+    using boost::multiprecision::abs;
+    return abs(x.to_big() - expected) <= abs(expected) * BigReal(tol);
+}
+
+} // namespace
+
+void unit_ext_double(TestContext &ctx) {
+    using boost::multiprecision::pow;
+    const Calculator c;
+    const BigReal two(2);
+
+    // Construction and conversion.
+    EXPECT_EQ(ctx, ExtDouble(0.75).to_double(), 0.75);
+    EXPECT_TRUE(ctx, ExtDouble(0.0).is_zero() && ExtDouble(0.0).fits_double());
+    EXPECT_TRUE(ctx, ExtDouble(-3.0).is_negative());
+    EXPECT_TRUE(ctx, ExtDouble(std::numeric_limits<long long>::max()).to_big() ==
+                         BigReal(std::numeric_limits<long long>::max()));
+    EXPECT_TRUE(ctx, ExtDouble(-123456789012345678LL).to_big() == BigReal(-123456789012345678LL));
+    EXPECT_THROWS(ctx, ExtDouble(std::numeric_limits<double>::infinity()));
+    EXPECT_TRUE(ctx, close(ExtDouble::from_decimal(0.1), BigReal("0.1"), "1e-30"));
+    EXPECT_TRUE(ctx, close(ExtDouble::from_decimal(-2.5e-300), BigReal("-2.5e-300"), "1e-30"));
+    EXPECT_TRUE(ctx, ExtDouble::from_decimal(1e300).fits_double());
+
+    // Arithmetic keeps the double-double significand.
+    const ExtDouble big = ExtDouble(2.0).pow(2000LL);
+    EXPECT_TRUE(ctx, !big.fits_double() && std::isinf(big.to_double()));
+    EXPECT_TRUE(ctx, close(big, pow(two, 2000), "1e-45"));
+    EXPECT_TRUE(ctx, (big - big).is_zero());
+    EXPECT_TRUE(ctx, (big + ExtDouble(1.0)) == big);
+    EXPECT_TRUE(ctx, close(big * big / big, pow(two, 2000), "1e-30"));
+    EXPECT_TRUE(ctx, close(ExtDouble::from_decimal(1e200) * ExtDouble::from_decimal(1e200),
+                           BigReal("1e400"), "1e-30"));
+    EXPECT_TRUE(ctx, close(ExtDouble(1.0) / ExtDouble(3.0), BigReal(1) / 3, "1e-31"));
+    EXPECT_THROWS(ctx, c.div(big, ExtDouble(0.0)));
+
+    // pow: integer exponents square exactly, fractional ones are good to about an ulp.
+    EXPECT_TRUE(ctx, close(c.pow(ExtDouble(1.5), 2000.0), pow(BigReal("1.5"), 2000), "1e-28"));
+    EXPECT_TRUE(ctx, close(c.pow(ExtDouble(0.5), 5000.0), pow(BigReal("0.5"), 5000), "1e-28"));
+    EXPECT_TRUE(ctx, close(c.pow(ExtDouble(-3.0), 1001.0), -pow(BigReal(3), 1001), "1e-28"));
+    EXPECT_TRUE(
+        ctx, close(c.pow(ExtDouble(2.5), 1000.5), pow(BigReal("2.5"), BigReal("1000.5")), "4e-16"));
+    EXPECT_TRUE(ctx, close(c.pow(ExtDouble::from_decimal(7.3), -400.25),
+                           pow(BigReal("7.3"), BigReal("-400.25")), "4e-16"));
+    EXPECT_TRUE(ctx, c.pow(ExtDouble(0.5), 1e19).is_zero());
+    EXPECT_TRUE(ctx, c.pow(ExtDouble(1.0), 1e19) == ExtDouble(1.0));
+    EXPECT_THROWS(ctx, c.pow(ExtDouble(2.0), 1e19));
+    EXPECT_THROWS(ctx, c.pow(ExtDouble(-2.0), 0.5));
+    EXPECT_THROWS(ctx, c.pow(ExtDouble(0.0), -1.0));
+
+    // sqrt, ln and log.
+    EXPECT_TRUE(ctx,
+                close(c.sqrt(ExtDouble(2.0).pow(2001LL)), sqrt(two) * pow(two, 1000), "1e-30"));
+    EXPECT_TRUE(ctx, close(c.ln(big), 2000 * log(two), "1e-16"));
+    EXPECT_TRUE(ctx, close(c.log(ExtDouble(10.0).pow(400LL)), BigReal(400), "1e-16"));
+    EXPECT_THROWS(ctx, c.sqrt(-big));
+    EXPECT_THROWS(ctx, c.ln(ExtDouble(0.0)));
+
+    // fact and gamma past double's range.
+    EXPECT_TRUE(ctx, close(c.fact(ExtDouble(200.0)), to_big_real(c.factorial(200)), "1e-18"));
+    EXPECT_TRUE(ctx, close(c.fact(ExtDouble(3000.0)), to_big_real(c.factorial(3000)), "1e-17"));
+    EXPECT_TRUE(ctx, close(c.gamma(ExtDouble(200.5)), c.gamma(BigReal("200.5")), "1e-15"));
+    EXPECT_TRUE(ctx, c.fact(ExtDouble(10.0)) == ExtDouble(3628800.0));
+    EXPECT_THROWS(ctx, c.fact(ExtDouble(2.5)));
+    EXPECT_THROWS(ctx, c.fact(big));
+}
@@ -0,0 +1,244 @@
+#include "internal/test_helpers.hpp"
+#include "parser/pub/parser.hpp"
+
+#include <random>
+#include <utility>
+#include <string>
+#include <vector>
+
+namespace {
+
+using tcalc::ops::LiteralKind;
+using tcalc::ops::OpId;
+using tcalc::ops::Token;
+using tcalc::ops::TokenKind;
+
+std::string rpn_text(const std::vector<Token> &rpn) {
+    std::string out;
+    for (const Token &tok : rpn) {
+        if (!out.empty()) {
+            out += ' ';
+        }
+        if (tok.kind == TokenKind::Number) {
+            out += tok.value;
+        } else {
+            out += tcalc::ops::op_spec(tok.op_id)->symbol;
+        }
+    }
+    return out;
+}
+
+std::string compiled(const char *expression) {
+    return rpn_text(tcalc::ops::compile(expression).rpn());
+}
+
+std::string token_text(const std::vector<Token> &tokens) {
+    std::string out;
+    for (const Token &tok : tokens) {
+        out += '[';
+        switch (tok.kind) {
+        case TokenKind::Number:
+            out += tok.value;
+            break;
+        case TokenKind::LParen:
+            out += '(';
+            break;
+        case TokenKind::RParen:
+            out += ')';
+            break;
+        case TokenKind::Op:
+            out += tcalc::ops::op_spec(tok.op_id)->symbol;
+            break;
+        }
+        out += ']';
+    }
+    return out;
+}
+
+} // namespace
+
+void unit_parser(TestContext &ctx) {
+    EXPECT_EQ(ctx, compiled("1 + 2 x 3"), std::string("1 2 3 x +"));
+    EXPECT_EQ(ctx, compiled("2 ^ 3 ^ 2"), std::string("2 3 2 ^ ^"));
+    EXPECT_EQ(ctx, compiled("(1 + 2) * 3"), std::string("1 2 + 3 x"));
+    EXPECT_EQ(ctx, compiled("2(3)"), std::string("2 3 x"));
+    EXPECT_EQ(ctx, compiled("3 - - 2"), std::string("3 2 u- -"));
+    EXPECT_EQ(ctx, compiled("3 -+ 2"), std::string("3 2 -"));
+    EXPECT_EQ(ctx, compiled("-4 ⌄ 2"), std::string("4 2 ⌄ u-"));
+    EXPECT_EQ(ctx, compiled("sin(30)5!"), std::string("30 sin 5 ! x"));
+    EXPECT_EQ(ctx, compiled("1.5e3i + 2"), std::string("1.5e3i 2 +"));
+    EXPECT_EQ(ctx, compiled(""), std::string());
+
+    // compile() must agree with the staged pipeline it replaces.
+    for (const char *expr : {"1+2x3-4÷5", "√(2)^3!", "10 mod 3 div 2", "5 nCm 2 + 4 nPm 2",
+                             "log10(100)ln(e)", "((1+2)", "1+2)", "--3", "2 ³√ 8 ²"}) {
+        const auto program = tcalc::ops::compile(expr);
+        const auto staged = tcalc::ops::shunting_yard(tcalc::ops::tokenize(expr));
+        EXPECT_EQ(ctx, rpn_text(program.rpn()), rpn_text(staged));
+        EXPECT_EQ(ctx, program.tokens().size(), tcalc::ops::tokenize(expr).size());
+        EXPECT_EQ(ctx, program.expression(), std::string(expr));
+        EXPECT_TRUE(ctx,
+                    program.byte_size() >= sizeof(tcalc::ops::Program) +
+                                               program.rpn().size() * sizeof(tcalc::ops::Token));
+    }
+
+    const auto normalized = tcalc::ops::normalize(tcalc::ops::tokenize("2(1 - + 1)"));
+    EXPECT_EQ(ctx, normalized.size(), std::size_t{7});
+    EXPECT_TRUE(ctx, normalized[1].kind == TokenKind::Op && normalized[1].op_id == OpId::Mul);
+    EXPECT_TRUE(ctx, normalized[4].op_id == OpId::Sub);
+
+    // Every symbol and alias is matched whole by the operator trie.
+    for (const auto &entry : tcalc::ops::kTokenTable) {
+        const auto toks = tcalc::ops::tokenize(std::string("1") + std::string(entry.token));
+        EXPECT_EQ(ctx, toks.size(), std::size_t{2});
+        EXPECT_TRUE(ctx, toks.size() == 2 && toks[1].op_id == entry.spec->id);
+    }
+
+    // Longest match across shared UTF-8 prefixes, and identifiers split at operators.
+    EXPECT_EQ(ctx, compiled("2³√8"), std::string("2 8 ³√ x"));
+    EXPECT_EQ(ctx, compiled("2³"), std::string("2 ³"));
+    EXPECT_EQ(ctx, compiled("2π√9"), std::string("2 π x 9 √ x"));
+    EXPECT_EQ(ctx, compiled("abc+1"), std::string("abc 1 +"));
+    EXPECT_EQ(ctx, compiled("\t1\n+\r\n2 "), std::string("1 2 +"));
+
+    // Long inputs exercise the 8-byte digit and space runs.
+    std::string long_expr;
+    for (int k = 0; k < 500; ++k) {
+        long_expr += "12345678901234567.000000001e+10          + ";
+    }
+    long_expr += "1";
+    const auto long_toks = tcalc::ops::tokenize(long_expr);
+    EXPECT_EQ(ctx, long_toks.size(), std::size_t{1001});
+    EXPECT_EQ(ctx, long_toks[0].value, std::string("12345678901234567.000000001e+10"));
+    EXPECT_TRUE(ctx, long_toks[0].literal.kind == LiteralKind::Big);
+
+    // Number tokens carry their literal, typed as parse_number_token would type it.
+    const auto literal = [](const char *text) { return tcalc::ops::classify_literal(text); };
+    EXPECT_TRUE(ctx, literal("42").kind == LiteralKind::Int && literal("42").integer == 42);
+    EXPECT_TRUE(ctx, literal("2.5").kind == LiteralKind::Real && literal("2.5").real == 2.5);
+    EXPECT_TRUE(ctx, literal(".5").kind == LiteralKind::Real && literal(".5").real == 0.5);
+    EXPECT_TRUE(ctx, literal("1e5").kind == LiteralKind::Big);
+    EXPECT_TRUE(ctx, literal("99999999999999999999").kind == LiteralKind::Big);
+    EXPECT_TRUE(ctx, literal("3i").kind == LiteralKind::Imag && literal("3i").real == 3.0);
+    EXPECT_TRUE(ctx, literal("i2.5").kind == LiteralKind::Imag && literal("i2.5").real == 2.5);
+    EXPECT_TRUE(ctx, literal("i").kind == LiteralKind::Imag && literal("i").real == 1.0);
+    EXPECT_TRUE(ctx, literal("1.5e3i").kind == LiteralKind::Imag && literal("1.5e3i").real == 1500);
+    EXPECT_TRUE(ctx, literal("e").kind == LiteralKind::E);
+    EXPECT_TRUE(ctx, literal("π").kind == LiteralKind::Pi && literal("pi").kind == LiteralKind::Pi);
+    for (const char *bad : {"", "abc", "1.2.3", "ii", "e5", "1e"}) {
+        EXPECT_TRUE(ctx, literal(bad).kind == LiteralKind::Invalid);
+    }
+    const auto typed = tcalc::ops::tokenize("12 + 2.5 x 3I - abc");
+    EXPECT_TRUE(ctx, typed[0].literal.kind == LiteralKind::Int && typed[0].literal.integer == 12);
+    EXPECT_TRUE(ctx, typed[2].literal.kind == LiteralKind::Real);
+    EXPECT_TRUE(ctx, typed[4].literal.kind == LiteralKind::Imag && typed[4].literal.real == 3.0);
+    EXPECT_TRUE(ctx, typed[6].literal.kind == LiteralKind::Invalid);
+    EXPECT_TRUE(ctx, typed[1].literal.kind == LiteralKind::None);
+}
+
+void unit_token_buffer(TestContext &ctx) {
+    for (const char *expr : {"", "12 + sin(3I) x √π", "1.5e3i - -2", "abcI ³√ 27!", "  (1)(2)  "}) {
+        const auto buffer = tcalc::ops::tokenize_buffer(expr);
+        const auto tokens = tcalc::ops::tokenize(expr);
+        std::vector<Token> rebuilt;
+        for (std::size_t i = 0; i < buffer.size(); ++i) {
+            rebuilt.push_back(buffer.token(i));
+        }
+        EXPECT_EQ(ctx, buffer.size(), tokens.size());
+        EXPECT_EQ(ctx, token_text(rebuilt), token_text(tokens));
+        for (std::size_t i = 0; i < rebuilt.size() && i < tokens.size(); ++i) {
+            EXPECT_TRUE(ctx, rebuilt[i].literal.kind == tokens[i].literal.kind);
+        }
+        EXPECT_EQ(ctx, buffer.source(), std::string(expr));
+    }
+
+    const auto buffer = tcalc::ops::tokenize_buffer("12 + √(3I)");
+    EXPECT_EQ(ctx, buffer.size(), std::size_t{6});
+    EXPECT_TRUE(ctx, buffer.kinds()[1] == TokenKind::Op && buffer.op_ids()[1] == OpId::Add);
+    EXPECT_EQ(ctx, buffer.offsets()[2], std::uint32_t{5});
+    EXPECT_EQ(ctx, buffer.lengths()[2], std::uint32_t{3}); // "√" is three UTF-8 bytes
+    EXPECT_EQ(ctx, std::string(buffer.text(4)), std::string("3I"));
+    EXPECT_EQ(ctx, buffer.value(4), std::string("3i"));
+    EXPECT_EQ(ctx, tcalc::ops::tokenize_buffer("abcI").value(0), std::string("abcI"));
+}
+
+void unit_incremental_parser(TestContext &ctx) {
+    using tcalc::ops::IncrementalParser;
+
+    IncrementalParser parser;
+    EXPECT_TRUE(ctx, !parser.complete());
+
+    parser.append("12");
+    EXPECT_TRUE(ctx, parser.complete());
+    parser.append(" + ");
+    EXPECT_TRUE(ctx, !parser.complete());
+    parser.append("s");
+    parser.append("in(");
+    EXPECT_EQ(ctx, parser.paren_depth(), 1);
+    EXPECT_TRUE(ctx, !parser.complete());
+    parser.append("3");
+    EXPECT_TRUE(ctx, parser.complete());
+    EXPECT_EQ(ctx, rpn_text(parser.rpn()), std::string("12 3 sin +"));
+
+    parser.backspace();
+    parser.backspace();
+    EXPECT_EQ(ctx, parser.text(), std::string("12 + sin"));
+    EXPECT_EQ(ctx, parser.paren_depth(), 0);
+    EXPECT_TRUE(ctx, !parser.complete());
+
+    // Multi-byte symbols go away in one step and can be rebuilt from their prefix.
+    parser.assign("2³");
+    parser.append("√8");
+    EXPECT_EQ(ctx, rpn_text(parser.rpn()), std::string("2 8 ³√ x"));
+    parser.backspace(2);
+    EXPECT_EQ(ctx, parser.text(), std::string("2³"));
+    EXPECT_TRUE(ctx, parser.complete());
+    parser.assign("1e");
+    parser.append("5");
+    EXPECT_EQ(ctx, token_text(parser.tokens()), std::string("[1e5]"));
+
+    const std::pair<const char *, bool> completeness[] = {
+        {"5 x + 3", false}, {"+2", false},    {"()", false}, {"!", false},     {"√", false},
+        {"2 ⌄", false},     {"5 -+ 3", true}, {"4!", true},  {"(1)(2)", true}, {"(1", true},
+    };
+    for (const auto &[expr, expected] : completeness) {
+        parser.assign(expr);
+        EXPECT_EQ(ctx, parser.complete(), expected);
+    }
+
+    // The incremental token buffer carries the same spans as a fresh scan.
+    parser.assign("12 + sin(3I) x √π");
+    const auto spans = parser.token_buffer();
+    const auto fresh = tcalc::ops::tokenize_buffer(parser.text());
+    EXPECT_TRUE(ctx, spans.offsets() == fresh.offsets() && spans.lengths() == fresh.lengths());
+
+    // Random edits must leave the same state as parsing the text from scratch.
+    const std::vector<std::string> pieces = {
+        "1", "2", "0", ".",  "e",    "+", "-",   " ",   "x",   "÷", "(", ")",  "i", "³", "√",
+        "²", "!", "s", "in", "sqrt", "f", "act", "mod", "nCm", "π", "⌄", "⁻¹", "E", "%", "log",
+    };
+    std::mt19937 rng(12345);
+    std::uniform_int_distribution<std::size_t> pick(0, pieces.size() - 1);
+    std::uniform_int_distribution<int> action(0, 9);
+
+    parser.clear();
+    bool consistent = true;
+    for (int step = 0; step < 4000 && consistent; ++step) {
+        const int a = action(rng);
+        if (a < 6) {
+            parser.append(pieces[pick(rng)]);
+        } else if (a < 9) {
+            parser.backspace();
+        } else {
+            std::string text = parser.text();
+            text.insert(text.size() / 2, pieces[pick(rng)]);
+            parser.assign(text);
+        }
+
+        const auto program = tcalc::ops::compile(parser.text());
+        consistent = token_text(parser.tokens()) == token_text(program.tokens()) &&
+                     rpn_text(parser.rpn()) == rpn_text(program.rpn()) &&
+                     rpn_text(parser.program()->rpn()) == rpn_text(program.rpn());
+    }
+    EXPECT_TRUE(ctx, consistent);
+}
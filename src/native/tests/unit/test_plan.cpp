@@ -0,0 +1,195 @@
+#include "eval/pub/plan.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <optional>
+#include <string>
+#include <variant>
+#include <vector>
+
+namespace {
+
+using tcalc::eval::Number;
+using tcalc::eval::Plan;
+
+Plan plan(const char *expression) {
+    return Plan(tcalc::ops::compile(expression).rpn());
+}
+
+std::optional<Number> try_run(const Plan &p, Calculator::AngleUnit unit) {
+    try {
+        return p.run(unit);
+    } catch (const CalculatorError &) {
+        return std::nullopt;
+    }
+}
+
+std::optional<Number> try_rpn(const char *expression, Calculator::AngleUnit unit) {
+    try {
+        return tcalc::eval::evaluate_rpn(tcalc::ops::compile(expression).rpn(), unit);
+    } catch (const CalculatorError &) {
+        return std::nullopt;
+    }
+}
+
+bool same(const std::optional<Number> &a, const std::optional<Number> &b) {
+    if (!a || !b) {
+        return !a && !b;
+    }
+    if (a->index() != b->index()) {
+        return false;
+    }
+    return std::visit(
+        [&](const auto &x) {
+            using T = std::decay_t<decltype(x)>;
+            const T &y = std::get<T>(*b);
+            if constexpr (std::is_same_v<T, double>) {
+                return x == y || (std::isnan(x) && std::isnan(y));
+            } else {
+                return x == y;
+            }
+        },
+        *a);
+}
+
+} // namespace
+
+void unit_plan(TestContext &ctx) {
+    using U = Calculator::AngleUnit;
+
+    // Literal chains fold completely at build time.
+    const Plan arith = plan("1 + 2 x 3 - 4");
+    EXPECT_EQ(ctx, arith.folded_count(), std::size_t{3});
+    EXPECT_EQ(ctx, tcalc::eval::to_real(arith.run(U::DEG)), 3.0);
+
+    // Repeated subexpressions share one node; trig stays per unit.
+    const Plan shared = plan("sin(30) x 2 + sin(30) x 3");
+    EXPECT_EQ(ctx, shared.nodes().size(), std::size_t{7});
+    EXPECT_EQ(ctx, shared.folded_count(), std::size_t{0});
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(shared.run(U::DEG)), 2.5));
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(shared.run(U::RAD)), 5 * std::sin(30.0)));
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(shared.run(U::DEG)), 2.5));
+
+    EXPECT_EQ(ctx, plan("2 x 3 + 2 x 3").nodes().size(), std::size_t{4});
+    EXPECT_EQ(ctx, plan("2 x 3 + 3 x 2").nodes().size(), std::size_t{5});
+
+    // Errors are not folded away; they surface from run().
+    EXPECT_THROWS(ctx, plan("1 ÷ 0 + 1").run(U::DEG));
+    EXPECT_THROWS(ctx, plan("abc + 1").run(U::DEG));
+    EXPECT_THROWS(ctx, plan("5 +").run(U::DEG));
+    EXPECT_THROWS(ctx, plan("").run(U::DEG));
+
+    // The plan gives the same types and values as the plain RPN interpreter.
+    bool consistent = true;
+    for (const char *expr : {"1+2x3",
+                             "2^400",
+                             "1/3",
+                             "√(-4)",
+                             "5!",
+                             "-3+-2",
+                             "2(3)",
+                             "1e400x2",
+                             "7 div 2",
+                             "2^(7 div 2)",
+                             "50%",
+                             "3²",
+                             "4⁻¹",
+                             "0⁻¹",
+                             "⏨(2.5)",
+                             "exp(i)",
+                             "sin(30)+cos(30)",
+                             "cos(1e400)",
+                             "asin(2)",
+                             "(-8)⌄3",
+                             "(-4)⌄2",
+                             "5 nCm 2",
+                             "10 mod 3",
+                             "Γ(0.5)",
+                             "200!",
+                             "1e300x1e300",
+                             "i^2",
+                             "(1+i)(1-i)",
+                             "1e400+i",
+                             "sinh(e)",
+                             "∠(90)+∠(90)",
+                             "³√(i)",
+                             "π2",
+                             "0.1+0.1+0.1",
+                             "2^1000.5",
+                             "(-2)^0.5",
+                             "0^-1",
+                             "tan(90)",
+                             "tan(90)+1÷0",
+                             "sin(0.5)xsin(0.5)xsin(0.5)",
+                             "1+2)",
+                             "((1+2)"}) {
+        for (const U unit : {U::DEG, U::RAD, U::GRAD}) {
+            consistent = consistent && same(try_run(plan(expr), unit), try_rpn(expr, unit));
+        }
+    }
+    EXPECT_TRUE(ctx, consistent);
+
+    // The non-throwing path reports the same failures as statuses.
+    bool statuses = true;
+    for (const char *expr :
+         {"1 ÷ 0 + 1", "abc + 1", "5 +", "", "√(", "tan(90)", "0⁻¹", "2 + 3", "sin(30)",
+          "1 ÷ 0 x abc", "abc x (1 ÷ 0)", "1 ÷ sin(0)", "ln(sin(0))", "(sin(30) - 1.5)!",
+          "Γ(sin(0))", "sin(0)^(-2)", "5 mod sin(0)", "(sin(90)√(-1))!"}) {
+        const auto program = tcalc::ops::compile(expr);
+        tcalc::eval::ErrorKind expected = tcalc::eval::ErrorKind::Ok;
+        try {
+            tcalc::eval::evaluate(program, U::DEG);
+        } catch (const std::exception &e) {
+            expected = tcalc::eval::error_kind(e);
+        }
+        const auto outcome = tcalc::eval::try_evaluate(program, U::DEG);
+        statuses = statuses && outcome.status == expected;
+    }
+    EXPECT_TRUE(ctx, statuses);
+
+    // operand_error only reports operands that apply() really rejects, with the same kind.
+    const Calculator calc;
+    const std::vector<Number> operands = {0LL,
+                                          -1LL,
+                                          3LL,
+                                          0.0,
+                                          -2.0,
+                                          0.5,
+                                          2.5,
+                                          tcalc::eval::Complex(0.0),
+                                          tcalc::eval::Complex(0.0, 1.0),
+                                          BigReal(0),
+                                          BigReal("-3"),
+                                          BigReal("1e-400"),
+                                          ExtDouble(0.0)};
+    bool agrees = true;
+    for (std::size_t op = 0; op < static_cast<std::size_t>(tcalc::ops::OpId::Count); ++op) {
+        const auto id = static_cast<tcalc::ops::OpId>(op);
+        for (const auto &a : operands) {
+            for (const auto &b : operands) {
+                if (tcalc::eval::operand_error(id, a, b) == tcalc::eval::ErrorKind::Ok) {
+                    continue;
+                }
+                tcalc::eval::ErrorKind kind = tcalc::eval::ErrorKind::Ok;
+                try {
+                    tcalc::eval::apply(calc, id, a, b, U::DEG);
+                } catch (const std::exception &e) {
+                    kind = tcalc::eval::error_kind(e);
+                }
+                agrees = agrees && kind == tcalc::eval::ErrorKind::MathErr;
+            }
+        }
+    }
+    EXPECT_TRUE(ctx, agrees);
+    const auto ok = tcalc::eval::try_evaluate(tcalc::ops::compile("sin(30) x 4"), U::DEG);
+    EXPECT_TRUE(ctx, ok.status == tcalc::eval::ErrorKind::Ok);
+    EXPECT_TRUE(ctx, approx(tcalc::eval::to_real(ok.value), 2.0));
+
+    // Programs build their plan once and share it; its size then counts toward theirs.
+    const auto program = tcalc::ops::compile("sin(30) + 1");
+    const std::size_t unplanned = program.byte_size();
+    EXPECT_TRUE(ctx, tcalc::eval::optimize(program) == tcalc::eval::optimize(program));
+    EXPECT_EQ(ctx, program.byte_size(), unplanned + tcalc::eval::optimize(program)->byte_size());
+    const std::string listing = tcalc::eval::dump(program);
+    EXPECT_TRUE(ctx, listing.find("rpn (4 tokens)") != std::string::npos);
+    EXPECT_TRUE(ctx, listing.find("per unit") != std::string::npos);
+}
@@ -0,0 +1,107 @@
+#include "calc/pub/calculator.hpp"
+#include "eval/pub/batch.hpp"
+#include "eval/pub/plan.hpp"
+#include "internal/test_helpers.hpp"
+
+#include <atomic>
+#include <string>
+#include <thread>
+#include <variant>
+#include <vector>
+
+namespace {
+
+// |a - b| <= 10^-digits, as BigReal.
+bool agree(const BigReal &a, const BigReal &b, int digits) {
+    using boost::multiprecision::abs;
+    return abs(a - b) <= BigReal("1e-" + std::to_string(digits));
+}
+
+} // namespace
+
+void unit_precision(TestContext &ctx) {
+    using U = Calculator::AngleUnit;
+
+    EXPECT_EQ(ctx, digits10(Precision::Digits500), 500u);
+    EXPECT_TRUE(ctx, precision_from_digits(100) == Precision::Digits100);
+    EXPECT_TRUE(ctx, !precision_from_digits(30));
+    EXPECT_TRUE(ctx, Calculator().precision() == default_precision());
+
+    // Every tier agrees with the 500-digit kernels to its own digits, less guard digits.
+    const Calculator reference(nullptr, Precision::Digits500);
+    for (const Precision tier : {Precision::Digits20, Precision::Digits50, Precision::Digits100}) {
+        const Calculator calc(nullptr, tier);
+        const int digits = static_cast<int>(digits10(tier)) - 2;
+        const int stored = digits < 45 ? digits : 45; // results are stored as BigReal
+        EXPECT_TRUE(ctx, agree(calc.sqrt(BigReal(2)), reference.sqrt(BigReal(2)), stored));
+        EXPECT_TRUE(ctx, agree(calc.ln(BigReal(7)), reference.ln(BigReal(7)), stored));
+        EXPECT_TRUE(ctx, agree(calc.pow(BigReal("1.5"), BigReal("2.5")),
+                               reference.pow(BigReal("1.5"), BigReal("2.5")), stored));
+        EXPECT_TRUE(ctx, agree(calc.gamma(BigReal("10.5")) / BigReal(1'000'000),
+                               reference.gamma(BigReal("10.5")) / BigReal(1'000'000), stored));
+    }
+
+    // Large degree arguments reduce exactly at 500 digits: 10^30 - 250 is 30 mod 360.
+    const BigReal big = BigReal("1e30") - 250;
+    EXPECT_TRUE(ctx, agree(reference.sin(big, U::DEG), BigReal("0.5"), 45));
+    EXPECT_TRUE(ctx,
+                agree(reference.cos(BigReal(60) + BigReal("36e40"), U::DEG), BigReal("0.5"), 45));
+
+    // A cached plan is rebuilt once the default precision changes.
+    const auto program = tcalc::ops::compile("ln(10^400)+1");
+    const auto first = tcalc::eval::optimize(program);
+    EXPECT_TRUE(ctx, tcalc::eval::optimize(program) == first);
+    set_default_precision(Precision::Digits20);
+    const auto rebuilt = tcalc::eval::optimize(program);
+    EXPECT_TRUE(ctx, rebuilt != first && rebuilt->precision() == Precision::Digits20);
+    EXPECT_TRUE(ctx, Calculator().precision() == Precision::Digits20);
+    EXPECT_TRUE(ctx, Calculator(nullptr, Precision::Digits100).precision() == Precision::Digits100);
+    set_default_precision(Precision::Digits50);
+    EXPECT_TRUE(ctx, tcalc::eval::optimize(program)->precision() == Precision::Digits50);
+
+    // An explicit precision evaluates the same program at that precision, without
+    // replacing the shared default plan. 10^400 degrees reduces to a different
+    // angle at 20 digits than at 500, so the results part past the 20th digit.
+    const auto trig = tcalc::ops::compile("sin(10^400)");
+    const auto shared_plan = tcalc::eval::optimize(trig);
+    const tcalc::eval::Number coarse = tcalc::eval::evaluate(trig, U::DEG, Precision::Digits20);
+    const tcalc::eval::Number fine =
+        tcalc::eval::evaluate(trig, U::DEG, Limits{}, Precision::Digits500);
+    const bool both_big =
+        std::holds_alternative<BigReal>(coarse) && std::holds_alternative<BigReal>(fine);
+    EXPECT_TRUE(ctx, both_big);
+    if (both_big) {
+        const BigReal &a = std::get<BigReal>(coarse);
+        const BigReal &b = std::get<BigReal>(fine);
+        EXPECT_TRUE(ctx, agree(a, b, 18) && !agree(a, b, 40));
+    }
+    EXPECT_TRUE(ctx, tcalc::eval::optimize(trig) == shared_plan);
+    EXPECT_TRUE(ctx, tcalc::eval::optimize(trig, nullptr, Precision::Digits100)->precision() ==
+                         Precision::Digits100);
+    const auto batch =
+        tcalc::eval::evaluate_many({"sin(10^400)"}, U::DEG, 1, {}, Precision::Digits20);
+    EXPECT_TRUE(ctx, batch.errors[0] == tcalc::eval::ErrorKind::Ok && batch.values[0] == coarse);
+
+    // One Calculator shared by threads while its precision flips between tiers:
+    // every result is right to the coarser tier's digits.
+    Calculator shared(nullptr, Precision::Digits20);
+    const BigReal root2 = reference.sqrt(BigReal(2));
+    std::atomic<int> wrong{0};
+    std::vector<std::thread> workers;
+    for (int t = 0; t < 4; ++t) {
+        workers.emplace_back([&] {
+            for (int i = 0; i < 200; ++i) {
+                if (!agree(shared.sqrt(BigReal(2)), root2, 18)) {
+                    ++wrong;
+                }
+            }
+        });
+    }
+    for (int i = 0; i < 200; ++i) {
+        shared.set_precision(i % 2 == 0 ? Precision::Digits100 : Precision::Digits20);
+    }
+    for (auto &worker : workers) {
+        worker.join();
+    }
+    EXPECT_EQ(ctx, wrong.load(), 0);
+}
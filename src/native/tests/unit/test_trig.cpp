@@ -1,7 +1,12 @@
 #include "calc/pub/calculator.hpp"
+#include "eval/pub/evaluator.hpp"
 #include "internal/test_helpers.hpp"
 
 #include <complex>
+#include <variant>
+
+#include <boost/math/constants/constants.hpp>
+#include <boost/multiprecision/cpp_bin_float.hpp>
 
 void unit_trig(TestContext &ctx) {
     Calculator c;
@@ -27,4 +32,83 @@ void unit_trig(TestContext &ctx) {
     const Z p = c.polar(90.0, U::DEG);
     EXPECT_TRUE(ctx, approx(std::abs(p), 1.0, 1e-12));
     (void)i;
+
+    // Degrees reduce modulo 360 exactly, even past 2^53: 10^22 = 280 (mod 360).
+    EXPECT_TRUE(ctx, approx(c.sin(1e22, U::DEG), -0.984807753012208, 1e-12));
+    EXPECT_TRUE(ctx, approx(c.cos(Z(1e22, 0.0), U::DEG).real(), 0.17364817766693, 1e-12));
+}
+
+void unit_trig_reduction(TestContext &ctx) {
+    using U = Calculator::AngleUnit;
+    using BF = boost::multiprecision::cpp_bin_float_50;
+    const Calculator c;
+    const BigReal sin80("0.98480775301220805936674302458952301367064325");
+    const BigReal cos80("0.17364817766693034885171662676931479600037568");
+    const BigReal eps("1e-44");
+
+    // Whole quarter turns are exact.
+    EXPECT_TRUE(ctx, c.sin(BigReal(180), U::DEG) == 0);
+    EXPECT_TRUE(ctx, c.cos(BigReal(90), U::DEG) == 0);
+    EXPECT_TRUE(ctx, c.cos(BigReal(-180), U::DEG) == -1);
+    EXPECT_TRUE(ctx, c.sin(BigReal(300), U::GRAD) == -1);
+    EXPECT_THROWS(ctx, c.tan(BigReal(90), U::DEG));
+    EXPECT_THROWS(ctx, c.tan(BigReal(-300), U::GRAD));
+
+    // 10^300 = 280 (mod 360) and 0 (mod 400).
+    EXPECT_TRUE(ctx, approx_big(c.sin(BigReal("1e300"), U::DEG), -sin80, eps));
+    EXPECT_TRUE(ctx, approx_big(c.cos(BigReal("1e300"), U::DEG), cos80, eps));
+    EXPECT_TRUE(ctx, approx_big(c.sin(BigReal("-1e300"), U::DEG), sin80, eps));
+    EXPECT_TRUE(ctx, c.sin(BigReal("1e300"), U::GRAD) == 0);
+    EXPECT_TRUE(ctx, approx_big(c.tan(BigReal("1e40") + 125, U::DEG), BigReal(1), eps));
+
+    // Radians: 2/pi is carried far enough for the argument's integer digits.
+    EXPECT_TRUE(ctx, approx_big(c.sin(BigReal("1e22"), U::RAD),
+                                BigReal("-0.85220084976718880177270589375302936826176"),
+                                BigReal("1e-41")));
+    const BigReal pi50("3.1415926535897932384626433832795028841971693993751");
+    EXPECT_TRUE(ctx, approx_big(c.sin(pi50, U::RAD) * BigReal("1e50"),
+                                BigReal("0.58209749445923078164062862089986280348253421"), eps));
+    const Calculator wide(nullptr, Precision::Digits100);
+    for (const char *x : {"1e300", "-7.25e1000", "123456789.123456789"}) {
+        const BigReal s = c.sin(BigReal(x), U::RAD);
+        const BigReal co = c.cos(BigReal(x), U::RAD);
+        EXPECT_TRUE(ctx, approx_big(s, wide.sin(BigReal(x), U::RAD), eps));
+        EXPECT_TRUE(ctx, approx_big(s * s + co * co, BigReal(1), eps));
+    }
+    EXPECT_THROWS(ctx, c.sin(BigReal("1e20000"), U::RAD));
+
+    // BigComplex reduces its real part the same way.
+    const BigComplex z(BF("1e22"), BF(0));
+    EXPECT_TRUE(ctx, boost::multiprecision::abs(c.sin(z, U::RAD).real() -
+                                                BF("-0.85220084976718880177270589375302936826")) <
+                         BF("1e-38"));
+    EXPECT_TRUE(ctx, boost::multiprecision::abs(c.cos(z, U::DEG).real() - BF(cos80)) < BF("1e-44"));
+    EXPECT_TRUE(ctx, c.sin(BigComplex(BF(180), BF(0)), U::DEG).real() == 0);
+    EXPECT_THROWS(ctx, c.tan(BigComplex(BF(90), BF(0)), U::DEG));
+
+    // A real part past BF's exact integers reduces as the decimal it came from:
+    // sin(x + iy) = sin x cosh y + i cos x sinh y, with x = 10^300 exactly.
+    for (const U unit : {U::DEG, U::RAD}) {
+        const BF y = unit == U::DEG ? boost::math::constants::pi<BF>() / 180 : BF(1);
+        const BF sx(c.sin(BigReal("1e300"), unit));
+        const BF cx(c.cos(BigReal("1e300"), unit));
+        const BigComplex huge(BF(BigReal("1e300")), BF(1));
+        const BigComplex s = c.sin(huge, unit);
+        const BigComplex co = c.cos(huge, unit);
+        EXPECT_TRUE(ctx, boost::multiprecision::abs(s.real() - sx * cosh(y)) < BF("1e-40"));
+        EXPECT_TRUE(ctx, boost::multiprecision::abs(s.imag() - cx * sinh(y)) < BF("1e-40"));
+        EXPECT_TRUE(ctx, boost::multiprecision::abs(co.real() - cx * cosh(y)) < BF("1e-40"));
+        EXPECT_TRUE(ctx, boost::multiprecision::abs(co.imag() + sx * sinh(y)) < BF("1e-40"));
+
+        // The same through an expression, where the sum builds the BigComplex.
+        const auto value = tcalc::eval::evaluate(tcalc::ops::compile("sin(1e300+1i)"), unit);
+        EXPECT_TRUE(ctx, std::holds_alternative<BigComplex>(value));
+        if (std::holds_alternative<BigComplex>(value)) {
+            EXPECT_TRUE(ctx,
+                        boost::multiprecision::abs(std::get<BigComplex>(value) - s) < BF("1e-40"));
+        }
+    }
+    const BigComplex deg = c.sin(BigComplex(BF(BigReal("1e300")), BF(1)), U::DEG);
+    EXPECT_TRUE(ctx, approx(deg.real().convert_to<double>(), -0.98496, 1e-5) &&
+                         approx(deg.imag().convert_to<double>(), 0.00303, 1e-5));
 }
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 from enum import Enum
 
 import calc_native
 from PySide6.QtCore import QSettings
 
+from tcalc.core.context import EvaluationContext
+
 
 class CalculatorMode(Enum):
     """Calculator operation modes."""
@@ -35,6 +38,13 @@ class AppState:
             "show_constant_buttons", False, type=bool
         )
 
+        # Working precision (digits) of the native BigReal kernels
+        precision = self._settings.value("precision", 50, type=int)
+        if precision not in calc_native.precision_tiers():
+            precision = 50
+        self._precision = precision
+        calc_native.set_precision(precision)
+
         # Undo/redo state (not persisted)
         self.history_index: int = -1
         self.redo_cached_exprs: str = ""
@@ -78,14 +88,35 @@ class AppState:
         self._show_constant_buttons = value
         self._settings.setValue("show_constant_buttons", value)
 
+    @property
+    def precision(self) -> int:
+        return self._precision
+
+    @precision.setter
+    def precision(self, value: int) -> None:
+        calc_native.set_precision(value)
+        self._precision = value
+        self._settings.setValue("precision", value)
+
+    def evaluation_context(self, **limits) -> EvaluationContext:
+        """Snapshot of the angle unit and precision for tcalc.core evaluations.
+
+        `limits` (timeout, max_ops, cancel) are passed through to the context.
+        """
+        return EvaluationContext(angle_unit=self.angle_unit, precision=self._precision, **limits)
+
 
 # Global singleton instance
 _app_state: AppState | None = None
+_app_state_lock = threading.Lock()
 
 
 def get_app_state() -> AppState:
     """Get the global application state instance."""
     global _app_state
     if _app_state is None:
-        _app_state = AppState()
+        # Worker threads can race the UI thread to the first call.
+        with _app_state_lock:
+            if _app_state is None:
+                _app_state = AppState()
     return _app_state
@@ -1,18 +1,59 @@
+from typing import TYPE_CHECKING
+
 from .constants import CONSTANTS
+from .context import DEFAULT_CONTEXT, EvaluationContext
 from .engine import Calculator
 from .errors import CalculatorError
-from .ops import (
-    Operation,
-    get_symbols_with_aliases,
+from .ops import get_symbols_with_aliases
+from .parser import (
+    CancelToken,
+    CompileCacheStats,
+    IncrementalParser,
+    clear_compile_cache,
+    compile_cache_stats,
+    compile_expression,
+    configure_compile_cache,
+    evaluate_array,
+    evaluate_many,
+    evaluate_program,
+    evaluate_tokens,
+    tokenize_buffer,
+    tokenize_string,
+    try_evaluate_program,
 )
-from .parser import evaluate_tokens, tokenize_string
+
+if TYPE_CHECKING:
+    from .ops import Operation
 
 __all__ = [
     "Calculator",
     "CalculatorError",
+    "DEFAULT_CONTEXT",
+    "EvaluationContext",
     "Operation",
     "get_symbols_with_aliases",
+    "CancelToken",
+    "CompileCacheStats",
+    "IncrementalParser",
+    "clear_compile_cache",
+    "compile_cache_stats",
+    "compile_expression",
+    "configure_compile_cache",
+    "evaluate_array",
+    "evaluate_many",
+    "evaluate_program",
     "evaluate_tokens",
+    "tokenize_buffer",
     "tokenize_string",
+    "try_evaluate_program",
     "CONSTANTS",
 ]
+
+
+def __getattr__(name: str) -> object:
+    # Operation is built from the native op table on first use; see ops.py.
+    if name == "Operation":
+        from .ops import Operation
+
+        return Operation
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
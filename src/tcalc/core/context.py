@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import calc_native
+
+from .engine import Calculator
+from .errors import ErrorKind, raise_error
+
+# One Calculator per precision, shared by every context and thread.
+_calculators: dict[Optional[int], Calculator] = {}
+_calculators_lock = threading.Lock()
+
+
+def _calculator_for(precision: Optional[int]) -> Calculator:
+    calculator = _calculators.get(precision)
+    if calculator is None:
+        with _calculators_lock:
+            calculator = _calculators.get(precision)
+            if calculator is None:
+                calculator = _calculators[precision] = Calculator(precision)
+    return calculator
+
+
+@dataclass(frozen=True, slots=True)
+class EvaluationContext:
+    """The settings an evaluation reads, fixed for its whole run.
+
+    Passed explicitly instead of read from application state, so evaluations with
+    different settings can run side by side on threads. precision is in digits
+    (one of calc_native.precision_tiers()); None follows calc_native.get_precision().
+    timeout (seconds), max_ops and cancel bound the evaluation. evaluate_program and
+    friends hand all of these to the native evaluator. Derive variants with
+    dataclasses.replace.
+    """
+
+    angle_unit: calc_native.AngleUnit = calc_native.AngleUnit.DEG
+    precision: Optional[int] = None
+    timeout: Optional[float] = None
+    max_ops: Optional[int] = None
+    cancel: Optional[calc_native.CancelToken] = None
+
+    def __post_init__(self) -> None:
+        if self.precision is not None and self.precision not in calc_native.precision_tiers():
+            raise_error(ErrorKind.INVALID, f"Unsupported precision: {self.precision}")
+
+    @property
+    def calculator(self) -> Calculator:
+        """Shared Calculator working at this context's precision."""
+        return _calculator_for(self.precision)
+
+
+DEFAULT_CONTEXT = EvaluationContext()
@@ -1,4 +1,3 @@
-import logging
 from enum import Enum
 
 
@@ -11,13 +10,26 @@ class ErrorKind(Enum):
     INVALID = "Invalid expression"
     MALFORMED = "Malformed Expression"
     MATH_ERR = "Math Error"
+    TIMEOUT = "Timeout"
+    CANCELLED = "Cancelled"
 
 
 class Error(CalculatorError):
     pass
 
 
+def error_kind_from_message(message: object) -> ErrorKind:
+    """Map a native CalculatorError message back to its ErrorKind."""
+    text = str(message).lower()
+    for kind in ErrorKind:
+        if kind.value.lower() == text:
+            return kind
+    return ErrorKind.MATH_ERR
+
+
 def raise_error(kind: ErrorKind, detail: object | None = None) -> None:
+    import logging  # only on the error path; it costs several ms at import
+
     message = kind.value
     if detail:
         logging.error("%s: %s", message, detail)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, cast
 
 import calc_native
 
@@ -61,9 +62,6 @@ class OpSpec:
     cx: Callable[..., bool] | None = None
 
 
-OP_BY_ID: dict[object, OpSpec] = {}
-
-
 _UI_SPECS = (
     ("DIGIT", OpSpec(sym="digit")),
     ("DOT", OpSpec(sym=".")),
@@ -77,46 +75,9 @@ _UI_SPECS = (
 )
 
 
-_specs_by_name: dict[str, OpSpec] = {}
-_operation_values: dict[str, str] = {}
-
-for entry in calc_native.op_table():
-    (
-        op_id,
-        symbol,
-        _precedence,
-        _associativity,
-        arity,
-        aliases,
-        method,
-        needs_unit,
-        big_supported,
-        big_complex_supported,
-    ) = entry
-
-    spec = OpSpec(
-        sym=symbol,
-        arity=arity.name.lower(),
-        als=tuple(aliases),
-        method=method,
-        needs_unit=bool(needs_unit),
-        big=bool(big_supported),
-        bigcx=bool(big_complex_supported),
-        cx=_PROMO_RULES_BY_ID.get(op_id),
-    )
-
-    OP_BY_ID[op_id] = spec
-    name = op_id.name.upper()
-    _specs_by_name[name] = spec
-    _operation_values[name] = method or op_id.name.lower()
-
-for name, spec in _UI_SPECS:
-    _specs_by_name[name] = spec
-    _operation_values[name] = name.lower()
-
-
-class Operation(str, Enum):
+class _Operation(str, Enum):
     _spec: OpSpec
+
     @property
     def spec(self) -> OpSpec:
         return self._spec
@@ -145,16 +106,81 @@ class Operation(str, Enum):
     def token(self) -> str:
         return self._spec.method or self.name.lower()
 
-Operation = Enum("Operation", _operation_values, type=Operation)
-for op in Operation:
-    op._spec = _specs_by_name[op.name]
 
-del _operation_values
-del _specs_by_name
-del _UI_SPECS
+# Built from calc_native.op_table() on first access (module __getattr__ below), so
+# importing tcalc.core does not pay for walking the table and creating the enum.
+# Type checkers see Operation as the class its members are instances of.
+OP_BY_ID: dict[object, OpSpec]
+if TYPE_CHECKING:
+    Operation = _Operation
+
+_tables_lock = threading.Lock()
+
+
+def _build_tables() -> None:
+    global OP_BY_ID, Operation
+    with _tables_lock:
+        if "Operation" in globals():
+            return
+
+        op_by_id: dict[object, OpSpec] = {}
+        specs_by_name: dict[str, OpSpec] = {}
+        operation_values: dict[str, str] = {}
+
+        for entry in calc_native.op_table():
+            (
+                op_id,
+                symbol,
+                _precedence,
+                _associativity,
+                arity,
+                aliases,
+                method,
+                needs_unit,
+                big_supported,
+                big_complex_supported,
+            ) = entry
+
+            spec = OpSpec(
+                sym=symbol,
+                arity=arity.name.lower(),
+                als=tuple(aliases),
+                method=method,
+                needs_unit=bool(needs_unit),
+                big=bool(big_supported),
+                bigcx=bool(big_complex_supported),
+                cx=_PROMO_RULES_BY_ID.get(op_id),
+            )
+
+            op_by_id[op_id] = spec
+            name = op_id.name.upper()
+            specs_by_name[name] = spec
+            operation_values[name] = method or op_id.name.lower()
+
+        for name, spec in _UI_SPECS:
+            specs_by_name[name] = spec
+            operation_values[name] = name.lower()
+
+        operation: type[_Operation] = cast(
+            "type[_Operation]",
+            Enum("Operation", operation_values, type=_Operation, module=__name__),
+        )
+        for op in operation:
+            op._spec = specs_by_name[op.name]
+
+        OP_BY_ID = op_by_id
+        Operation = operation
+
+
+def __getattr__(name: str) -> object:
+    if name in ("OP_BY_ID", "Operation"):
+        _build_tables()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_symbols_with_aliases(filter_fn: Callable[[OpSpec], bool] | None = None) -> set[str]:
+    _build_tables()
     symbols: set[str] = set()
     for op in Operation:
         spec = op._spec
@@ -1,21 +1,152 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 import calc_native
 
-from tcalc.core.errors import ErrorKind, raise_error
+from tcalc.core.errors import ErrorKind, error_kind_from_message, raise_error
 
-from .constants import CONSTANTS
+from . import ops
+from .context import DEFAULT_CONTEXT, EvaluationContext
 from .engine import Calculator
-from .ops import OP_BY_ID
-from .utils import is_number_token, parse_number_token
+from .utils import is_number_token
+
+IncrementalParser = calc_native.IncrementalParser
+CancelToken = calc_native.CancelToken
+
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_CACHE_BYTES = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class CompileCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class _CompileCache:
+    """LRU of compiled programs keyed by expression text, bounded by count and bytes.
+
+    A program grows once it is evaluated (its plan is built on first use), so an
+    entry's size is measured again on every hit. Shared by every thread; the lock
+    keeps the LRU order and the byte count consistent without the GIL. Compiling
+    happens outside it.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._lock = threading.Lock()
+        # expression -> (program, size counted in _nbytes)
+        self._programs: OrderedDict[str, Tuple[calc_native.Program, int]] = OrderedDict()
+        self._nbytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, expression: str) -> calc_native.Program:
+        with self._lock:
+            entry = self._programs.get(expression)
+            if entry is not None:
+                program, size = entry
+                self._programs.move_to_end(expression)
+                self.hits += 1
+                resized = program.nbytes
+                if resized != size:
+                    self._programs[expression] = (program, resized)
+                    self._nbytes += resized - size
+                    self._trim()
+                return program
+            self.misses += 1
+
+        program = calc_native.compile(expression)
+        size = program.nbytes
+        with self._lock:
+            if self.max_entries > 0 and size <= self.max_bytes:
+                # Another thread may have compiled the same text meanwhile.
+                previous = self._programs.pop(expression, None)
+                if previous is not None:
+                    self._nbytes -= previous[1]
+                self._programs[expression] = (program, size)
+                self._nbytes += size
+                self._trim()
+        return program
+
+    def configure(self, max_entries: Optional[int], max_bytes: Optional[int]) -> None:
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, max_entries)
+            if max_bytes is not None:
+                self.max_bytes = max(0, max_bytes)
+            self._trim()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._programs.clear()
+            self._nbytes = 0
+
+    def stats(self) -> CompileCacheStats:
+        with self._lock:
+            return CompileCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._programs),
+                nbytes=self._nbytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+            )
+
+    def _trim(self) -> None:
+        while self._programs and (
+            len(self._programs) > self.max_entries or self._nbytes > self.max_bytes
+        ):
+            _, (_, size) = self._programs.popitem(last=False)
+            self._nbytes -= size
+            self.evictions += 1
+
+
+_compile_cache = _CompileCache(DEFAULT_CACHE_ENTRIES, DEFAULT_CACHE_BYTES)
+
+
+def compile_expression(expression: str) -> calc_native.Program:
+    """Compile an expression, reusing the cached Program for text seen recently."""
+    return _compile_cache.get(expression)
+
+
+def configure_compile_cache(
+    max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+) -> None:
+    """Resize the compiled-expression cache; a budget of 0 disables caching."""
+    _compile_cache.configure(max_entries, max_bytes)
+
+
+def clear_compile_cache() -> None:
+    _compile_cache.clear()
+
+
+def compile_cache_stats() -> CompileCacheStats:
+    return _compile_cache.stats()
 
 
 def tokenize_string(expression: str) -> List[object]:
     return list(calc_native.tokenize_string(expression))
 
 
+def tokenize_buffer(expression: str) -> calc_native.TokenBuffer:
+    """Tokenize into parallel native columns instead of one Python object per token."""
+    return calc_native.tokenize_buffer(expression)
+
+
 def shunting_yard(tokens: Iterable[object]) -> List[object]:
     return list(calc_native.shunting_yard(tokens))
 
@@ -27,43 +158,68 @@ def _pop_operand(operand_stack: List[object], tok: str) -> object:
 
 
 def _coerce_token(tok: object) -> object:
-    if isinstance(tok, str):
-        if tok in CONSTANTS:
-            return CONSTANTS[tok]
-        try:
-            return parse_number_token(tok)
-        except Exception as e:
-            raise_error(ErrorKind.INVALID, f"Parse number token error: {e}")
-    return tok
+    # The tokenizer already parsed the literal; only malformed ones raise here.
+    try:
+        return tok.number
+    except calc_native.CalculatorError as e:
+        raise_error(ErrorKind.INVALID, f"Parse number token error: {e}")
+
 
+def _limit_check(context: EvaluationContext) -> Optional[Callable[[], None]]:
+    """Per-op check of the context's limits, or None when it sets none.
 
-def evaluate_rpn(rpn_tokens: Iterable[object], calculator: Calculator) -> object:
+    max_ops counts operators here, not the kernel steps evaluate_program charges.
+    """
+    cancel, max_ops = context.cancel, context.max_ops
+    deadline = None if context.timeout is None else time.monotonic() + context.timeout
+    if cancel is None and max_ops is None and deadline is None:
+        return None
+    ops = 0
+
+    def check() -> None:
+        nonlocal ops
+        ops += 1
+        if cancel is not None and cancel.cancelled:
+            raise_error(ErrorKind.CANCELLED)
+        if max_ops is not None and ops > max_ops:
+            raise_error(ErrorKind.TIMEOUT)
+        if deadline is not None and time.monotonic() > deadline:
+            raise_error(ErrorKind.TIMEOUT)
+
+    return check
+
+
+def evaluate_rpn(
+    rpn_tokens: Iterable[object],
+    calculator: Calculator,
+    context: EvaluationContext = DEFAULT_CONTEXT,
+) -> object:
     operand_stack: List[object] = []
+    op_by_id = ops.OP_BY_ID
+    unit = context.angle_unit
+    check = _limit_check(context)
 
     for tok in rpn_tokens:
         if is_number_token(tok):
-            operand_stack.append(_coerce_token(tok.value))
+            operand_stack.append(_coerce_token(tok))
             continue
         if tok.kind == calc_native.TokenKind.Op:
-            spec = OP_BY_ID.get(tok.op_id)
+            spec = op_by_id.get(tok.op_id)
+        if check is not None:
+            check()
 
         if spec.arity == "postfix":
             val = _pop_operand(operand_stack, spec.sym)
-            func = getattr(calculator, spec.method, None)
-
-            operand_stack.append(func(val))
+            operand_stack.append(calculator.apply(tok.op_id, val))
             continue
 
         if spec.arity == "unary":
             val = _pop_operand(operand_stack, spec.sym)
-            func = getattr(calculator, spec.method, None)
 
             if spec.needs_unit:
-                from tcalc.app_state import get_app_state
-
-                operand_stack.append(func(val, get_app_state().angle_unit))
+                operand_stack.append(calculator.apply(tok.op_id, val, unit=unit))
             else:
-                operand_stack.append(func(val))
+                operand_stack.append(calculator.apply(tok.op_id, val))
             continue
 
         if spec.arity == "binary":
@@ -74,9 +230,7 @@ def evaluate_rpn(rpn_tokens: Iterable[object], calculator: Calculator) -> object
                 )
             b = operand_stack.pop()
             a = operand_stack.pop()
-            func = getattr(calculator, spec.method, None)
-
-            operand_stack.append(func(a, b))
+            operand_stack.append(calculator.apply(tok.op_id, a, b))
             continue
 
         raise_error(ErrorKind.MALFORMED)
@@ -84,5 +238,118 @@ def evaluate_rpn(rpn_tokens: Iterable[object], calculator: Calculator) -> object
     return operand_stack[0]
 
 
-def evaluate_tokens(tokens: Iterable[object], calculator: Calculator) -> object:
-    return evaluate_rpn(shunting_yard(tokens), calculator)
+def evaluate_tokens(
+    tokens: Iterable[object],
+    calculator: Optional[Calculator] = None,
+    context: EvaluationContext = DEFAULT_CONTEXT,
+) -> object:
+    """Evaluate tokens in Python, reading angle unit, precision and limits from `context`.
+
+    Without a calculator the context's shared one for its precision is used; a
+    calculator passed in keeps its own precision.
+    """
+    if calculator is None:
+        calculator = context.calculator
+    return evaluate_rpn(shunting_yard(tokens), calculator, context)
+
+
+_ERROR_KIND_BY_CODE: dict[int, ErrorKind] = {
+    int(calc_native.ErrorKind.Invalid): ErrorKind.INVALID,
+    int(calc_native.ErrorKind.Malformed): ErrorKind.MALFORMED,
+    int(calc_native.ErrorKind.MathErr): ErrorKind.MATH_ERR,
+    int(calc_native.ErrorKind.Timeout): ErrorKind.TIMEOUT,
+    int(calc_native.ErrorKind.Cancelled): ErrorKind.CANCELLED,
+}
+
+
+def _as_context(context: Union[EvaluationContext, calc_native.AngleUnit]) -> EvaluationContext:
+    # A bare angle unit, as older callers pass, stands for its default context.
+    if isinstance(context, EvaluationContext):
+        return context
+    return EvaluationContext(context)
+
+
+def _native_options(context: EvaluationContext) -> dict[str, object]:
+    """The context's precision and limits as keywords for the calc_native evaluators."""
+    return {
+        "timeout": context.timeout,
+        "max_ops": context.max_ops,
+        "cancel": context.cancel,
+        "precision": context.precision,
+    }
+
+
+def evaluate_many(
+    expressions: Iterable[str],
+    context: Union[EvaluationContext, calc_native.AngleUnit] = DEFAULT_CONTEXT,
+    workers: int = 0,
+) -> Tuple[List[object], List[Optional[ErrorKind]]]:
+    """Compile and evaluate a batch on native threads (workers=0 uses every core).
+
+    Returns (values, errors) in input order; a failed item has value None and its ErrorKind.
+    Every item uses the context's angle unit and precision; its timeout and max_ops
+    apply to each item separately.
+    """
+    context = _as_context(context)
+    values, codes = calc_native.evaluate_many(
+        list(expressions), context.angle_unit, workers, **_native_options(context)
+    )
+    return values, [_ERROR_KIND_BY_CODE.get(code) for code in codes]
+
+
+def evaluate_program(
+    program: calc_native.Program,
+    context: Union[EvaluationContext, calc_native.AngleUnit] = DEFAULT_CONTEXT,
+) -> object:
+    """Evaluate a compiled expression natively; only the result crosses into Python.
+
+    Reads angle unit, precision and limits from `context`. With a timeout, max_ops or
+    cancel token a runaway evaluation raises ErrorKind.TIMEOUT or ErrorKind.CANCELLED
+    instead of running to completion.
+    """
+    context = _as_context(context)
+    try:
+        return program.evaluate(context.angle_unit, **_native_options(context))
+    except calc_native.CalculatorError as exc:
+        raise_error(error_kind_from_message(exc), exc)
+
+
+def try_evaluate_program(
+    program: calc_native.Program,
+    context: Union[EvaluationContext, calc_native.AngleUnit] = DEFAULT_CONTEXT,
+) -> Tuple[Optional[ErrorKind], object]:
+    """evaluate_program for live preview: no exceptions, logging or output.
+
+    Returns (None, value) on success and (ErrorKind, None) on failure.
+    """
+    context = _as_context(context)
+    status, value = program.try_evaluate(context.angle_unit, **_native_options(context))
+    return _ERROR_KIND_BY_CODE.get(int(status)), value
+
+
+def evaluate_array(
+    expression: Union[str, calc_native.Program],
+    variable: str,
+    values: object,
+    context: Union[EvaluationContext, calc_native.AngleUnit] = DEFAULT_CONTEXT,
+) -> Tuple[object, object]:
+    """Evaluate an expression once per array element, with `variable` bound to the element.
+
+    Requires numpy (the ``numpy`` extra). `values` is anything np.asarray accepts;
+    contiguous float64/complex128 arrays are read without copying. Returns
+    (values, errors) with the input's shape: float64 results, or complex128 when any
+    element is complex, and a bool mask of elements that failed (their value is NaN).
+    Errors that do not depend on the element raise like evaluate_program, and so does
+    running out of the context's timeout, max_ops or cancel token, which cover the
+    whole array.
+    """
+    import numpy as np
+
+    context = _as_context(context)
+    program = compile_expression(expression) if isinstance(expression, str) else expression
+    try:
+        return calc_native.evaluate_array(
+            program, variable, np.asarray(values), context.angle_unit, **_native_options(context)
+        )
+    except calc_native.CalculatorError as exc:
+        raise_error(error_kind_from_message(exc), exc)
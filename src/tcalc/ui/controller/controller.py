@@ -1,19 +1,20 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Optional
 
 import calc_native
 
 from tcalc.app_state import AngleUnit, get_app_state
-from tcalc.core import Calculator, evaluate_tokens, tokenize_string
+from tcalc.core import Calculator, IncrementalParser, compile_expression, try_evaluate_program
 from tcalc.core.errors import ErrorKind
 from tcalc.core.ops import Operation, get_symbols_with_aliases
-from tcalc.core.utils import is_number_token
 from tcalc.ui.controller.menubar import EditOperations
 from tcalc.ui.widgets import History
 from tcalc.ui.widgets.calc import Display, TopBar
 
+from ..config import preview as preview_config
 from ..widgets.calc.topbar.defins import MEMORY_KEYS, MemoryKey
+from .preview import PreviewEvaluator
 from .utils import clean_for_expression, format_result
 
 
@@ -37,7 +38,7 @@ class CalculatorController:
 
         self._display.expression_changed.connect(self._on_expression_input)
 
-        self._expression: str = ""
+        self._parser = IncrementalParser()
         self._result: str = ""
         self._just_solved = False
         self._error_text: Optional[str] = None
@@ -55,17 +56,18 @@ class CalculatorController:
         )
         self._operator_symbol_values.discard(Operation.IMAG.symbol)
 
-        # Get unary operator symbols
-        self._unary_operator_symbols = get_symbols_with_aliases(
-            lambda op: getattr(op, "arity", None) == "unary"
-        )
+        self._number_kind = int(calc_native.TokenKind.Number)
+        self._minus_op_ids = {int(calc_native.OpId.Sub), int(calc_native.OpId.Negate)}
 
-        # Get postfix operator symbols
-        self._postfix_operator_symbols = get_symbols_with_aliases(
-            lambda op: getattr(op, "arity", None) == "postfix"
+        # Preview runs off the UI thread; results of superseded expressions are dropped.
+        self._preview = PreviewEvaluator(
+            debounce_ms=int(preview_config["debounce_ms"]),
+            busy_delay_ms=int(preview_config["busy_delay_ms"]),
+            max_threads=int(preview_config["max_threads"]),
+            timeout_ms=int(preview_config["timeout_ms"]),
         )
-
-        self._tokenize_string = tokenize_string
+        self._preview.ready.connect(self._on_preview_ready)
+        self._preview.busy.connect(self._on_preview_busy)
 
         self._history.set_memory("")
         self._compute_and_update()
@@ -111,6 +113,14 @@ class CalculatorController:
         handler(label)
         self._compute_and_update()
 
+    @property
+    def _expression(self) -> str:
+        return self._parser.text
+
+    @_expression.setter
+    def _expression(self, text: str) -> None:
+        self._parser.assign(text)
+
     # -- Handlers ---------------------------------------------------------
 
     def _handle_digit(self, label: str) -> None:
@@ -119,45 +129,56 @@ class CalculatorController:
             self._expression = label
             self._just_solved = False
         else:
-            self._expression += label
+            self._parser.append(label)
 
     def _handle_dot(self) -> None:
         if self._just_solved:
             self._expression = "0."
             self._just_solved = False
         elif "." not in self._expression:
-            self._expression += "."
+            self._parser.append(".")
 
     def _set_operator(self, _label: str, operation: Operation) -> None:
         symbol = operation.symbol
         arity = getattr(operation, "arity", None)
         if arity == "unary":
-            self._expression += f"{symbol}{Operation.OPEN_PAREN.symbol}"
+            self._parser.append(f"{symbol}{Operation.OPEN_PAREN.symbol}")
         elif arity == "binary":
-            self._expression += f" {symbol} "
+            self._parser.append(f" {symbol} ")
         else:
-            self._expression += symbol
+            self._parser.append(symbol)
         self._just_solved = False
 
-    def _evaluate_tokens(self, tokens, calculator):
-        """Call core.evaluate_tokens; on CalculatorError log and return the error text."""
-        try:
-            return evaluate_tokens(tokens, calculator)
-        except Exception as exc:
-            self._error_text = (
-                ErrorKind.MATH_ERR.value
-                if str(exc).lower() == ErrorKind.MATH_ERR.value.lower()
-                else ErrorKind.INVALID.value
-            )
-            print("Evalute token native error: ", exc)
+    def _evaluate_program(self, program):
+        """Evaluate through core.try_evaluate_program; on failure set the error text, return None."""
+        status, value = try_evaluate_program(program, self._app_state.evaluation_context())
+        if status is not None:
+            self._set_error(status)
+        return value
+
+    def _set_error(self, kind: ErrorKind) -> None:
+        self._error_text = (
+            ErrorKind.MATH_ERR.value if kind is ErrorKind.MATH_ERR else ErrorKind.INVALID.value
+        )
 
     def _handle_equals(self) -> None:
         """Evaluate expression, update history and show result."""
-        tokens = self._tokenize_expression()
-        if not tokens:
+        program = self._compile_expression()
+        if not program.tokens:
             return
 
-        value = self._evaluate_tokens(tokens, self._calculator)
+        # Reuse a preview that already finished this input; one still running is
+        # cancelled rather than waited for.
+        outcome = self._preview.finished_result(
+            self._expression, self._app_state.evaluation_context()
+        )
+        self._preview.cancel()
+        if outcome is None:
+            value = self._evaluate_program(program)
+        else:
+            status, value = outcome
+            if status is not None:
+                self._set_error(status)
         if value is None:
             self._force_error_display = True
             return None
@@ -180,8 +201,7 @@ class CalculatorController:
         self._just_solved = False
 
     def _handle_backspace(self) -> None:
-        if self._expression:
-            self._expression = self._expression[:-1]
+        self._parser.backspace()
         self._just_solved = False
 
     def _handle_negate(self) -> None:
@@ -191,42 +211,39 @@ class CalculatorController:
             self._expression = "" if self._expression else Operation.SUB.symbol
             return
 
-        tokens = self._tokenize_expression()
-
-        texts = [self._token_text(t) for t in tokens]
-
-        for i in range(len(texts) - 1, -1, -1):
-            txt = texts[i]
+        buf = self._parser.token_buffer()
+        op_ids = buf.op_ids
 
-            if txt in self._operator_symbol_values:
+        for i in range(len(buf) - 1, -1, -1):
+            if self._is_operator_token(buf, i):
                 continue
 
-            # Determine if previous text is unary minus attached to this token
+            # Determine if previous token is unary minus attached to this token
             unary_prev = (
                 i > 0
-                and texts[i - 1] == Operation.SUB.symbol
-                and (
-                    i == 1
-                    or texts[i - 2] in self._operator_symbol_values
-                    or texts[i - 2] == Operation.OPEN_PAREN.symbol
-                )
+                and op_ids[i - 1] in self._minus_op_ids
+                and (i == 1 or self._is_operator_token(buf, i - 2))
             )
 
+            # Offsets are UTF-8 byte spans into the source
+            source = buf.source.encode()
             if unary_prev:
-                texts.pop(i - 1)
+                start = buf.offsets[i - 1]
+                source = source[:start] + source[start + buf.lengths[i - 1] :]
             else:
-                texts.insert(i, Operation.SUB.symbol)
+                start = buf.offsets[i]
+                source = source[:start] + Operation.SUB.symbol.encode() + source[start:]
 
-            self._expression = "".join(str(t) for t in texts)
+            self._expression = source.decode()
             return
 
     def _handle_memory(self, op: str) -> None:
         def current_value():
-            tokens = self._tokenize_expression()
-            if not tokens:
+            program = self._compile_expression()
+            if not program.tokens:
                 return None
 
-            return self._evaluate_tokens(tokens, self._calculator)
+            return self._evaluate_program(program)
 
         def recall():
             if self._app_state.memory is None:
@@ -236,7 +253,7 @@ class CalculatorController:
                 self._expression = token
                 self._just_solved = False
             else:
-                self._expression += token
+                self._parser.append(token)
 
         def store(value):
             self._app_state.memory = value
@@ -320,57 +337,22 @@ class CalculatorController:
 
     # -- Helpers ----------------------------------------------------------
 
-    def _tokenize_expression(self) -> List[object]:
-        return self._tokenize_string(self._expression)
-
-    def _token_text(self, tok: object) -> object:
-        if tok.kind == calc_native.TokenKind.Number:
-            return tok.value
-        if tok.kind == calc_native.TokenKind.Op:
-            if tok.op_id == calc_native.OpId.Negate:
-                return Operation.SUB.symbol
-            return tok.symbol
-        if tok.kind == calc_native.TokenKind.LParen:
-            return Operation.OPEN_PAREN.symbol
-        if tok.kind == calc_native.TokenKind.RParen:
-            return Operation.CLOSE_PAREN.symbol
-
-    def _can_compute_preview(self, tokens: List[object]) -> bool:
-        """Check if tokens form a valid expression for preview calculation."""
-        if not tokens:
-            return False
-
-        if len(tokens) == 1:
-            return is_number_token(tokens[0])
+    def _compile_expression(self) -> calc_native.Program:
+        # Through the compile cache: the preview of this text already built its plan.
+        return compile_expression(self._expression)
 
-        last_text = self._token_text(tokens[-1])
-        if not last_text:
-            return False
-        if last_text == Operation.OPEN_PAREN.symbol:
-            return False
-        if last_text in self._postfix_operator_symbols:
-            return True
-        if last_text in self._unary_operator_symbols:
-            return False
-        if last_text == Operation.CLOSE_PAREN.symbol:
+    def _is_operator_token(self, buf: calc_native.TokenBuffer, i: int) -> bool:
+        if buf.kinds[i] != self._number_kind:
             return True
-        if last_text in self._operator_symbol_values:
-            return False
-        return True
+        return buf.text(i) in self._operator_symbol_values
 
-    def _compute_preview(self, tokens: List[object], can_preview: bool) -> str:
-        """Evaluate tokens and return formatted result"""
+    def _on_preview_ready(self, status: Optional[ErrorKind], value: object) -> None:
+        """Show a finished preview; a failed preview leaves the result line empty."""
+        self._result = "" if status is not None else format_result(value)
+        self._display.update_res(self._result)
 
-        if not can_preview:
-            return ""
-
-        value = self._evaluate_tokens(tokens, self._calculator)
-        if value is None:
-            return None
-
-        formatted = format_result(value)
-        self._result = formatted
-        return formatted
+    def _on_preview_busy(self) -> None:
+        self._display.update_res(str(preview_config["busy_text"]))
 
     def _on_expression_input(self, text: str) -> None:
         """Handle keyboard input"""
@@ -391,11 +373,18 @@ class CalculatorController:
         return True
 
     def _compute_and_update(self) -> None:
-        """Recalculate preview and update display."""
-        tokens = self._tokenize_expression()
-        self._can_preview = self._can_compute_preview(tokens)
-        self._result = self._compute_preview(tokens, self._can_preview)
+        """Update the display and schedule the preview for the current expression."""
+        self._can_preview = self._parser.complete
         self._display.update_expr(self._expression)
 
-        if not self._show_and_clear_error():
+        if self._show_and_clear_error():
+            self._preview.cancel()
+            return
+
+        if not self._can_preview:
+            self._preview.cancel()
+            self._result = ""
             self._display.update_res(self._result)
+            return
+
+        self._preview.request(self._expression, self._app_state.evaluation_context())
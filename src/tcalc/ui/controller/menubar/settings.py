@@ -21,3 +21,6 @@ class SettingsOperations:
     def toggle_constants(self, checked: bool) -> None:
         self._app_state.show_constant_buttons = checked
         self._window.update_layout()
+
+    def set_precision(self, digits: int) -> None:
+        self._app_state.precision = digits
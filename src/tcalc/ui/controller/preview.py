@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+from typing import Callable, Optional
+
+import calc_native
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from tcalc.core import CancelToken, EvaluationContext, compile_expression, try_evaluate_program
+from tcalc.core.errors import ErrorKind
+
+
+class _PreviewJob(QRunnable):
+    """One preview evaluation on the pool.
+
+    A job cancelled before it starts is skipped; one cancelled while running stops
+    inside the native kernels at their next checkpoint.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        expression: str,
+        program: calc_native.Program,
+        context: EvaluationContext,
+        timeout: Optional[float],
+        deliver: Callable[[int, Optional[ErrorKind], object], None],
+    ) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.expression = expression
+        self.context = context
+        self.token = CancelToken()
+        self.done = threading.Event()
+        # (status, value) once run() has finished; read after `done` is set.
+        self.outcome: Optional[tuple[Optional[ErrorKind], object]] = None
+        self._program = program
+        self._context = replace(context, timeout=timeout, cancel=self.token)
+        self._deliver = deliver
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def run(self) -> None:
+        status: Optional[ErrorKind] = None
+        value: object = None
+        try:
+            if self.token.cancelled:
+                return
+            status, value = try_evaluate_program(self._program, self._context)
+            self.outcome = (status, value)
+        finally:
+            self.done.set()
+        if not self.token.cancelled:
+            self._deliver(self.generation, status, value)
+
+
+class PreviewEvaluator(QObject):
+    """Evaluates the live preview on a worker thread so slow results never block the UI.
+
+    Every request gets a generation number and only the newest generation's result
+    is delivered through `ready`. Requests closer together than the debounce window
+    collapse into one compile and evaluation, and a newer request cancels older jobs,
+    stopping them mid-computation. `busy` fires when the current result takes longer than the
+    busy delay; a preview running past the timeout is reported as ErrorKind.TIMEOUT.
+    """
+
+    ready = Signal(object, object)  # (Optional[ErrorKind], value)
+    busy = Signal()
+    _finished = Signal(int, object, object)
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        debounce_ms: int = 30,
+        busy_delay_ms: int = 150,
+        max_threads: int = 2,
+        timeout_ms: int = 5000,
+    ) -> None:
+        super().__init__(parent)
+        self._generation = 0
+        self._timeout = timeout_ms / 1000 if timeout_ms > 0 else None
+        self._pending: Optional[tuple[str, EvaluationContext]] = None
+        self._job: Optional[_PreviewJob] = None
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_threads))
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(max(0, debounce_ms))
+        self._debounce.timeout.connect(self._dispatch)
+
+        self._busy_timer = QTimer(self)
+        self._busy_timer.setSingleShot(True)
+        self._busy_timer.setInterval(max(0, busy_delay_ms))
+        self._busy_timer.timeout.connect(self._on_busy_timeout)
+
+        # Jobs emit from pool threads; the queued connection lands on this object's thread.
+        self._finished.connect(self._on_finished)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def set_debounce(self, milliseconds: int) -> None:
+        self._debounce.setInterval(max(0, milliseconds))
+
+    def request(self, expression: str, context: EvaluationContext) -> int:
+        """Schedule a preview of `expression`, superseding every earlier request.
+
+        The expression is compiled through the compile cache when the debounce window
+        closes. The job evaluates under `context` with the preview's own timeout and
+        cancel token.
+        """
+        generation = self._supersede()
+        self._pending = (expression, context)
+        self._debounce.start()
+        return generation
+
+    def cancel(self) -> None:
+        """Drop the pending request and any running job's result."""
+        self._supersede()
+
+    def finished_result(
+        self, expression: str, context: EvaluationContext
+    ) -> Optional[tuple[Optional[ErrorKind], object]]:
+        """(status, value) of the current preview if it finished `expression` under `context`.
+
+        Never blocks. None while the preview is pending or running, when it was for
+        other input, or when it stopped on the preview's own timeout; the caller then
+        evaluates the expression itself.
+        """
+        job = self._job
+        if job is None or job.generation != self._generation or not job.done.is_set():
+            return None
+        if job.token.cancelled or job.outcome is None:
+            return None
+        if job.expression != expression or job.context != context:
+            return None
+        if job.outcome[0] in (ErrorKind.TIMEOUT, ErrorKind.CANCELLED):
+            return None
+        return job.outcome
+
+    def _supersede(self) -> int:
+        self._generation += 1
+        self._debounce.stop()
+        self._busy_timer.stop()
+        self._pending = None
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        return self._generation
+
+    def _dispatch(self) -> None:
+        if self._pending is None:
+            return
+        expression, context = self._pending
+        self._pending = None
+        program = compile_expression(expression)
+        self._job = _PreviewJob(
+            self._generation, expression, program, context, self._timeout, self._finished.emit
+        )
+        self._pool.start(self._job)
+        self._busy_timer.start()
+
+    def _on_finished(self, generation: int, status: Optional[ErrorKind], value: object) -> None:
+        if generation != self._generation:
+            return  # stale: the expression changed while this job ran
+        self._busy_timer.stop()
+        self.ready.emit(status, value)
+
+    def _on_busy_timeout(self) -> None:
+        if self._job is not None and not self._job.done.is_set():
+            self.busy.emit()
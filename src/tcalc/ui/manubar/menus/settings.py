@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Callable, cast
 
-from PySide6.QtGui import QAction, QIcon
+import calc_native
+from PySide6.QtGui import QAction, QActionGroup, QIcon
 from PySide6.QtWidgets import QMenuBar
 
 from tcalc.app_state import CalculatorMode, get_app_state
@@ -75,6 +76,19 @@ class SettingsMenu:
 
         settings_menu.addSeparator()
 
+        # Working precision of the big-number kernels
+        precision_menu = settings_menu.addMenu("Precision")
+        precision_group = QActionGroup(window)
+        for digits in calc_native.precision_tiers():
+            action = QAction(f"{digits} Digits", window)
+            action.setCheckable(True)
+            action.setChecked(digits == self.app_state.precision)
+            action.triggered.connect(lambda checked, d=digits: self.ops.set_precision(d))
+            precision_group.addAction(action)
+            precision_menu.addAction(action)
+
+        settings_menu.addSeparator()
+
         # Configuration actions
         keyboard_action = QAction(
             _get_icon("input-keyboard"), "Configure Keyboard Shortcuts... (Coming Soon)", window